@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Format-Preserving Mode Benchmark
+================================
+
+Times encrypt and encrypt_formatted for Caesar, Affine and Hill over the
+A-Z, alphanumeric (mod 36) and printable (mod 95) alphabets, on invoice-like
+text with accented letters and symbols outside every alphabet. Checks that
+the formatted output, with its layout stripped, is identical to encrypt's.
+
+Usage:
+    python benchmarks/bench_format.py              # 256 KB of mixed text
+    python benchmarks/bench_format.py --size 2     # 2 MB
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers import AffineCipher, CaesarCipher, HillCipher
+from ciphers.alphabets import get_alphabet
+
+KEYS = {
+    'letters': {CaesarCipher: '3', AffineCipher: '5,8', HillCipher: '3,3,2,5'},
+    'alphanumeric': {CaesarCipher: '7', AffineCipher: '5,8', HillCipher: '1,2,0,1'},
+    'printable': {CaesarCipher: '7', AffineCipher: '2,8', HillCipher: '2,3,1,2'},
+}
+
+
+def make_text(size_bytes, seed=1):
+    """Invoice-like lines: words, amounts, accented names and a euro sign"""
+    rng = random.Random(seed)
+    words = ['Invoice', 'total', 'due', 'Müller', 'café', 'Straße', 'item', 'qty', 'EUR', 'paid']
+    lines = []
+    size = 0
+    while size < size_bytes:
+        line = f"{rng.choice(words)} {rng.randint(1, 9999)}.{rng.randint(0, 99):02d} € {rng.choice(words)}!\n"
+        lines.append(line)
+        size += len(line)
+    return ''.join(lines)
+
+
+def timed(func, repeat=3):
+    """Best of a few runs: (seconds, result)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Format-preserving mode benchmark')
+    parser.add_argument('--size', type=float, default=0.25, help='Text size in MB')
+    args = parser.parse_args()
+    
+    text = make_text(int(args.size * 1024 * 1024))
+    mb = len(text) / (1024 * 1024)
+    print(f"{mb:.2f} MB")
+    print(f"{'alphabet':>13} {'cipher':>14} {'plain MB/s':>11} {'formatted MB/s':>15} {'identical':>10}")
+    for name, keys in KEYS.items():
+        alphabet = get_alphabet(name)
+        for cipher_class, key in keys.items():
+            cipher = cipher_class(alphabet=name)
+            plain_time, plain = timed(lambda: cipher.encrypt(text, key))
+            formatted_time, formatted = timed(lambda: cipher.encrypt_formatted(text, key))
+            identical = alphabet.indices(formatted) == alphabet.indices(plain)
+            print(f"{name:>13} {cipher_class.__name__:>14} {mb / plain_time:11.2f} "
+                  f"{mb / formatted_time:15.2f} {str(identical):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Hill Cipher Throughput Benchmark
+================================
+
+Compares the original digraph-at-a-time Hill loop (one np.dot per pair)
+with the whole-message vectorized engine, checking outputs are identical.
+
+Usage:
+    python benchmarks/bench_hill.py             # 256 KB of mixed text
+    python benchmarks/bench_hill.py --size 2    # 2 MB
+    python benchmarks/bench_hill.py --repeat 1  # one timed run per engine
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_caesar import make_text
+from ciphers.hill_cipher import HillCipher
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def legacy_encrypt(plaintext, key_matrix):
+    """Original per-digraph implementation, kept as the baseline"""
+    prepared = ''.join(c.upper() for c in plaintext if c.isalpha())
+    if len(prepared) % 2 != 0:
+        prepared += 'X'
+    ciphertext = ''
+    for i in range(0, len(prepared), 2):
+        vector = np.array([ALPHABET.index(prepared[i]), ALPHABET.index(prepared[i + 1])])
+        encrypted = np.dot(key_matrix, vector) % 26
+        ciphertext += ALPHABET[encrypted[0]] + ALPHABET[encrypted[1]]
+    return ciphertext
+
+
+def measure(func, *args, repeat=5):
+    """Run func once to warm up, then return (result, seconds) of the best of repeat timed runs"""
+    result = func(*args)
+    return result, min(timeit.repeat(lambda: func(*args), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hill cipher throughput benchmark')
+    parser.add_argument('--size', type=float, default=0.25, help='Input size in MB')
+    parser.add_argument('--key', default='3,3,2,5', help='Key as a,b,c,d')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per engine (best is reported)')
+    args = parser.parse_args()
+    
+    size = int(args.size * 1024 * 1024)
+    text = make_text(size)
+    cipher = HillCipher()
+    key_matrix = cipher._parse_key(args.key)
+    
+    legacy_out, legacy_time = measure(legacy_encrypt, text, key_matrix, repeat=args.repeat)
+    fast_out, fast_time = measure(cipher.encrypt, text, args.key, repeat=args.repeat)
+    
+    mb = size / (1024 * 1024)
+    print(f"Input size:     {args.size:g} MB")
+    print(f"Legacy loop:    {mb / legacy_time:10.2f} MB/s")
+    print(f"Vectorized:     {mb / fast_time:10.2f} MB/s")
+    print(f"Speedup:        {legacy_time / fast_time:10.1f}x")
+    print(f"Identical:      {legacy_out == fast_out}")
+
+
+if __name__ == '__main__':
+    main()
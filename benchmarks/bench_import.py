@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark
+=====================
+
+Measures how long a fresh interpreter takes to import the ciphers and run
+one short message, with interpreter start-up subtracted, and whether NumPy
+ended up loaded. Caesar, Affine and Playfair never load NumPy; Hill loads
+it only when the calibrated dispatcher picks the NumPy engine for a message.
+
+Usage:
+    python benchmarks/bench_import.py             # 20 runs per scenario
+    python benchmarks/bench_import.py --runs 50
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+    ('caesar', "from ciphers import CaesarCipher; CaesarCipher().encrypt('attack at dawn', 3)"),
+    ('affine', "from ciphers import AffineCipher; AffineCipher().encrypt('attack at dawn', '5,8')"),
+    ('playfair', "from ciphers import PlayfairCipher; PlayfairCipher().encrypt('attack at dawn', 'key')"),
+    ('hill (short message)', "from ciphers import HillCipher; HillCipher().encrypt('attack at dawn', '3,3,2,5')"),
+    ('hill (1 MB message)', "from ciphers import HillCipher; HillCipher().encrypt('a' * 2**20, '3,3,2,5')"),
+    ('import numpy', "import numpy"),
+]
+
+REPORT = "; import sys; print('numpy' in sys.modules)"
+
+
+def run(code):
+    """Run code in a fresh interpreter; return (seconds, whether numpy was imported)"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code + REPORT], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, result.stdout.strip() == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time benchmark')
+    parser.add_argument('--runs', type=int, default=20, help='Interpreter launches per scenario')
+    args = parser.parse_args()
+    
+    # Engine thresholds are calibrated once and cached; do that outside the timings
+    for _, code in SCENARIOS[:-1]:
+        run(code)
+    
+    baseline = statistics.median(run('pass')[0] for _ in range(args.runs))
+    print(f"Interpreter start-up: {baseline * 1000:.1f} ms (subtracted below)\n")
+    print(f"{'scenario':<22} {'ms':>8} {'numpy loaded':>13}")
+    for name, code in SCENARIOS:
+        timings = [run(code) for _ in range(args.runs)]
+        elapsed = statistics.median(t for t, _ in timings) - baseline
+        print(f"{name:<22} {elapsed * 1000:8.1f} {str(timings[-1][1]):>13}")
+
+
+if __name__ == '__main__':
+    main()
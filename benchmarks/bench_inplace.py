@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+In-Place File Encryption Benchmark
+==================================
+
+Encrypts a generated text file two ways, each in a fresh subprocess so peak
+memory can be compared: reading the whole file, encrypting the string and
+writing the result back (what the GUI import/export does), and
+encrypt_in_place through a memory map. Reports time and the child's peak
+RSS, and checks that the in-place file holds the same letters.
+
+Peak RSS comes from resource.getrusage, so this runs on Unix only.
+
+Usage:
+    python benchmarks/bench_inplace.py              # 64 MB file
+    python benchmarks/bench_inplace.py --size 1024  # 1 GB file
+    python benchmarks/bench_inplace.py --ciphers hill
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+KEYS = {'caesar': '3', 'affine': '5,8', 'hill': '3,3,2,5'}
+
+# Run in the child: argv = mode, cipher name, key, path
+CHILD = '''
+import resource, sys, time
+from ciphers.registry import registry
+mode, name, key, path = sys.argv[1:]
+cipher = registry.create(name)
+start = time.perf_counter()
+if mode == 'in-place':
+    cipher.encrypt_in_place(path, key)
+else:
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    result = cipher.encrypt(text, key)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(result)
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def write_text(path, size_bytes, seed=1):
+    """Random words and line breaks, written in 1 MB pieces"""
+    rng = random.Random(seed)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(1, 9)))
+             for _ in range(5000)]
+    piece = ' '.join(rng.choice(words) for _ in range(200000)).encode('ascii')
+    piece = piece.replace(b'e ', b'e\n')[:1 << 20]
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size_bytes:
+            written += f.write(piece[:size_bytes - written])
+
+
+def run_child(mode, name, path):
+    """(seconds, peak RSS in MB) of one encryption in a fresh interpreter"""
+    output = subprocess.run([sys.executable, '-c', CHILD, mode, name, KEYS[name], path],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    elapsed, rss = output.split()
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return float(elapsed), int(rss) / scale
+
+
+def letters_digest(path):
+    """Hash of the uppercase letters of a file, read in windows"""
+    # Hashing keeps this process small: a child starts from its parent's peak RSS
+    from ciphers.tables import DELETE_BYTES, UPPERCASE_TABLE
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk.translate(UPPERCASE_TABLE, DELETE_BYTES))
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='In-place file encryption benchmark')
+    parser.add_argument('--size', type=int, default=64, help='File size in MB')
+    parser.add_argument('--ciphers', default=','.join(KEYS), help='Comma-separated cipher names')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source.txt')
+        write_text(source, args.size * 1024 * 1024)
+        print(f"{args.size} MB file\n")
+        print(f"{'cipher':<8} {'mode':<16} {'time (s)':>9} {'peak RSS (MB)':>14}")
+        for name in args.ciphers.split(','):
+            outputs = {}
+            for mode in ('read-write', 'in-place'):
+                path = os.path.join(tmp, f'{mode}.txt')
+                with open(source, 'rb') as src, open(path, 'wb') as dst:
+                    for chunk in iter(lambda: src.read(1 << 20), b''):
+                        dst.write(chunk)
+                elapsed, rss = run_child(mode, name, path)
+                outputs[mode] = path
+                print(f"{name:<8} {mode:<16} {elapsed:>9.2f} {rss:>14.1f}")
+            assert letters_digest(outputs['read-write']) == letters_digest(outputs['in-place']), f"{name}: letters differ"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Process-Pool Scaling Benchmark
+==============================
+
+Encrypts one large text with encrypt_parallel on 1..N worker processes
+and reports MB/s and speedup over the serial encrypt, checking every result
+against the serial output. Each pool is started and warmed up before it is
+timed. The timings include copying the text into shared memory and building
+the result string.
+
+Usage:
+    python benchmarks/bench_parallel.py                   # 256 MB, up to one process per CPU
+    python benchmarks/bench_parallel.py --size 1024       # 1 GB
+    python benchmarks/bench_parallel.py --max-processes 16 --ciphers hill
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.registry import registry
+
+KEYS = {'caesar': '3', 'affine': '5,8', 'hill': '3,3,2,5', 'playfair': 'MONARCHY'}
+
+
+def make_text(size_bytes, seed=1):
+    """Letters, spaces and digits, built from a repeated 1 MB block"""
+    rng = random.Random(seed)
+    chars = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ     0123456789.,'
+    block = ''.join(rng.choice(chars) for _ in range(1 << 20))
+    return (block * (size_bytes // len(block) + 1))[:size_bytes]
+
+
+def process_counts(limit):
+    """1, 2, 4, ... up to limit (limit itself included)"""
+    counts = []
+    n = 1
+    while n < limit:
+        counts.append(n)
+        n *= 2
+    return counts + [limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Process-pool scaling benchmark')
+    parser.add_argument('--size', type=int, default=256, help='Text size in MB')
+    parser.add_argument('--max-processes', type=int, default=os.cpu_count() or 1, help='Largest pool size')
+    parser.add_argument('--ciphers', default=','.join(KEYS), help='Comma-separated cipher names')
+    args = parser.parse_args()
+    
+    text = make_text(args.size * 1024 * 1024)
+    mb = len(text) / (1024 * 1024)
+    print(f"{mb:.0f} MB text, {os.cpu_count()} CPUs\n")
+    
+    for name in args.ciphers.split(','):
+        cipher = registry.create(name)
+        key = cipher.compile_key(KEYS[name])
+        start = time.perf_counter()
+        expected = cipher.encrypt(text, key)
+        serial = time.perf_counter() - start
+        
+        print(f"{registry.spec(name).title}")
+        print(f"  {'processes':>9} {'MB/s':>10} {'speedup':>8}")
+        print(f"  {'serial':>9} {mb / serial:>10.1f} {1:>7.2f}x")
+        for processes in process_counts(args.max_processes):
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                cipher.encrypt_parallel(text[:4 << 20], key, executor=pool)     # start the workers
+                start = time.perf_counter()
+                result = cipher.encrypt_parallel(text, key, executor=pool)
+                elapsed = time.perf_counter() - start
+            assert result == expected, f"{name}: results differ on {processes} processes"
+            print(f"  {processes:>9} {mb / elapsed:>10.1f} {serial / elapsed:>7.2f}x")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Pipeline Fusion Benchmark
+=========================
+
+Runs Caesar -> Affine -> Hill and Hill -> Hill -> Playfair over the same
+text three ways: stage by stage (each stage reparsing the previous
+output), as a fused Pipeline, and as a single Hill encrypt for reference.
+Checks that the fused output is identical to the staged one.
+
+Usage:
+    python benchmarks/bench_pipeline.py            # 1 MB of mixed text
+    python benchmarks/bench_pipeline.py --size 10  # 10 MB
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers import AffineCipher, CaesarCipher, HillCipher, Pipeline, PlayfairCipher
+
+CHAINS = {
+    'caesar -> affine -> hill': [(CaesarCipher(), 3), (AffineCipher(), '5,8'), (HillCipher(), '3,3,2,5')],
+    'hill -> hill -> playfair': [(HillCipher(), '3,3,2,5'), (HillCipher(), '5,8,17,3'), (PlayfairCipher(), 'MONARCHY')],
+}
+
+
+def make_text(size_bytes, seed=1):
+    """Generate text with letters, spaces, digits and punctuation"""
+    rng = random.Random(seed)
+    chars = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ     0123456789.,'
+    return ''.join(rng.choice(chars) for _ in range(size_bytes))
+
+
+def timed(func, repeat=3):
+    """Best of a few runs: (seconds, result)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_stages(stages, text):
+    for cipher, key in stages:
+        text = cipher.encrypt(text, key)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pipeline fusion benchmark')
+    parser.add_argument('--size', type=float, default=1, help='Text size in MB')
+    args = parser.parse_args()
+    
+    text = make_text(int(args.size * 1024 * 1024))
+    mb = len(text) / (1024 * 1024)
+    single, _ = timed(lambda: HillCipher().encrypt(text, '3,3,2,5'))
+    print(f"{mb:.1f} MB; one Hill encrypt takes {single * 1000:.1f} ms\n")
+    
+    for name, stages in CHAINS.items():
+        pipeline = Pipeline(stages)
+        staged, expected = timed(lambda: run_stages(stages, text))
+        fused, result = timed(lambda: pipeline.run(text))
+        assert result == expected, f"{name}: fused output differs"
+        print(f"{name}")
+        print(f"  {pipeline!r}")
+        print(f"  staged: {staged * 1000:8.1f} ms   fused: {fused * 1000:8.1f} ms   "
+              f"speedup {staged / fused:.1f}x   ({fused / single:.1f}x one Hill pass)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Playfair Text Preparation Benchmark
+===================================
+
+Times Playfair text preparation and decrypt-side X-stripping at growing
+input sizes (up to 10 MB). Linear scaling shows up as a flat MB/s column.
+Each size is also run through the original string-concatenation code to
+confirm the output is byte-identical.
+
+Usage:
+    python benchmarks/bench_playfair.py                 # 1, 2, 5, 10 MB
+    python benchmarks/bench_playfair.py --skip-legacy   # new code only
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.playfair_cipher import PlayfairCipher
+
+
+def legacy_prepare(text):
+    """Original _prepare_text, kept as the baseline"""
+    clean_text = ''
+    for c in text:
+        if c == ' ' or c.isdigit():
+            continue
+        elif c.isalpha():
+            clean_text += c.upper().replace('J', 'I')
+    prepared = ''
+    i = 0
+    while i < len(clean_text):
+        prepared += clean_text[i]
+        if i + 1 < len(clean_text):
+            if clean_text[i] == clean_text[i + 1]:
+                prepared += 'X'
+            else:
+                prepared += clean_text[i + 1]
+                i += 1
+        else:
+            prepared += 'X'
+        i += 1
+    if len(prepared) % 2 != 0:
+        prepared += 'X'
+    return prepared
+
+
+def legacy_strip(plaintext):
+    """Original X-removal loop from decrypt, kept as the baseline"""
+    cleaned = ''
+    i = 0
+    while i < len(plaintext):
+        char = plaintext[i]
+        if char == 'x':
+            if (i > 0 and i < len(plaintext) - 1 and
+                    plaintext[i-1] == plaintext[i+1] and plaintext[i-1] != 'x'):
+                i += 1
+                continue
+            elif i == len(plaintext) - 1:
+                i += 1
+                continue
+        cleaned += char
+        i += 1
+    return cleaned
+
+
+def make_text(size_bytes, seed=5):
+    """Generate text rich in doubled letters and x's"""
+    rng = random.Random(seed)
+    pool = 'aabbllooxxeeJj sstt 12.'
+    block = ''.join(rng.choice(pool) for _ in range(64 * 1024))
+    return (block * (size_bytes // len(block) + 1))[:size_bytes]
+
+
+def timed(func, arg):
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(arg)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Playfair preparation scaling benchmark')
+    parser.add_argument('--sizes', default='1,2,5,10', help='Comma-separated sizes in MB')
+    parser.add_argument('--skip-legacy', action='store_true', help='Do not run the original code')
+    args = parser.parse_args()
+    
+    cipher = PlayfairCipher()
+    print(f"{'MB':>6} {'prepare MB/s':>14} {'strip MB/s':>12} {'legacy prep':>12} {'legacy strip':>13} {'identical':>10}")
+    for size_mb in (float(s) for s in args.sizes.split(',')):
+        size = int(size_mb * 1024 * 1024)
+        text = make_text(size)
+        lowered = text.lower()
+        
+        prepared, prep_time = timed(cipher._prepare_text, text)
+        stripped, strip_time = timed(cipher._remove_padding, lowered)
+        
+        legacy_cols = f"{'-':>12} {'-':>13} {'-':>10}"
+        if not args.skip_legacy:
+            old_prepared, old_prep_time = timed(legacy_prepare, text)
+            old_stripped, old_strip_time = timed(legacy_strip, lowered)
+            identical = old_prepared == prepared and old_stripped == stripped
+            legacy_cols = (f"{size_mb / old_prep_time:12.2f} {size_mb / old_strip_time:13.2f} "
+                           f"{str(identical):>10}")
+        
+        print(f"{size_mb:6g} {size_mb / prep_time:14.2f} {size_mb / strip_time:12.2f} {legacy_cols}")
+
+
+if __name__ == '__main__':
+    main()
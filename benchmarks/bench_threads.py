@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Thread-Scaling Benchmark
+========================
+
+Encrypts a batch of short messages with encrypt_many on 1..N threads and
+reports messages/s and speedup over one thread, checking every result
+against the single-threaded output. On a GIL build the pure-Python
+engines cannot scale; on a free-threaded build (python3.13t) they should.
+
+Usage:
+    python benchmarks/bench_threads.py                      # 20000 messages of 64 chars
+    python benchmarks/bench_threads.py --messages 5000 --length 1024
+    python benchmarks/bench_threads.py --max-threads 16
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.registry import registry
+
+KEYS = {'caesar': '3', 'affine': '5,8', 'playfair': 'MONARCHY', 'hill': '3,3,2,5'}
+
+
+def gil_enabled():
+    """False on a free-threaded build with the GIL actually disabled"""
+    check = getattr(sys, '_is_gil_enabled', None)
+    return True if check is None else check()
+
+
+def make_messages(count, length, seed=1):
+    """Random letters and spaces"""
+    rng = random.Random(seed)
+    chars = 'abcdefghijklmnopqrstuvwxyz     '
+    return [''.join(rng.choice(chars) for _ in range(length)) for _ in range(count)]
+
+
+def thread_counts(limit):
+    """1, 2, 4, ... up to limit (limit itself included)"""
+    counts = []
+    n = 1
+    while n < limit:
+        counts.append(n)
+        n *= 2
+    return counts + [limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Thread-scaling benchmark')
+    parser.add_argument('--messages', type=int, default=20000, help='Messages per batch')
+    parser.add_argument('--length', type=int, default=64, help='Characters per message')
+    parser.add_argument('--max-threads', type=int, default=os.cpu_count() or 1, help='Largest pool size')
+    parser.add_argument('--ciphers', default=','.join(KEYS), help='Comma-separated cipher names')
+    args = parser.parse_args()
+    
+    messages = make_messages(args.messages, args.length)
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}, "
+          f"{os.cpu_count()} CPUs, {args.messages} messages x {args.length} chars\n")
+    
+    for name in args.ciphers.split(','):
+        cipher = registry.create(name)
+        key = cipher.compile_key(KEYS[name])
+        expected = cipher.encrypt_many(messages, key)
+        
+        print(f"{registry.spec(name).title}")
+        print(f"  {'threads':>7} {'msg/s':>12} {'speedup':>8}")
+        baseline = None
+        for threads in thread_counts(args.max_threads):
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                cipher.encrypt_many(messages[:threads * 64], key, executor=pool)    # warm up workers
+                start = time.perf_counter()
+                result = cipher.encrypt_many(messages, key, executor=pool)
+                elapsed = time.perf_counter() - start
+            assert result == expected, f"{name}: results differ on {threads} threads"
+            rate = args.messages / elapsed
+            baseline = baseline or rate
+            print(f"  {threads:>7} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+        print()
+
+
+if __name__ == '__main__':
+    main()
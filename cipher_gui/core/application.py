@@ -17,11 +17,6 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt6.QtGui import QAction, QKeySequence, QFont
 from PyQt6.QtCore import QSize
 
-from ciphers.caesar_cipher import CaesarCipher
-from ciphers.affine_cipher import AffineCipher
-from ciphers.playfair_cipher import PlayfairCipher
-from ciphers.hill_cipher import HillCipher
-
 from cipher_gui.models.history import HistoryManager
 from cipher_gui.models.cipher_config import CipherConfig
 from cipher_gui.core.settings import SettingsManager
@@ -43,14 +38,14 @@ class CipherGUI(QMainWindow):
     Main application window for the Classical Cipher Tool.
     
     Provides a tabbed interface with:
-    - Cipher tab: Encrypt/decrypt with 4 classical ciphers
+    - Cipher tab: Encrypt/decrypt with every registered cipher
     - Crack tab: Hill cipher known plaintext attack
     
     Args:
         crack_mode (bool): If True, opens directly to the Crack tab
     
     Attributes:
-        cipher_map (dict): Maps cipher names to cipher instances
+        config: Cipher metadata; cipher instances are created on first selection
         history_manager: Manages operation history
         settings_manager: Handles persistent settings
     """
@@ -59,14 +54,6 @@ class CipherGUI(QMainWindow):
         super().__init__()
         self.crack_mode = crack_mode
         
-        # Initialize cipher instances
-        self.cipher_map = {
-            "Caesar": CaesarCipher(),
-            "Affine": AffineCipher(),
-            "Playfair": PlayfairCipher(),
-            "Hill (2×2)": HillCipher()
-        }
-        
         # Initialize managers
         self.history_manager = HistoryManager()
         self.settings_manager = SettingsManager()
@@ -134,7 +121,7 @@ class CipherGUI(QMainWindow):
         # Right panel with cipher selector (NOW ON LEFT)
         self.right_panel = RightPanel(
             self.config.get_all_cipher_names(),
-            self.config.CIPHER_ICONS
+            self.config.get_icons()
         )
         self.right_panel.cipher_changed.connect(self.on_cipher_changed)
         cipher_layout.addWidget(self.right_panel, 2)
@@ -196,9 +183,9 @@ class CipherGUI(QMainWindow):
         self.statusBar().showMessage(f"Mode: {mode.capitalize()}")
     
     def get_current_cipher(self):
-        """Get current cipher instance."""
+        """Get current cipher instance (its module is imported on first selection)."""
         cipher_name = self.right_panel.cipher_selector.get_current_cipher()
-        return self.cipher_map[cipher_name], cipher_name
+        return self.config.get_cipher(cipher_name), cipher_name
     
     def update_key_help(self):
         """Update key help text."""
@@ -238,8 +225,11 @@ class CipherGUI(QMainWindow):
             result = self.cipher_actions.decrypt(cipher, input_text, key_text)
         
         if result:
-            # Apply case enforcement based on mode
-            if mode == "encrypt":
+            # The result keeps the input's case; without preserve case, the
+            # case is enforced based on mode
+            if self.preserve_case_enabled:
+                self.left_panel.output_section.set_text(result)
+            elif mode == "encrypt":
                 self.left_panel.output_section.set_text(result, force_case='upper')
             else:
                 self.left_panel.output_section.set_text(result, force_case='lower')
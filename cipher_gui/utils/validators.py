@@ -16,7 +16,7 @@ def validate_key(cipher, key_text):
         return False, "Key is required"
     
     try:
-        cipher.encrypt("TEST", key_text)
+        cipher.compile_key(key_text)
         return True, "Valid key"
     except ValueError as e:
         return False, str(e)
@@ -10,6 +10,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from cracker import HillCipherCracker
+from ciphers.letters import LetterBuffer
 
 
 class CrackerPanel(QFrame):
@@ -286,8 +287,12 @@ class CrackerPanel(QFrame):
             self.status_message.emit("Error: Missing input")
             return
         
+        # Parse both texts once; the cracker works on the letter indices
+        plaintext = LetterBuffer.from_text(plaintext)
+        ciphertext = LetterBuffer.from_text(ciphertext)
+        
         # Store original plaintext letter count for padding removal
-        self.original_plaintext_length = sum(1 for c in plaintext if c.isalpha())
+        self.original_plaintext_length = len(plaintext)
         
         # Capture output
         import io
@@ -1,6 +1,27 @@
-from .caesar_cipher import CaesarCipher
-from .affine_cipher import AffineCipher
-from .playfair_cipher import PlayfairCipher
-from .hill_cipher import HillCipher
+import importlib
 
-__all__ = ['CaesarCipher', 'AffineCipher', 'PlayfairCipher', 'HillCipher']
+from .letters import LetterBuffer
+from .alphabets import Alphabet, LETTERS, ALPHANUMERIC, PRINTABLE
+from .registry import registry, CipherSpec
+
+# Cipher modules are imported on first access, so a program only pays for the ciphers it uses
+_LAZY = {
+    'CaesarCipher': '.caesar_cipher', 'CaesarKey': '.caesar_cipher',
+    'AffineCipher': '.affine_cipher', 'AffineKey': '.affine_cipher',
+    'PlayfairCipher': '.playfair_cipher', 'PlayfairKey': '.playfair_cipher',
+    'HillCipher': '.hill_cipher', 'HillKey': '.hill_cipher',
+    'Pipeline': '.pipeline',
+}
+
+__all__ = ['CaesarCipher', 'AffineCipher', 'PlayfairCipher', 'HillCipher',
+           'CaesarKey', 'AffineKey', 'PlayfairKey', 'HillKey', 'LetterBuffer',
+           'Alphabet', 'LETTERS', 'ALPHANUMERIC', 'PRINTABLE', 'registry', 'CipherSpec',
+           'Pipeline']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,89 +1,112 @@
-class AffineCipher:
-    """Affine Cipher implementation using formula: E(x) = (ax + b) mod 26"""
+from functools import lru_cache
+
+from .alphabets import LETTERS, get_alphabet
+from .base import CompiledKey, SubstitutionCipher, key_fingerprint
+from .dispatch import dispatcher
+from .letters import LetterBuffer
+from .modular import mod_inverse
+from .tables import SUBSTITUTION_ENGINES, TranslationTable
+
+
+class AffineKey(CompiledKey):
+    """Compiled Affine key: (a, b), the inverse of a and both translation tables"""
     
-    def __init__(self):
-        self.alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-        self.m = 26
+    __slots__ = ('a', 'b', 'a_inv', 'charset', 'encrypt_table', 'decrypt_table')
     
-    def _gcd(self, a, b):
-        """Calculate Greatest Common Divisor"""
-        while b:
-            a, b = b, a % b
-        return a
+    def __init__(self, a, b, charset=LETTERS):
+        # Tables are built per key rather than for all units(m) * m keys up
+        # front: that is 312 tables for A-Z but 6840 for the 95 printables
+        m = charset.modulus
+        a_inv = charset.inverses[a]
+        encrypt_table = TranslationTable([(a * x + b) % m for x in range(m)], alphabet=charset)
+        decrypt_table = TranslationTable([(a_inv * (y - b)) % m for y in range(m)],
+                                         charset.case_insensitive, charset)
+        params = (a, b) if charset == LETTERS else (a, b, charset.symbols)
+        self._set(a=a, b=b, a_inv=a_inv, charset=charset,
+                  encrypt_table=encrypt_table, decrypt_table=decrypt_table,
+                  fingerprint=key_fingerprint('affine', *params))
+
+
+@lru_cache(maxsize=None)
+def _affine_key(a, b, charset=LETTERS):
+    """One shared AffineKey (and its tables) per reduced (a, b) and alphabet"""
+    return AffineKey(a, b, charset)
+
+
+_ENGINES = dispatcher.register('affine', SUBSTITUTION_ENGINES, lambda: _affine_key(5, 8))
+
+
+class AffineCipher(SubstitutionCipher):
+    """Affine Cipher implementation using formula: E(x) = (ax + b) mod m (m = 26 for A-Z)"""
+    
+    key_type = AffineKey
+    
+    def __init__(self, alphabet=None):
+        """
+        Args:
+            alphabet: Alphabet, built-in name ('letters', 'alphanumeric',
+                'printable') or string of symbols; A-Z (mod 26) by default
+        """
+        self.charset = get_alphabet(alphabet)
+        self.alphabet = self.charset.symbols
+        self.m = self.charset.modulus
     
     def _mod_inverse(self, a, m):
         """Find modular multiplicative inverse of a under modulo m"""
-        for i in range(1, m):
-            if (a * i) % m == 1:
-                return i
-        return None
+        return mod_inverse(a, m)
     
     def _validate_key(self, a):
-        """Validate that key 'a' is coprime with 26"""
-        if self._gcd(a, self.m) != 1:
-            raise ValueError(f"Key 'a' ({a}) must be coprime with 26. Valid values: 1,3,5,7,9,11,15,17,19,21,23,25")
+        """Validate that key 'a' is coprime with the modulus (a lookup in the precomputed unit table)"""
+        if self.charset.inverses[a % self.m] is None:
+            raise ValueError(f"Key 'a' ({a}) must be coprime with {self.m}. "
+                             f"Valid values: {','.join(map(str, self.charset.units))}")
         return True
     
+    def _parse_key(self, key):
+        """Parse key into validated (a, b) reduced mod m"""
+        if isinstance(key, str):
+            key = tuple(map(int, key.split(',')))
+        
+        a, b = int(key[0]), int(key[1])
+        self._validate_key(a)
+        return a % self.m, b % self.m
+    
+    def compile_key(self, key):
+        """
+        Compile an Affine key
+        Args:
+            key (tuple or str): (a, b) or "a,b"
+        Returns:
+            AffineKey: Immutable compiled key
+        """
+        return _affine_key(*self._parse_key(key), self.charset)
+    
+    def key_space(self):
+        """Every valid (a, b): a a unit mod m, b from 0 to m - 1 (312 keys for A-Z)"""
+        return [(a, b) for a in self.charset.units for b in range(self.m)]
+    
     def encrypt(self, plaintext, key):
         """
         Encrypt plaintext using Affine cipher
         Args:
-            plaintext (str): Text to encrypt
-            key (tuple): (a, b) where a is multiplicative key and b is additive key
+            plaintext (str or LetterBuffer): Text to encrypt
+            key (tuple or AffineKey): (a, b) where a is multiplicative key and b is additive key
         Returns:
-            str: Encrypted ciphertext (uppercase, spaces/digits omitted)
+            str: Encrypted ciphertext (uppercase, spaces/digits omitted); a LetterBuffer for LetterBuffer input
         """
-        if isinstance(key, str):
-            key = tuple(map(int, key.split(',')))
-        
-        a, b = int(key[0]), int(key[1])
-        self._validate_key(a)
-        
-        ciphertext = ''
-        for char in plaintext:
-            if char == ' ' or char.isdigit():
-                # Skip spaces and digits completely
-                continue
-            elif char.upper() in self.alphabet:
-                # Encrypt alphabetic characters (force lowercase processing)
-                x = self.alphabet.index(char.upper())
-                encrypted_value = (a * x + b) % self.m
-                new_char = self.alphabet[encrypted_value]
-                # Always return uppercase for encryption
-                ciphertext += new_char
-        
-        return ciphertext
+        if isinstance(plaintext, LetterBuffer):
+            return self.encrypt_buffer(plaintext, key)
+        return _ENGINES.run(plaintext, self._key(key))
     
     def decrypt(self, ciphertext, key):
         """
         Decrypt ciphertext using Affine cipher
         Args:
-            ciphertext (str): Text to decrypt (uppercase)
-            key (tuple): (a, b) where a is multiplicative key and b is additive key
+            ciphertext (str or LetterBuffer): Text to decrypt (uppercase)
+            key (tuple or AffineKey): (a, b) where a is multiplicative key and b is additive key
         Returns:
-            str: Decrypted plaintext (lowercase, spaces/digits omitted)
+            str: Decrypted plaintext (lowercase, spaces/digits omitted); a LetterBuffer for LetterBuffer input
         """
-        if isinstance(key, str):
-            key = tuple(map(int, key.split(',')))
-        
-        a, b = int(key[0]), int(key[1])
-        self._validate_key(a)
-        
-        a_inv = self._mod_inverse(a, self.m)
-        if a_inv is None:
-            raise ValueError(f"No modular inverse exists for a={a}")
-        
-        plaintext = ''
-        for char in ciphertext:
-            if char == ' ' or char.isdigit():
-                # Skip spaces and digits completely
-                continue
-            elif char.upper() in self.alphabet:
-                # Decrypt alphabetic characters (force uppercase processing)
-                y = self.alphabet.index(char.upper())
-                decrypted_value = (a_inv * (y - b)) % self.m
-                new_char = self.alphabet[decrypted_value]
-                # Always return lowercase for decryption
-                plaintext += new_char.lower()
-        
-        return plaintext
+        if isinstance(ciphertext, LetterBuffer):
+            return self.decrypt_buffer(ciphertext, key)
+        return _ENGINES.run(ciphertext, self._key(key), decrypt=True)
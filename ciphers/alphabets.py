@@ -0,0 +1,124 @@
+"""
+Cipher alphabets.
+
+An alphabet fixes the symbols a cipher works on and therefore its modulus.
+Everything derived from it (unit group, inverse table, byte-level index and
+delete tables) is computed once per alphabet, so ciphers built on any of
+them run at the same table speed as the classic 26-letter one.
+"""
+
+import string
+from functools import lru_cache
+
+from .folding import fold_text
+from .modular import inverse_table, units
+
+
+class Alphabet:
+    """
+    Symbols of a cipher alphabet plus the tables precomputed from them.
+    
+    Alphabets without lowercase letters are case-insensitive: lowercase
+    input is folded onto the uppercase symbols and decryption produces
+    lowercase output, like the original A-Z ciphers. Alphabets that contain
+    lowercase letters (e.g. PRINTABLE) keep case exactly.
+    """
+    
+    __slots__ = ('name', 'symbols', 'modulus', 'case_insensitive', 'units', 'inverses',
+                 'input_bytes', 'input_positions', 'delete_bytes', 'index_table',
+                 'upper_from_index', 'lower_from_index')
+    
+    def __init__(self, symbols, name=None):
+        """
+        Args:
+            symbols (str): Distinct printable ASCII characters, in index order
+            name (str): Short name (defaults to the symbols themselves)
+        """
+        if len(symbols) < 2 or len(set(symbols)) != len(symbols) or not symbols.isascii():
+            raise ValueError("Alphabet must contain at least 2 distinct ASCII characters")
+        modulus = len(symbols)
+        case_insensitive = symbols == symbols.upper()
+        folded = [c.lower() for c in symbols if case_insensitive and c.lower() != c]
+        input_bytes = (symbols + ''.join(folded)).encode('ascii')
+        input_positions = tuple(range(modulus)) + tuple(symbols.index(c.upper()) for c in folded)
+        
+        self.name = name or symbols
+        self.symbols = symbols
+        self.modulus = modulus
+        self.case_insensitive = case_insensitive
+        self.units = units(modulus)
+        self.inverses = inverse_table(modulus)
+        self.input_bytes = input_bytes
+        self.input_positions = input_positions
+        self.delete_bytes = bytes(b for b in range(256) if b not in input_bytes)
+        # Symbol byte -> index (use together with delete_bytes), and back
+        self.index_table = bytes.maketrans(input_bytes, bytes(input_positions))
+        self.upper_from_index = bytes.maketrans(bytes(range(modulus)), symbols.encode('ascii'))
+        self.lower_from_index = bytes.maketrans(bytes(range(modulus)), symbols.lower().encode('ascii'))
+    
+    def indices(self, text):
+        """
+        Symbols of text as index bytes, everything else dropped
+        Args:
+            text (str): Input text
+        Returns:
+            bytes: One byte per symbol (0 to modulus - 1)
+        """
+        if text.isascii():
+            return text.encode('ascii').translate(self.index_table, self.delete_bytes)
+        text = fold_text(text)
+        if self.case_insensitive:
+            text = text.upper()
+        return text.encode('ascii', 'ignore').translate(self.index_table, self.delete_bytes)
+    
+    def text(self, indices, lowercase=False):
+        """Index bytes back to symbols (lowercase only affects case-insensitive alphabets)"""
+        table = self.lower_from_index if lowercase and self.case_insensitive else self.upper_from_index
+        return indices.translate(table).decode('ascii')
+    
+    def __eq__(self, other):
+        return isinstance(other, Alphabet) and self.symbols == other.symbols
+    
+    def __hash__(self):
+        return hash(self.symbols)
+    
+    def __repr__(self):
+        return f"<Alphabet {self.name} (mod {self.modulus})>"
+
+
+# Classic A-Z, mod 26 (the default everywhere)
+LETTERS = Alphabet(string.ascii_uppercase, 'letters')
+
+# A-Z then 0-9, mod 36, for alphanumeric identifiers
+ALPHANUMERIC = Alphabet(string.ascii_uppercase + string.digits, 'alphanumeric')
+
+# Every printable ASCII character from space to '~', mod 95 (case kept)
+PRINTABLE = Alphabet(''.join(map(chr, range(32, 127))), 'printable')
+
+ALPHABETS = {alphabet.name: alphabet for alphabet in (LETTERS, ALPHANUMERIC, PRINTABLE)}
+
+
+@lru_cache(maxsize=None)
+def _custom_alphabet(symbols):
+    """One shared Alphabet per custom symbol string"""
+    return Alphabet(symbols)
+
+
+def get_alphabet(alphabet=None):
+    """
+    Resolve an alphabet argument
+    Args:
+        alphabet: None (A-Z), an Alphabet, a built-in name ('letters',
+            'alphanumeric', 'printable') or a string of symbols
+    Returns:
+        Alphabet: Shared alphabet instance
+    """
+    if alphabet is None:
+        return LETTERS
+    if isinstance(alphabet, Alphabet):
+        return alphabet
+    if alphabet in ALPHABETS:
+        return ALPHABETS[alphabet]
+    if alphabet == LETTERS.symbols:
+        return LETTERS
+    return _custom_alphabet(alphabet)
@@ -0,0 +1,594 @@
+"""
+Common building blocks for the cipher classes.
+
+Every cipher can turn a raw key (a shift, "a,b", a keyword, a matrix...)
+into an immutable compiled key holding everything precomputed: translation
+tables, inverses and a fingerprint. ``encrypt``/``decrypt`` accept either
+form, so batch jobs and the GUI only pay parsing and validation once per key.
+
+Ciphers and engines keep no per-call state: cipher instances hold only their
+alphabet, compiled keys are immutable, and the shared caches are either
+``lru_cache``s or memo dicts whose entries never change once written. Any
+number of threads may therefore use the same cipher and key concurrently,
+which ``encrypt_many``/``decrypt_many`` do through a thread pool.
+"""
+
+import os
+from contextlib import contextmanager
+
+from .alphabets import LETTERS
+from .batch import SEPARATOR, keep_separator, run_batch
+from .folding import fold_text
+from .inplace import layout_table, mapped, window_starts
+from .letters import LetterBuffer, layout_symbols
+from .tables import BUFFER_WINDOW, compose_tables
+
+# Batch tasks per worker thread: enough to balance uneven message lengths,
+# few enough that executor overhead stays small next to short messages
+TASKS_PER_WORKER = 4
+
+
+def _run_chunk(func, texts, key):
+    return [func(text, key) for text in texts]
+
+
+def map_messages(func, texts, key, executor=None, workers=None):
+    """
+    Apply func(text, key) to every text, optionally on a thread pool
+    Args:
+        func (callable): Bound encrypt/decrypt method
+        texts (iterable): Messages
+        key: Compiled key shared by all calls
+        executor: None (run in the calling thread), an int (number of threads
+            for a temporary ThreadPoolExecutor) or any concurrent.futures.Executor
+        workers (int): Threads of executor, to size the chunks; the thread
+            count for an int executor, os.cpu_count() by default
+    Returns:
+        list: Results in input order
+    """
+    texts = list(texts)
+    if executor is None or len(texts) < 2:
+        return _run_chunk(func, texts, key)
+    # Imported here: concurrent.futures pulls in logging, too slow for every start-up
+    from concurrent.futures import Executor, ThreadPoolExecutor
+    
+    if isinstance(executor, int):
+        with ThreadPoolExecutor(max_workers=executor) as pool:
+            return map_messages(func, texts, key, pool, executor)
+    if not isinstance(executor, Executor):
+        raise TypeError("executor must be None, a thread count or a concurrent.futures.Executor")
+    
+    # Submit contiguous chunks rather than single messages: per-task overhead
+    # would otherwise dominate the microseconds a short message takes
+    workers = workers or os.cpu_count() or 1
+    size = max(1, -(-len(texts) // (workers * TASKS_PER_WORKER)))
+    futures = [executor.submit(_run_chunk, func, texts[i:i + size], key)
+               for i in range(0, len(texts), size)]
+    return [result for future in futures for result in future.result()]
+
+
+def key_fingerprint(cipher_name, *params):
+    """
+    Short stable identifier for a key
+    Args:
+        cipher_name (str): Name of the cipher the key belongs to
+        *params: Canonical key parameters
+    Returns:
+        str: 16 hex characters
+    """
+    import hashlib
+    
+    canonical = f"{cipher_name}:{','.join(map(str, params))}"
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+@contextmanager
+def open_binary(target, mode):
+    """Binary file object for a path, or target itself if it already is a file object"""
+    if hasattr(target, 'read' if 'r' in mode else 'write'):
+        yield target
+    else:
+        with open(target, mode) as f:
+            yield f
+
+
+def read_chunks(file, size=BUFFER_WINDOW):
+    """Chunks of up to size characters (or bytes) read from an open file, for the stream API"""
+    empty = file.read(0)
+    return iter(lambda: file.read(size), empty)
+
+
+class CompiledKey:
+    """Immutable, fully precomputed key; subclasses list their fields in __slots__"""
+    
+    __slots__ = ('fingerprint',)
+    
+    def _set(self, **fields):
+        """Assign fields once, from __init__"""
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __eq__(self, other):
+        return type(self) is type(other) and self.fingerprint == other.fingerprint
+    
+    def __hash__(self):
+        return hash((type(self), self.fingerprint))
+    
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.fingerprint}>"
+
+
+class Cipher:
+    """Base class for the ciphers: raw/compiled key handling"""
+    
+    key_type = CompiledKey
+    
+    def compile_key(self, key):
+        """
+        Parse and validate a raw key once
+        Args:
+            key: Raw key in any format accepted by encrypt/decrypt
+        Returns:
+            CompiledKey: Immutable key with all tables precomputed
+        """
+        raise NotImplementedError
+    
+    def _key(self, key):
+        """Return key compiled, compiling raw keys on the fly"""
+        if isinstance(key, self.key_type):
+            if getattr(key, 'charset', None) != getattr(self, 'charset', None):
+                raise ValueError(f"{key!r} was compiled for a different alphabet")
+            return key
+        if isinstance(key, CompiledKey):
+            raise ValueError(f"{type(key).__name__} cannot be used with {type(self).__name__}")
+        return self.compile_key(key)
+    
+    def _letter_key(self, key):
+        """Like _key, for LetterBuffer input (which holds A-Z indices only)"""
+        charset = getattr(self, 'charset', LETTERS)
+        if charset != LETTERS:
+            raise ValueError(f"LetterBuffer input requires the A-Z alphabet, not {charset.name}")
+        return self._key(key)
+    
+    def encrypt_many(self, texts, key, executor=None):
+        """
+        Encrypt many messages with one key
+        Args:
+            texts (iterable): Plaintexts (anything encrypt accepts)
+            key: Raw or compiled key (compiled once for all messages)
+            executor: None (calling thread), a thread count, or an Executor
+                such as a ThreadPoolExecutor to fan the messages out to
+        Returns:
+            list: Ciphertexts in input order
+        """
+        return map_messages(self.encrypt, texts, self._key(key), executor)
+    
+    def decrypt_many(self, texts, key, executor=None):
+        """
+        Decrypt many messages with one key
+        Args:
+            texts (iterable): Ciphertexts (anything decrypt accepts)
+            key: Raw or compiled key (compiled once for all messages)
+            executor: None (calling thread), a thread count, or an Executor
+        Returns:
+            list: Plaintexts in input order
+        """
+        return map_messages(self.decrypt, texts, self._key(key), executor)
+    
+    def encrypt_batch(self, texts, key, formatted=False):
+        """
+        Encrypt many messages with one key in a single pass
+        Args:
+            texts (iterable): Plaintexts (str)
+            key: Raw or compiled key
+            formatted (bool): Keep each message's layout (see encrypt_formatted)
+        Returns:
+            list: Ciphertexts, each identical to encrypt(text, key) (or encrypt_formatted)
+        """
+        key = self._key(key)
+        single = self.encrypt_formatted if formatted else self.encrypt
+        return [single(text, key) for text in texts]
+    
+    def decrypt_batch(self, texts, key, formatted=False):
+        """
+        Decrypt many messages with one key in a single pass
+        Args:
+            texts (iterable): Ciphertexts (str)
+            key: Raw or compiled key
+            formatted (bool): Keep each message's layout (see decrypt_formatted)
+        Returns:
+            list: Plaintexts, each identical to decrypt(text, key) (or decrypt_formatted)
+        """
+        key = self._key(key)
+        single = self.decrypt_formatted if formatted else self.decrypt
+        return [single(text, key) for text in texts]
+    
+    def rekey(self, ciphertext, old_key, new_key):
+        """
+        Re-encrypt ciphertext from one key to another
+        Args:
+            ciphertext (str): Text encrypted under old_key
+            old_key: Raw or compiled key the text is encrypted with
+            new_key: Raw or compiled key to encrypt it with instead
+        Returns:
+            str: Same as encrypt(decrypt(ciphertext, old_key), new_key)
+        """
+        return self.encrypt(self.decrypt(ciphertext, old_key), new_key)
+    
+    def encrypt_stream(self, chunks, key):
+        """
+        Encrypt a text that arrives in pieces, in constant memory
+        Args:
+            chunks (iterable): Plaintext pieces (str), split anywhere
+            key: Raw or compiled key
+        Yields:
+            str: Ciphertext pieces whose concatenation equals encrypt(''.join(chunks), key)
+        """
+        raise NotImplementedError
+    
+    def decrypt_stream(self, chunks, key):
+        """
+        Decrypt a text that arrives in pieces, in constant memory
+        Args:
+            chunks (iterable): Ciphertext pieces (str), split anywhere
+            key: Raw or compiled key
+        Yields:
+            str: Plaintext pieces whose concatenation equals decrypt(''.join(chunks), key)
+        """
+        raise NotImplementedError
+    
+    def encrypt_parallel(self, text, key, executor=None):
+        """
+        Encrypt one large text on a process pool (see ciphers.parallel)
+        Args:
+            text (str or bytes-like): Plaintext; bytes are an ASCII payload
+            key: Raw or compiled key
+            executor: None (one process per CPU), a process count or an Executor
+        Returns:
+            str or bytes: Same as encrypt (or encrypt_bytes for bytes input)
+        """
+        raise NotImplementedError
+    
+    def decrypt_parallel(self, text, key, executor=None):
+        """
+        Decrypt one large text on a process pool (see ciphers.parallel)
+        Args:
+            text (str or bytes-like): Ciphertext; bytes are an ASCII payload
+            key: Raw or compiled key
+            executor: None (one process per CPU), a process count or an Executor
+        Returns:
+            str or bytes: Same as decrypt (or decrypt_bytes for bytes input)
+        """
+        raise NotImplementedError
+    
+    def encrypt_buffer(self, buffer, key):
+        """
+        Encrypt an already parsed text
+        Args:
+            buffer (LetterBuffer): Parsed plaintext
+            key: Raw or compiled key
+        Returns:
+            LetterBuffer: Ciphertext letters (layout kept where letter positions are)
+        """
+        raise NotImplementedError
+    
+    def decrypt_buffer(self, buffer, key):
+        """
+        Decrypt an already parsed text
+        Args:
+            buffer (LetterBuffer): Parsed ciphertext
+            key: Raw or compiled key
+        Returns:
+            LetterBuffer: Plaintext letters (layout kept where letter positions are)
+        """
+        raise NotImplementedError
+    
+    def _buffer_method(self, decrypt):
+        """Bound encrypt_buffer/decrypt_buffer, or None if this cipher does not implement it"""
+        name = 'decrypt_buffer' if decrypt else 'encrypt_buffer'
+        if getattr(type(self), name) is getattr(Cipher, name):
+            return None
+        return getattr(self, name)
+    
+    def _formatted(self, text, key, decrypt, case):
+        """Run the buffer API and lay the result out like text (see LetterBuffer.format)"""
+        charset = getattr(self, 'charset', LETTERS)
+        if charset != LETTERS and not isinstance(text, LetterBuffer):
+            # LetterBuffer holds A-Z only: lay out the plain result over the alphabet's symbols
+            return layout_symbols(text, (self.decrypt if decrypt else self.encrypt)(text, key), charset, case)
+        buffer = LetterBuffer.from_text(text)
+        method = self._buffer_method(decrypt)
+        if method is not None:
+            indices = method(buffer, key).indices
+        else:
+            # Ciphers without the buffer API: lay out the letters of their plain result
+            indices = LetterBuffer.from_text((self.decrypt if decrypt else self.encrypt)(str(buffer), key)).indices
+        return buffer.format(indices, case)
+    
+    def encrypt_formatted(self, text, key, case=None):
+        """
+        Encrypt in format-preserving mode: spaces, digits, punctuation and
+        line breaks (everything outside the cipher's alphabet) stay where
+        they are and letters keep their case. The layout is recorded while
+        the text is parsed and re-applied in one linear pass; letters a
+        cipher adds (padding, Playfair's X's) fill the letter positions in
+        order.
+        Args:
+            text (str or LetterBuffer): Plaintext
+            key: Raw or compiled key
+            case (str): None to keep each position's case, 'upper' or 'lower' for one case
+        Returns:
+            str: Ciphertext laid out like text
+        """
+        return self._formatted(text, key, False, case)
+    
+    def decrypt_formatted(self, text, key, case=None):
+        """
+        Decrypt in format-preserving mode (see encrypt_formatted)
+        Args:
+            text (str or LetterBuffer): Ciphertext
+            key: Raw or compiled key
+            case (str): None to keep each position's case, 'upper' or 'lower' for one case
+        Returns:
+            str: Plaintext laid out like text
+        """
+        return self._formatted(text, key, True, case)
+
+
+class SubstitutionCipher(Cipher):
+    """
+    Base class for monoalphabetic ciphers whose compiled keys carry
+    encrypt_table/decrypt_table TranslationTables. Provides the buffer API
+    for ASCII payloads (bytes, bytearray or memoryview) and LetterBuffers.
+    """
+    
+    def _translate_batch(self, texts, table):
+        """All messages through one bytes.translate (see ciphers.batch)"""
+        delete = keep_separator(table.delete_bytes)
+        return run_batch(
+            texts,
+            lambda joined, count: joined.translate(table.bytes_table, delete).decode('ascii').split(SEPARATOR),
+            table.translate)
+    
+    def _layout_batch(self, texts, table, single):
+        """All messages through one bytes.translate that keeps their layout (see encrypt_formatted)"""
+        layout = layout_table(table, self.charset)
+        return run_batch(texts, lambda joined, count: joined.translate(layout).decode('ascii').split(SEPARATOR),
+                         single)
+    
+    def encrypt_batch(self, texts, key, formatted=False):
+        """Substitute every message of a batch in one translate call"""
+        key = self._key(key)
+        if formatted:
+            return self._layout_batch(texts, key.encrypt_table, lambda text: self.encrypt_formatted(text, key))
+        return self._translate_batch(texts, key.encrypt_table)
+    
+    def decrypt_batch(self, texts, key, formatted=False):
+        """Substitute every message of a batch back in one translate call"""
+        key = self._key(key)
+        if formatted:
+            return self._layout_batch(texts, key.decrypt_table, lambda text: self.decrypt_formatted(text, key))
+        return self._translate_batch(texts, key.decrypt_table)
+    
+    def _formatted(self, text, key, decrypt, case):
+        """
+        ASCII text (after accent folding) takes one translate through a table
+        that substitutes the symbols in their own case and keeps every other
+        byte, the same table as encrypt_in_place
+        """
+        if isinstance(text, str):
+            folded = fold_text(text)
+            if folded.isascii():
+                key = self._key(key)
+                table = layout_table(key.decrypt_table if decrypt else key.encrypt_table, self.charset)
+                result = folded.encode('ascii').translate(table).decode('ascii')
+                if case is None:
+                    return result
+                return result.upper() if case == 'upper' else result.lower()
+        return super()._formatted(text, key, decrypt, case)
+    
+    def key_space(self):
+        """Every distinct raw key of the cipher, for exhaustive search"""
+        raise NotImplementedError
+    
+    def decrypt_keys(self, ciphertext, keys=None):
+        """
+        Decrypt one ciphertext under many keys at once (requires NumPy).
+        The text is converted to indices once and all keys are applied by
+        broadcasting over a (keys x m) table of decryption maps.
+        Args:
+            ciphertext (str or LetterBuffer): Text to decrypt
+            keys (iterable): Raw or compiled keys (default: the whole key_space())
+        Returns:
+            KeyMatrix: (K, N) uint8 plaintext indices; rows decode to str lazily
+        """
+        from .multikey import KeyMatrix, substitution_matrix
+        
+        keys = self.key_space() if keys is None else keys
+        if isinstance(ciphertext, LetterBuffer):
+            keys = [self._letter_key(key) for key in keys]
+            indices = ciphertext.indices
+        else:
+            keys = [self._key(key) for key in keys]
+            indices = self.charset.indices(ciphertext)
+        matrix = substitution_matrix(indices, [key.decrypt_table.index_table for key in keys], self.m)
+        return KeyMatrix(keys, matrix, lambda row: self.charset.text(row, lowercase=True))
+    
+    def _rekey_table(self, old_key, new_key):
+        """One table for new_key's encryption after old_key's decryption"""
+        return compose_tables(self._key(old_key).decrypt_table, self._key(new_key).encrypt_table, self.charset)
+    
+    def rekey(self, ciphertext, old_key, new_key):
+        """
+        Re-encrypt ciphertext from one key to another in one pass, through a
+        single composed table (new encryption after old decryption); the
+        plaintext is never materialized
+        Args:
+            ciphertext (str): Text encrypted under old_key
+            old_key: Raw or compiled key the text is encrypted with
+            new_key: Raw or compiled key to encrypt it with instead
+        Returns:
+            str: Same as encrypt(decrypt(ciphertext, old_key), new_key)
+        """
+        return self._rekey_table(old_key, new_key).translate(ciphertext)
+    
+    def rekey_file(self, src, dst, old_key, new_key, window=BUFFER_WINDOW):
+        """
+        Re-encrypt a file from one key to another, window by window (constant memory)
+        Args:
+            src: Path or binary file object of the ASCII ciphertext
+            dst: Path or binary file object to write the new ciphertext to
+            old_key: Raw or compiled key the file is encrypted with
+            new_key: Raw or compiled key to encrypt it with instead
+            window (int): Bytes read per step
+        Returns:
+            int: Number of bytes written
+        """
+        table = self._rekey_table(old_key, new_key)
+        written = 0
+        with open_binary(src, 'rb') as reader, open_binary(dst, 'wb') as writer:
+            for chunk in iter(lambda: reader.read(window), b''):
+                written += writer.write(table.translate_bytes(chunk))
+        return written
+    
+    def _stream(self, method, chunks, key):
+        """Symbols are substituted one at a time, so every chunk stands alone"""
+        for chunk in chunks:
+            result = method(chunk, key)
+            if result:
+                yield result
+    
+    def encrypt_stream(self, chunks, key):
+        """Encrypt a chunked text (no state crosses chunk boundaries)"""
+        return self._stream(self.encrypt, chunks, self._key(key))
+    
+    def decrypt_stream(self, chunks, key):
+        """Decrypt a chunked text (no state crosses chunk boundaries)"""
+        return self._stream(self.decrypt, chunks, self._key(key))
+    
+    def _translate_in_place(self, path, table, window):
+        """Substitute the symbols of a file window by window through its memory map"""
+        layout = layout_table(table, self.charset)
+        with mapped(path) as mm:
+            if mm is None:
+                return 0
+            for start in window_starts(mm, window):
+                mm[start:start + window] = mm[start:start + window].translate(layout)
+            return len(mm)
+    
+    def encrypt_in_place(self, path, key, window=BUFFER_WINDOW):
+        """
+        Encrypt a file in place through a memory map, in fixed-size windows
+        (flat memory, every byte read and written once). Bytes outside the
+        alphabet stay where they are and letters keep their case.
+        Args:
+            path (str): ASCII or UTF-8 text file to overwrite
+            key: Raw or compiled key
+            window (int): Bytes transformed per step
+        Returns:
+            int: File size in bytes (unchanged)
+        """
+        return self._translate_in_place(path, self._key(key).encrypt_table, window)
+    
+    def decrypt_in_place(self, path, key, window=BUFFER_WINDOW):
+        """
+        Decrypt a file in place (see encrypt_in_place)
+        Returns:
+            int: File size in bytes (unchanged)
+        """
+        return self._translate_in_place(path, self._key(key).decrypt_table, window)
+    
+    def decrypt_range(self, path, start, end, key, index=None):
+        """
+        Decrypt only the letters stored at byte offsets start to end of a
+        ciphertext file. Symbols are substituted one at a time, so no letter
+        index is needed (index is accepted for symmetry with HillCipher).
+        Args:
+            path (str): ASCII ciphertext file
+            start (int): First byte offset
+            end (int): Byte offset just past the range
+            key: Raw or compiled key
+            index: Ignored
+        Returns:
+            str: The plaintext letters decrypt() gives for the letters in the range
+        """
+        start = max(0, start)
+        if start >= end:
+            return ''
+        with open(path, 'rb') as f:
+            f.seek(start)
+            return self.decrypt_bytes(f.read(end - start), key).decode('ascii')
+    
+    def _parallel(self, text, key, decrypt, executor):
+        """Substitute a large text on a process pool; small or non-ASCII text takes the serial path"""
+        from .parallel import PARALLEL_MIN_BYTES, TranslateRecipe, ascii_payload, parallel_transform
+        
+        key = self._key(key)
+        data = ascii_payload(text)
+        if data is None or len(data) < PARALLEL_MIN_BYTES:
+            if isinstance(text, str):
+                return self.decrypt(text, key) if decrypt else self.encrypt(text, key)
+            return self.decrypt_bytes(text, key) if decrypt else self.encrypt_bytes(text, key)
+        result = parallel_transform(data, TranslateRecipe(key.decrypt_table if decrypt else key.encrypt_table),
+                                    executor)
+        return result.decode('ascii') if isinstance(text, str) else result
+    
+    def encrypt_parallel(self, text, key, executor=None):
+        """Encrypt a large text on a process pool, one translate per chunk"""
+        return self._parallel(text, key, False, executor)
+    
+    def decrypt_parallel(self, text, key, executor=None):
+        """Decrypt a large text on a process pool, one translate per chunk"""
+        return self._parallel(text, key, True, executor)
+    
+    def encrypt_buffer(self, buffer, key):
+        """Substitute the letters of a LetterBuffer, keeping its layout"""
+        return buffer.with_indices(buffer.indices.translate(self._letter_key(key).encrypt_table.index_table))
+    
+    def decrypt_buffer(self, buffer, key):
+        """Substitute the letters of a LetterBuffer back, keeping its layout"""
+        return buffer.with_indices(buffer.indices.translate(self._letter_key(key).decrypt_table.index_table))
+    
+    def encrypt_bytes(self, data, key):
+        """
+        Encrypt an ASCII payload
+        Args:
+            data (bytes, bytearray or memoryview): Text to encrypt
+            key: Raw or compiled key
+        Returns:
+            bytes: Encrypted ciphertext (uppercase, non-letters omitted)
+        """
+        return self._key(key).encrypt_table.translate_bytes(data)
+    
+    def decrypt_bytes(self, data, key):
+        """
+        Decrypt an ASCII payload
+        Args:
+            data (bytes, bytearray or memoryview): Text to decrypt
+            key: Raw or compiled key
+        Returns:
+            bytes: Decrypted plaintext (lowercase, non-letters omitted)
+        """
+        return self._key(key).decrypt_table.translate_bytes(data)
+    
+    def encrypt_into(self, dst, src, key):
+        """
+        Encrypt src into the caller-provided buffer dst (may be src itself)
+        Returns:
+            int: Number of bytes written
+        """
+        return self._key(key).encrypt_table.translate_into(dst, src)
+    
+    def decrypt_into(self, dst, src, key):
+        """
+        Decrypt src into the caller-provided buffer dst (may be src itself)
+        Returns:
+            int: Number of bytes written
+        """
+        return self._key(key).decrypt_table.translate_into(dst, src)
@@ -0,0 +1,73 @@
+"""
+Ragged batches: many short messages transformed as one buffer.
+
+The messages of a batch are joined with a NUL separator into one ASCII
+byte string, so a single ``bytes.translate`` call cleans (and, for the
+substitution ciphers, encrypts) all of them; splitting on the separator
+gives the messages back. Messages the single pass cannot represent exactly
+(text that is still non-ASCII after accent folding, or that contains NUL
+itself) go through the cipher's per-message path instead, so every result
+is identical to calling ``encrypt``/``decrypt`` on that message alone.
+"""
+
+from functools import lru_cache
+
+from .folding import fold_text
+
+SEPARATOR = '\x00'
+SEPARATOR_BYTE = b'\x00'
+
+# Separator in index space (indices are always below 255)
+SEPARATOR_INDEX = b'\xff'
+
+
+@lru_cache(maxsize=None)
+def keep_separator(delete_bytes):
+    """A delete set that keeps the separator byte"""
+    return delete_bytes.replace(SEPARATOR_BYTE, b'')
+
+
+@lru_cache(maxsize=None)
+def separated_index_table(index_table):
+    """An index translation table that maps the separator to SEPARATOR_INDEX"""
+    table = bytearray(index_table)
+    table[ord(SEPARATOR)] = SEPARATOR_INDEX[0]
+    return bytes(table)
+
+
+def split_offsets(data, offsets):
+    """Slices data[offsets[i]:offsets[i + 1]] for consecutive offsets"""
+    return [data[start:stop] for start, stop in zip(offsets, offsets[1:])]
+
+
+def run_batch(texts, batch, single):
+    """
+    Transform a batch of messages, in one pass wherever possible
+    Args:
+        texts (iterable): Messages (str)
+        batch (callable): batch(joined, count) -> list of count results, where
+            joined is the NUL-joined ASCII bytes of count messages
+        single (callable): single(text) -> result, the per-message path
+    Returns:
+        list: One result per message, in input order
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    joined = SEPARATOR.join(texts)
+    if joined.isascii() and joined.count(SEPARATOR) == len(texts) - 1:
+        return batch(joined.encode('ascii'), len(texts))
+    
+    # Rare: fold what can be folded, leave the rest to the per-message path
+    folded = [fold_text(text) for text in texts]
+    fast = [i for i, text in enumerate(folded) if text.isascii() and SEPARATOR not in text]
+    results = [None] * len(texts)
+    if fast:
+        joined = SEPARATOR.join(folded[i] for i in fast).encode('ascii')
+        for i, result in zip(fast, batch(joined, len(fast))):
+            results[i] = result
+    fast = set(fast)
+    for i, text in enumerate(texts):
+        if i not in fast:
+            results[i] = single(text)
+    return results
@@ -1,57 +1,96 @@
-class CaesarCipher:
+from functools import lru_cache
+
+from .alphabets import LETTERS, get_alphabet
+from .base import CompiledKey, SubstitutionCipher, key_fingerprint
+from .dispatch import dispatcher
+from .letters import LetterBuffer
+from .tables import SUBSTITUTION_ENGINES, TranslationTable
+
+
+@lru_cache(maxsize=None)
+def _shift_tables(alphabet=LETTERS):
+    """Build encrypt/decrypt translation tables for every shift of an alphabet (once)"""
+    m = alphabet.modulus
+    lowercase = alphabet.case_insensitive
+    encrypt = tuple(TranslationTable([(i + shift) % m for i in range(m)], alphabet=alphabet)
+                    for shift in range(m))
+    decrypt = tuple(TranslationTable([(i - shift) % m for i in range(m)], lowercase, alphabet)
+                    for shift in range(m))
+    return encrypt, decrypt
+
+
+class CaesarKey(CompiledKey):
+    """Compiled Caesar key: shift plus its translation tables"""
+    
+    __slots__ = ('shift', 'charset', 'encrypt_table', 'decrypt_table')
+    
+    def __init__(self, shift, charset=LETTERS):
+        encrypt, decrypt = _shift_tables(charset)
+        params = (shift,) if charset == LETTERS else (shift, charset.symbols)
+        self._set(shift=shift, charset=charset, encrypt_table=encrypt[shift], decrypt_table=decrypt[shift],
+                  fingerprint=key_fingerprint('caesar', *params))
+
+
+@lru_cache(maxsize=None)
+def _caesar_key(shift, charset=LETTERS):
+    """One shared CaesarKey per shift and alphabet"""
+    return CaesarKey(shift, charset)
+
+
+_ENGINES = dispatcher.register('caesar', SUBSTITUTION_ENGINES, lambda: _caesar_key(3))
+
+
+class CaesarCipher(SubstitutionCipher):
     """Caesar Cipher implementation with shift-based encryption/decryption"""
     
-    def __init__(self):
-        self.alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    key_type = CaesarKey
+    
+    def __init__(self, alphabet=None):
+        """
+        Args:
+            alphabet: Alphabet, built-in name ('letters', 'alphanumeric',
+                'printable') or string of symbols; A-Z (mod 26) by default
+        """
+        self.charset = get_alphabet(alphabet)
+        self.alphabet = self.charset.symbols
+        self.m = self.charset.modulus
+    
+    def compile_key(self, key):
+        """
+        Compile a Caesar key
+        Args:
+            key (int): Shift value (0-25, or 0 to m - 1 for other alphabets)
+        Returns:
+            CaesarKey: Immutable compiled key
+        """
+        return _caesar_key(int(key) % self.m, self.charset)
+    
+    def key_space(self):
+        """Every shift, 0 to m - 1"""
+        return range(self.m)
     
     def encrypt(self, plaintext, key):
         """
         Encrypt plaintext using Caesar cipher
         Args:
-            plaintext (str): Text to encrypt
-            key (int): Shift value (0-25)
+            plaintext (str or LetterBuffer): Text to encrypt
+            key (int or CaesarKey): Shift value (0-25)
         Returns:
-            str: Encrypted ciphertext (uppercase, spaces/digits omitted)
-        """
-        key = int(key) % 26
-        ciphertext = ''
-        
-        for char in plaintext:
-            if char == ' ' or char.isdigit():
-                # Skip spaces and digits completely
-                continue
-            elif char.upper() in self.alphabet:
-                # Encrypt alphabetic characters (force lowercase processing)
-                old_index = self.alphabet.index(char.upper())
-                new_index = (old_index + key) % 26
-                new_char = self.alphabet[new_index]
-                # Always return uppercase for encryption
-                ciphertext += new_char
-        
-        return ciphertext
+            str: Encrypted ciphertext (uppercase, spaces/digits omitted); a LetterBuffer for LetterBuffer input
+        """
+        if isinstance(plaintext, LetterBuffer):
+            return self.encrypt_buffer(plaintext, key)
+        return _ENGINES.run(plaintext, self._key(key))
     
     def decrypt(self, ciphertext, key):
         """
         Decrypt ciphertext using Caesar cipher
         Args:
-            ciphertext (str): Text to decrypt (uppercase)
-            key (int): Shift value (0-25)
+            ciphertext (str or LetterBuffer): Text to decrypt (uppercase)
+            key (int or CaesarKey): Shift value (0-25)
         Returns:
-            str: Decrypted plaintext (lowercase, spaces/digits omitted)
-        """
-        key = int(key) % 26
-        plaintext = ''
-        
-        for char in ciphertext:
-            if char == ' ' or char.isdigit():
-                # Skip spaces and digits completely
-                continue
-            elif char.upper() in self.alphabet:
-                # Decrypt alphabetic characters (force uppercase processing)
-                old_index = self.alphabet.index(char.upper())
-                new_index = (old_index - key) % 26
-                new_char = self.alphabet[new_index]
-                # Always return lowercase for decryption
-                plaintext += new_char.lower()
-        
-        return plaintext
+            str: Decrypted plaintext (lowercase, spaces/digits omitted); a LetterBuffer for LetterBuffer input
+        """
+        if isinstance(ciphertext, LetterBuffer):
+            return self.decrypt_buffer(ciphertext, key)
+        return _ENGINES.run(ciphertext, self._key(key), decrypt=True)
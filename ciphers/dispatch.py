@@ -0,0 +1,260 @@
+"""
+Size-adaptive engine dispatch.
+
+Each cipher offers several engines for the same transform, ordered from
+lowest setup cost (pure Python) to highest throughput (``translate`` tables,
+NumPy). Which one is fastest depends on the input size, so the crossover
+points are measured by a short calibration the first time a cipher is used
+and persisted to a small JSON cache file; later runs just read it back.
+
+The cache lives at ``~/.cache/classical-cipher/engines.json`` unless the
+``CLASSICAL_CIPHER_CACHE`` environment variable points elsewhere.
+"""
+
+import importlib.util
+import json
+import os
+import platform
+import re
+import sys
+import threading
+import time
+
+from .registry import plugin_engines
+
+CACHE_ENV = 'CLASSICAL_CIPHER_CACHE'
+CACHE_VERSION = 1
+
+# Input sizes (characters) probed during calibration
+CALIBRATION_SIZES = (4, 16, 64, 256, 1024, 4096, 16384)
+
+# Calibration input: uppercase, no J (valid for every cipher's prepared text)
+_SAMPLE = 'THEQUICKBROWNFOXLEAPSOVERTHELAZYDOG'
+
+# `version = "2.1.0"` (optionally annotated) in numpy/version.py
+_VERSION_LINE = re.compile(r'^version\s*(?::\s*str\s*)?=\s*["\']([^"\']+)["\']', re.M)
+
+
+def default_cache_path():
+    """Location of the persisted calibration results"""
+    return os.environ.get(CACHE_ENV) or os.path.join(
+        os.path.expanduser('~'), '.cache', 'classical-cipher', 'engines.json')
+
+
+def _numpy_version():
+    """
+    Installed NumPy version, found without importing NumPy or
+    importlib.metadata (which alone costs more than a light cipher run)
+    """
+    module = sys.modules.get('numpy')
+    if module is not None:
+        return getattr(module, '__version__', None)
+    try:
+        spec = importlib.util.find_spec('numpy')
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    # numpy/version.py is a few plain assignments, so read it as text
+    try:
+        with open(os.path.join(spec.submodule_search_locations[0], 'version.py'), encoding='utf-8') as f:
+            match = _VERSION_LINE.search(f.read())
+        if match:
+            return match.group(1)
+    except OSError:
+        pass
+    try:
+        from importlib.metadata import version
+        return version('numpy')
+    except Exception:
+        return None
+
+
+def _environment():
+    """Versions the measurements depend on; a change triggers recalibration"""
+    return {'python': platform.python_version(), 'numpy': _numpy_version()}
+
+
+def _best_time(func, repeat=3):
+    """Fastest of a few timed runs (seconds), adapting the loop count to the cost"""
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    number = max(1, min(1000, int(0.002 / max(once, 1e-7))))
+    best = once
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+class EngineSet:
+    """
+    The engines of one cipher and the input sizes at which each takes over.
+    
+    Every engine has the signature engine(data, key, decrypt) -> result,
+    where data is the cipher's prepared input and key its compiled key.
+    Engines contributed through the ``classical_cipher.engines`` entry points
+    (see ciphers.registry) are appended on first use rather than at
+    registration, so a plugin module may itself import the cipher.
+    """
+    
+    def __init__(self, name, engines, sample_key, dispatcher, sample_input=None):
+        """
+        Args:
+            name (str): Cipher name (cache key)
+            engines (dict): Engine name -> callable, cheapest setup first
+            sample_key (callable): Returns a compiled key for calibration runs
+            dispatcher (EngineDispatcher): Owner holding the persisted thresholds
+            sample_input (callable): Converts uppercase sample letters to engine input (default: as is)
+        """
+        self.name = name
+        self.engines = dict(engines)
+        self.sample_key = sample_key
+        self.sample_input = sample_input or str
+        self.dispatcher = dispatcher
+        self.forced = None
+        self._thresholds = None
+        self._plugins_pending = True
+    
+    def _add_plugins(self):
+        """Append the engines installed plugins provide for this cipher"""
+        plugins = plugin_engines(self.name)
+        with self.dispatcher._lock:
+            if self._plugins_pending:
+                # Swap in a new dict so concurrent readers never see one change size
+                engines = dict(self.engines)
+                for name, engine in plugins.items():
+                    engines.setdefault(name, engine)
+                self.engines = engines
+                self._plugins_pending = False
+    
+    def thresholds(self):
+        """Engine name -> smallest input size it is used for (None = never)"""
+        if self._plugins_pending:
+            self._add_plugins()
+        if self._thresholds is None:
+            self._thresholds = self.dispatcher.thresholds_for(self)
+        return self._thresholds
+    
+    def select(self, size):
+        """
+        Pick the engine for an input of the given size
+        Returns:
+            tuple: (engine name, engine callable)
+        """
+        if self._plugins_pending:
+            self._add_plugins()
+        if self.forced is not None:
+            return self.forced, self.engines[self.forced]
+        if len(self.engines) == 1:
+            return next(iter(self.engines.items()))
+        chosen = None
+        for name, threshold in self.thresholds().items():
+            if threshold is not None and size >= threshold:
+                chosen = name
+        chosen = chosen or next(iter(self.engines))
+        return chosen, self.engines[chosen]
+    
+    def run(self, data, key, decrypt=False):
+        """Run the engine selected for len(data)"""
+        return self.select(len(data))[1](data, key, decrypt)
+    
+    def force(self, engine=None):
+        """Always use the named engine (None restores size-based selection)"""
+        if self._plugins_pending:
+            self._add_plugins()
+        if engine is not None and engine not in self.engines:
+            raise ValueError(f"Unknown engine {engine!r} for {self.name}; choose from {', '.join(self.engines)}")
+        self.forced = engine
+    
+    def calibrate(self, sizes=CALIBRATION_SIZES):
+        """
+        Measure each engine against the previous one and find where it starts winning
+        Returns:
+            dict: Engine name -> threshold size (None if it never wins)
+        """
+        key = self.sample_key()
+        names = list(self.engines)
+        thresholds = {names[0]: 0}
+        for slower, faster in zip(names, names[1:]):
+            thresholds[faster] = None
+            for size in sizes:
+                data = self.sample_input((_SAMPLE * (size // len(_SAMPLE) + 1))[:size])
+                if (_best_time(lambda: self.engines[faster](data, key, False))
+                        < _best_time(lambda: self.engines[slower](data, key, False))):
+                    thresholds[faster] = size
+                    break
+        return thresholds
+
+
+class EngineDispatcher:
+    """Holds every cipher's EngineSet and the calibration cache shared between them"""
+    
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.engine_sets = {}
+        self._lock = threading.Lock()
+        self._cache = None
+    
+    def register(self, name, engines, sample_key, sample_input=None):
+        """
+        Register a cipher's engines
+        Args:
+            name (str): Cipher name
+            engines (dict): Engine name -> callable(data, key, decrypt), cheapest setup first
+            sample_key (callable): Returns a compiled key for calibration runs
+            sample_input (callable): Converts uppercase sample letters to engine input
+        Returns:
+            EngineSet: Selector used by the cipher
+        """
+        engine_set = EngineSet(name, engines, sample_key, self, sample_input)
+        self.engine_sets[name] = engine_set
+        return engine_set
+    
+    def _path(self):
+        return self.cache_path or default_cache_path()
+    
+    def _load(self):
+        """Read the cache file, discarding it if it was written by another environment"""
+        if self._cache is None:
+            self._cache = {'version': CACHE_VERSION, **_environment(), 'thresholds': {}}
+            try:
+                with open(self._path(), 'r') as f:
+                    stored = json.load(f)
+                if all(stored.get(k) == v for k, v in self._cache.items() if k != 'thresholds'):
+                    self._cache['thresholds'] = stored.get('thresholds', {})
+            except (OSError, ValueError, AttributeError):
+                pass
+        return self._cache
+    
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self._path()), exist_ok=True)
+            with open(self._path(), 'w') as f:
+                json.dump(self._cache, f, indent=2)
+        except OSError:
+            pass
+    
+    def thresholds_for(self, engine_set):
+        """Stored thresholds for a cipher, calibrating (and persisting) them on first use"""
+        with self._lock:
+            stored = self._load()['thresholds'].get(engine_set.name)
+            if stored is None or set(stored) != set(engine_set.engines):
+                stored = engine_set.calibrate()
+                self._cache['thresholds'][engine_set.name] = stored
+                self._save()
+            return stored
+    
+    def recalibrate(self):
+        """Forget stored results and measure every registered cipher again"""
+        with self._lock:
+            self._load()['thresholds'] = {}
+        for engine_set in self.engine_sets.values():
+            engine_set._thresholds = None
+            engine_set.thresholds()
+
+
+dispatcher = EngineDispatcher()
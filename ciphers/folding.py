@@ -0,0 +1,63 @@
+"""
+Folding of accented and other non-ASCII letters onto A-Z.
+
+``fold_text`` maps every letter whose NFKD decomposition is a plain ASCII
+letter plus combining marks (é -> e, Ü -> U, ﬁ -> fi, Ａ -> A) to that base,
+plus a few letters Unicode does not decompose (ß -> ss, Æ -> AE, ø -> o...).
+The table is precomputed for the Latin blocks and extended on demand for
+anything else, so folding a whole text is one ``str.translate`` call, and
+pure-ASCII text is returned untouched without any lookup at all.
+"""
+
+import unicodedata
+
+# Letters without an NFKD decomposition to ASCII
+_EXTRA_FOLDS = {
+    'ß': 'ss', 'ẞ': 'SS', 'æ': 'ae', 'Æ': 'AE', 'œ': 'oe', 'Œ': 'OE',
+    'ø': 'o', 'Ø': 'O', 'đ': 'd', 'Đ': 'D', 'ð': 'd', 'Ð': 'D',
+    'ł': 'l', 'Ł': 'L', 'þ': 'th', 'Þ': 'TH', 'ı': 'i', 'ħ': 'h', 'Ħ': 'H',
+}
+
+# Latin-1 Supplement, Latin Extended-A/B and Latin Extended Additional
+_PRECOMPUTED_RANGES = (range(0x00C0, 0x0250), range(0x1E00, 0x1F00))
+
+
+def _fold(char):
+    """ASCII letters a single non-ASCII letter folds to, or the letter itself"""
+    if char in _EXTRA_FOLDS:
+        return _EXTRA_FOLDS[char]
+    if not char.isalpha():
+        return char
+    base = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+    return base if base.isascii() and base.isalpha() else char
+
+
+class _FoldTable(dict):
+    """str.translate mapping: ordinal -> folded text, resolved once per code point"""
+    
+    def __missing__(self, ordinal):
+        # Threads racing on a new code point store the same value; either write wins
+        folded = _fold(chr(ordinal))
+        self[ordinal] = folded
+        return folded
+
+
+FOLD_TABLE = _FoldTable()
+for _block in _PRECOMPUTED_RANGES:
+    for _ordinal in _block:
+        FOLD_TABLE[_ordinal] = _fold(chr(_ordinal))
+del _block, _ordinal
+
+
+def fold_text(text):
+    """
+    Fold accented and other non-ASCII letters to their ASCII base letters
+    Args:
+        text (str): Input text
+    Returns:
+        str: text itself if it is pure ASCII, otherwise the folded text
+            (characters that have no ASCII base are kept as they are)
+    """
+    if text.isascii():
+        return text
+    return text.translate(FOLD_TABLE)
@@ -1,161 +1,775 @@
-import numpy as np
+import importlib.util
+import os
+from functools import lru_cache
+from itertools import accumulate
+from math import isqrt
 
-class HillCipher:
-    """Hill Cipher implementation using 2x2 key matrix"""
+from .alphabets import LETTERS, get_alphabet
+from .base import Cipher, CompiledKey, key_fingerprint, open_binary
+from .batch import SEPARATOR_INDEX, keep_separator, run_batch, separated_index_table, split_offsets
+from .dispatch import dispatcher
+from .inplace import mapped, restore_case, rewrite_tail, symbol_windows, window_starts
+from .letter_index import DEFAULT_STRIDE, LetterIndex
+from .letters import INDEX_TABLE, LetterBuffer
+from .modular import determinant, matrix_inverse, matrix_product, mod_inverse, singular_primes
+from .parallel import BlockRecipe
+from .tables import BUFFER_WINDOW, clean_letters
+
+# NumPy is optional: it only backs the 'numpy' engine and is imported the
+# first time that engine runs, so short messages never pay for the import
+try:
+    HAVE_NUMPY = importlib.util.find_spec('numpy') is not None
+except (ImportError, ValueError):
+    HAVE_NUMPY = False
+
+
+@lru_cache(maxsize=512)
+def _frozen_array(rows):
+    """Read-only int64 array in row-vector form (transposed), ready for blocks @ matrix"""
+    import numpy as np
+    array = np.array(rows, dtype=np.int64).T.copy()
+    array.flags.writeable = False
+    return array
+
+
+def _product_tables(matrix, m):
+    """
+    Byte tables for the packed engine
+    Returns:
+        tuple: tables[j][k] maps an index v to (matrix[j][k] * v) % m
+    """
+    return tuple(tuple(bytes((x * v) % m for v in range(256)) for x in row) for row in matrix)
+
+
+@lru_cache(maxsize=None)
+def _reduce_table(m):
+    """Byte table mapping every value 0-255 to itself mod m"""
+    return bytes(v % m for v in range(256))
+
+
+class HillKey(CompiledKey):
+    """
+    Compiled Hill key: the validated matrix and its modular inverse (both
+    reduced mod m, as row tuples) plus per-entry product tables. The NumPy
+    arrays (encrypt_matrix/decrypt_matrix) are only built when asked for.
+    """
     
-    def __init__(self):
-        self.alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-        self.m = 26
+    __slots__ = ('size', 'matrix', 'inverse', 'charset', 'modulus', 'encrypt_tables', 'decrypt_tables')
     
-    def _gcd(self, a, b):
-        """Calculate Greatest Common Divisor"""
-        while b:
-            a, b = b, a % b
-        return a
+    def __init__(self, matrix, inverse, charset=LETTERS):
+        flat = (x for row in matrix for x in row)
+        params = flat if charset == LETTERS else (*flat, charset.symbols)
+        self._set(size=len(matrix), matrix=matrix, inverse=inverse,
+                  charset=charset, modulus=charset.modulus,
+                  encrypt_tables=_product_tables(matrix, charset.modulus),
+                  decrypt_tables=_product_tables(inverse, charset.modulus),
+                  fingerprint=key_fingerprint('hill', *params))
+    
+    @property
+    def encrypt_matrix(self):
+        """Transposed key matrix as a read-only NumPy array (imports NumPy)"""
+        return _frozen_array(self.matrix)
+    
+    @property
+    def decrypt_matrix(self):
+        """Transposed inverse matrix as a read-only NumPy array (imports NumPy)"""
+        return _frozen_array(self.inverse)
+
+
+@lru_cache(maxsize=256)
+def _hill_key(matrix, inverse, charset=LETTERS):
+    """One shared HillKey per reduced matrix and alphabet"""
+    return HillKey(matrix, inverse, charset)
+
+
+def _hill_python(indices, key, decrypt=False):
+    """Hill engine: plain integer dot products, block by block (no setup at all)"""
+    matrix = key.inverse if decrypt else key.matrix
+    out = bytearray()
+    for i in range(0, len(indices), key.size):
+        block = indices[i:i + key.size]
+        out.extend([sum(map(int.__mul__, row, block)) % key.modulus for row in matrix])
+    return bytes(out)
+
+
+def _hill_packed(indices, key, decrypt=False):
+    """
+    Hill engine using only the standard library, at C speed per output row.
+    
+    Column k of the message (indices[k::n]) is multiplied by a matrix entry
+    with one bytes.translate. The n products of an output row are summed as
+    big integers: every byte stays below 256, so no carry crosses between
+    letters. A final translate reduces each byte mod m.
+    """
+    n, m = key.size, key.modulus
+    tables = key.decrypt_tables if decrypt else key.encrypt_tables
+    reduce = _reduce_table(m)
+    count = len(indices) // n
+    columns = [indices[k::n] for k in range(n)]
+    out = bytearray(len(indices))
+    for j in range(n):
+        total = bound = 0
+        for k in range(n):
+            if bound + m - 1 > 255:
+                # Reduce early so the next product cannot overflow a byte
+                total = int.from_bytes(total.to_bytes(count, 'big').translate(reduce), 'big')
+                bound = m - 1
+            total += int.from_bytes(columns[k].translate(tables[j][k]), 'big')
+            bound += m - 1
+        out[j::n] = total.to_bytes(count, 'big').translate(reduce)
+    return bytes(out)
+
+
+def _hill_numpy(indices, key, decrypt=False):
+    """Hill engine: the whole message as one (N, n) @ (n, n) product"""
+    import numpy as np
+    matrix_t = key.decrypt_matrix if decrypt else key.encrypt_matrix
+    blocks = np.frombuffer(indices, dtype=np.uint8).reshape(-1, key.size)
+    return ((blocks.astype(np.int64) @ matrix_t) % key.modulus).astype(np.uint8).tobytes()
+
+
+# Engines map symbol indices (bytes, whole blocks) to symbol indices
+_ENGINE_FUNCTIONS = {'python': _hill_python, 'packed': _hill_packed}
+if HAVE_NUMPY:
+    _ENGINE_FUNCTIONS['numpy'] = _hill_numpy
+
+_ENGINES = dispatcher.register('hill', _ENGINE_FUNCTIONS,
+                               lambda: HillCipher().compile_key('3,3,2,5'),
+                               lambda letters: letters.encode('ascii').translate(INDEX_TABLE))
+
+
+class _HillRecipe(BlockRecipe):
+    """
+    What a worker process needs to run Hill on its chunk (see ciphers.parallel):
+    plain matrices and tables, since compiled keys are not picklable
+    """
+    
+    def __init__(self, cipher, key, decrypt):
+        self.block_size = key.size
+        self.matrix, self.inverse = key.matrix, key.inverse
+        self.charset = cipher.charset
+        self.decrypt = decrypt
+        self.table, self.delete = cipher.charset.index_table, cipher.charset.delete_bytes
+        self.padding = cipher._pad_index
+        self.output = cipher._output_table(decrypt)
+    
+    def finish(self, indices, pad):
+        key = _hill_key(self.matrix, self.inverse, self.charset)
+        return _ENGINES.run(indices + self.padding * pad, key, self.decrypt).translate(self.output)
+
+
+class HillCipher(Cipher):
+    """Hill Cipher implementation using an n x n key matrix (2x2, 3x3, 4x4, ...)"""
+    
+    key_type = HillKey
+    
+    def __init__(self, alphabet=None):
+        """
+        Args:
+            alphabet: Alphabet, built-in name ('letters', 'alphanumeric',
+                'printable') or string of symbols; A-Z (mod 26) by default
+        """
+        self.charset = get_alphabet(alphabet)
+        self.alphabet = self.charset.symbols
+        self.m = self.charset.modulus
+        # Short messages are padded with X (or the last symbol if there is no X)
+        self.padding = 'X' if 'X' in self.alphabet else self.alphabet[-1]
+        self._pad_index = bytes([self.alphabet.index(self.padding)])
     
     def _mod_inverse(self, a, m):
         """Find modular multiplicative inverse of a under modulo m"""
-        a = a % m
-        for i in range(1, m):
-            if (a * i) % m == 1:
-                return i
-        return None
-    
-    def _matrix_determinant_2x2(self, matrix):
-        """Calculate determinant of 2x2 matrix"""
-        return int(matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0])
-    
-    def _matrix_inverse_2x2(self, matrix):
-        """Calculate modular inverse of 2x2 matrix"""
-        det = self._matrix_determinant_2x2(matrix)
-        det_mod = det % self.m
-        
-        if self._gcd(det_mod, self.m) != 1:
-            raise ValueError(f"Matrix determinant ({det_mod}) is not coprime with 26. Cannot find inverse.")
-        
-        det_inv = self._mod_inverse(det_mod, self.m)
-        if det_inv is None:
-            raise ValueError("Cannot find modular inverse of determinant")
-        
-        # Adjugate matrix for 2x2: swap diagonal, negate off-diagonal
-        adj_matrix = np.array([
-            [matrix[1][1], -matrix[0][1]],
-            [-matrix[1][0], matrix[0][0]]
-        ])
-        
-        # Multiply by determinant inverse and take modulo
-        inv_matrix = (det_inv * adj_matrix) % self.m
-        return inv_matrix.astype(int)
+        return mod_inverse(a, m)
+    
+    def _matrix_determinant(self, matrix):
+        """Calculate determinant of a square matrix"""
+        return determinant(matrix)
+    
+    def _matrix_inverse(self, matrix):
+        """
+        Calculate modular inverse of a square matrix (Gauss-Jordan mod m, cached per key)
+        """
+        inverse = matrix_inverse(matrix, self.m)
+        if inverse is None:
+            det_mod = self._matrix_determinant(matrix) % self.m
+            raise ValueError(f"Matrix determinant ({det_mod}) is not coprime with {self.m}. Cannot find inverse.")
+        return [list(row) for row in inverse]
     
     def _validate_key_matrix(self, matrix):
-        """Validate that matrix determinant is coprime with 26"""
-        det = self._matrix_determinant_2x2(matrix)
+        """Validate that matrix determinant is coprime with the modulus"""
+        det = self._matrix_determinant(matrix)
         det_mod = det % self.m
         
-        if self._gcd(abs(det_mod), self.m) != 1:
+        # det is a unit mod m iff it is non-zero modulo every prime factor of m
+        if singular_primes(det, self.m):
             return False, det_mod
         return True, det_mod
     
     def _parse_key(self, key):
-        """Parse key string into 2x2 matrix and validate"""
+        """Parse key string (or nested list / NumPy array) into an n x n list-of-lists matrix and validate"""
         if isinstance(key, str):
-            # Expected format: "a,b,c,d" for [[a,b],[c,d]]
+            # Expected format: "a,b,c,d" for [[a,b],[c,d]], 9 values for 3x3, ...
             values = [int(x.strip()) for x in key.split(',')]
-            if len(values) != 4:
-                raise ValueError("Key must contain 4 values for 2x2 matrix")
-            matrix = np.array([[values[0], values[1]], [values[2], values[3]]])
-        elif isinstance(key, (list, np.ndarray)):
-            matrix = np.array(key)
+            size = isqrt(len(values))
+            if size < 2 or size * size != len(values):
+                raise ValueError("Key must contain a square number of values (4 for 2x2, 9 for 3x3, 16 for 4x4)")
+            matrix = [values[i:i + size] for i in range(0, len(values), size)]
+        elif isinstance(key, (list, tuple)) or hasattr(key, 'tolist'):
+            # NumPy arrays are accepted without importing NumPy
+            rows = key.tolist() if hasattr(key, 'tolist') else key
+            try:
+                matrix = [[int(x) for x in row] for row in rows]
+            except TypeError:
+                raise ValueError("Key matrix must be square (2x2 or larger)") from None
         else:
             raise ValueError("Invalid key format")
         
+        if len(matrix) < 2 or any(len(row) != len(matrix) for row in matrix):
+            raise ValueError("Key matrix must be square (2x2 or larger)")
+        
         # Validate the matrix
         is_valid, det_mod = self._validate_key_matrix(matrix)
         if not is_valid:
             raise ValueError(
-                f"Invalid key matrix! Determinant mod 26 = {det_mod}, which is not coprime with 26.\n"
-                f"The determinant must be coprime with 26 (gcd(det, 26) = 1).\n"
-                f"Valid determinant values: 1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25"
+                f"Invalid key matrix! Determinant mod {self.m} = {det_mod}, which is not coprime with {self.m}.\n"
+                f"The determinant must be coprime with {self.m} (gcd(det, {self.m}) = 1).\n"
+                f"Valid determinant values: {', '.join(map(str, self.charset.units))}"
             )
         
         return matrix
     
-    def _prepare_text(self, text):
-        """Prepare text by skipping spaces and digits"""
+    def compile_key(self, key):
+        """
+        Compile a Hill key
+        Args:
+            key: Matrix as string "a,b,c,d" (or 9, 16, ... values) or array [[a,b],[c,d]]
+        Returns:
+            HillKey: Immutable compiled key
+        """
+        key_matrix = self._parse_key(key)
+        inverse = self._matrix_inverse(key_matrix)
+        return _hill_key(tuple(tuple(x % self.m for x in row) for row in key_matrix),
+                         tuple(tuple(row) for row in inverse), self.charset)
+    
+    def _prepare_text(self, text, block_size=2):
+        """Prepare text by skipping spaces and digits (everything outside the alphabet)"""
         # Remove spaces and digits, convert to uppercase
-        clean_text = ''.join(c.upper() for c in text if c.isalpha())
+        if self.charset == LETTERS:
+            clean_text = clean_letters(text)
+        else:
+            clean_text = self.charset.text(self.charset.indices(text))
         
-        # Pad with 'X' if odd length
-        if len(clean_text) % 2 != 0:
-            clean_text += 'X'
+        # Pad with 'X' up to a whole number of blocks
+        if len(clean_text) % block_size != 0:
+            clean_text += self.padding * (block_size - len(clean_text) % block_size)
         
         return clean_text
     
+    def _prepare_indices(self, text, block_size=2):
+        """Prepared text as index bytes, rejecting letters outside the alphabet (e.g. accented ones)"""
+        prepared_text = self._prepare_text(text, block_size)
+        if not prepared_text.isascii():
+            bad = next(c for c in prepared_text if c not in self.alphabet)
+            raise ValueError(f"Unsupported character for Hill cipher: {bad!r}")
+        return prepared_text.encode('ascii').translate(self.charset.index_table)
+    
+    def _buffer_indices(self, data, block_size):
+        """Symbols of an ASCII buffer as padded index bytes, translated window by window"""
+        index_table, delete = self.charset.index_table, self.charset.delete_bytes
+        if isinstance(data, bytes):
+            indices = data.translate(index_table, delete)
+        else:
+            with memoryview(data) as view:
+                view = view.cast('B')
+                indices = b''.join(view[start:start + BUFFER_WINDOW].tobytes().translate(index_table, delete)
+                                   for start in range(0, len(view), BUFFER_WINDOW))
+        return indices + self._pad_index * (-len(indices) % block_size)
+    
+    def _output_table(self, decrypt):
+        """Index -> output symbol byte table (lowercase when decrypting a case-insensitive alphabet)"""
+        if decrypt and self.charset.case_insensitive:
+            return self.charset.lower_from_index
+        return self.charset.upper_from_index
+    
+    def _transform_bytes(self, data, key, decrypt):
+        """Encrypt or decrypt the symbols of an ASCII buffer, returning output bytes (padding kept)"""
+        indices = self._buffer_indices(data, key.size)
+        return _ENGINES.run(indices, key, decrypt).translate(self._output_table(decrypt))
+    
+    def _transform_into(self, dst, src, key, decrypt):
+        """Transform the symbols of src and write them into dst; returns the byte count"""
+        result = self._transform_bytes(src, key, decrypt)
+        with memoryview(dst) as out:
+            out = out.cast('B')
+            if len(result) > len(out):
+                raise ValueError(f"Destination buffer too small ({len(out)} bytes, need {len(result)})")
+            out[:len(result)] = result
+        return len(result)
+    
     def encrypt(self, plaintext, key):
         """
-        Encrypt plaintext using Hill cipher (2x2 matrix)
+        Encrypt plaintext using Hill cipher (n x n matrix)
         Args:
-            plaintext (str): Text to encrypt
-            key: 2x2 matrix as string "a,b,c,d" or array [[a,b],[c,d]]
+            plaintext (str or LetterBuffer): Text to encrypt
+            key: Matrix as string "a,b,c,d" (or 9, 16, ... values), array [[a,b],[c,d]] or HillKey
         Returns:
-            str: Encrypted ciphertext (uppercase, spaces/digits omitted)
+            str: Encrypted ciphertext (uppercase, spaces/digits omitted); a LetterBuffer for LetterBuffer input
         """
-        key_matrix = self._parse_key(key)
-        prepared_text = self._prepare_text(plaintext)
-        ciphertext = ''
+        if isinstance(plaintext, LetterBuffer):
+            return self.encrypt_buffer(plaintext, key)
+        key = self._key(key)
+        indices = self._prepare_indices(plaintext, key.size)
+        return self.charset.text(_ENGINES.run(indices, key))
+    
+    def decrypt(self, ciphertext, key):
+        """
+        Decrypt ciphertext using Hill cipher (n x n matrix)
+        Args:
+            ciphertext (str or LetterBuffer): Text to decrypt (uppercase)
+            key: Matrix as string "a,b,c,d" (or 9, 16, ... values), array [[a,b],[c,d]] or HillKey
+        Returns:
+            str: Decrypted plaintext (lowercase, spaces/digits omitted); a LetterBuffer for LetterBuffer input
+        """
+        if isinstance(ciphertext, LetterBuffer):
+            return self.decrypt_buffer(ciphertext, key)
+        key = self._key(key)
+        indices = self._prepare_indices(ciphertext, key.size)
+        plaintext = self.charset.text(_ENGINES.run(indices, key, decrypt=True), lowercase=True)
         
-        for i in range(0, len(prepared_text), 2):
-            # Convert digraph to vector
-            char1, char2 = prepared_text[i], prepared_text[i + 1]
-            vector = np.array([
-                self.alphabet.index(char1),
-                self.alphabet.index(char2)
-            ])
-            
-            # Multiply by key matrix and mod 26
-            encrypted_vector = np.dot(key_matrix, vector) % self.m
-            
-            # Convert back to characters, always uppercase
-            enc1 = self.alphabet[encrypted_vector[0]]
-            enc2 = self.alphabet[encrypted_vector[1]]
-            
-            ciphertext += enc1 + enc2
+        return self._strip_padding(plaintext, key.size)
+    
+    def _transform_batch(self, texts, key, decrypt):
+        """
+        All messages through one engine run: each message is padded to whole
+        blocks on its own, so blocks never straddle two messages
+        """
+        index_table = separated_index_table(self.charset.index_table)
+        delete = keep_separator(self.charset.delete_bytes)
+        block_size = key.size
+        
+        def batch(joined, count):
+            parts = joined.translate(index_table, delete).split(SEPARATOR_INDEX)
+            padded = [part + self._pad_index * (-len(part) % block_size) for part in parts]
+            offsets = [0, *accumulate(map(len, padded))]
+            text = self.charset.text(_ENGINES.run(b''.join(padded), key, decrypt), lowercase=decrypt)
+            messages = split_offsets(text, offsets)
+            if decrypt:
+                return [self._strip_padding(message, block_size) for message in messages]
+            return messages
         
-        return ciphertext
+        single = self.decrypt if decrypt else self.encrypt
+        return run_batch(texts, batch, lambda text: single(text, key))
     
-    def decrypt(self, ciphertext, key):
+    def encrypt_batch(self, texts, key, formatted=False):
         """
-        Decrypt ciphertext using Hill cipher (2x2 matrix)
+        Encrypt many messages with one key in a single engine run
         Args:
-            ciphertext (str): Text to decrypt (uppercase)
-            key: 2x2 matrix as string "a,b,c,d" or array [[a,b],[c,d]]
+            texts (iterable): Plaintexts (str)
+            key: Raw key or HillKey
+            formatted (bool): Keep each message's layout (see encrypt_formatted),
+                one message at a time
         Returns:
-            str: Decrypted plaintext (lowercase, spaces/digits omitted)
+            list: Ciphertexts, each identical to encrypt(text, key) (padded per message)
         """
-        key_matrix = self._parse_key(key)
-        inv_key_matrix = self._matrix_inverse_2x2(key_matrix)
-        prepared_text = self._prepare_text(ciphertext)
-        plaintext = ''
+        if formatted:
+            return super().encrypt_batch(texts, key, formatted=True)
+        return self._transform_batch(texts, self._key(key), decrypt=False)
+    
+    def decrypt_batch(self, texts, key, formatted=False):
+        """
+        Decrypt many messages with one key in a single engine run
+        Args:
+            texts (iterable): Ciphertexts (str)
+            key: Raw key or HillKey
+            formatted (bool): Keep each message's layout (see decrypt_formatted),
+                one message at a time
+        Returns:
+            list: Plaintexts, each identical to decrypt(text, key) (padding removed per message)
+        """
+        if formatted:
+            return super().decrypt_batch(texts, key, formatted=True)
+        return self._transform_batch(texts, self._key(key), decrypt=True)
+    
+    def decrypt_keys(self, ciphertext, keys, chunk_bytes=None):
+        """
+        Decrypt one ciphertext under many keys at once (requires NumPy).
+        The text is converted to blocks once and multiplied by a stack of
+        inverse matrices, a bounded number of keys at a time.
+        Args:
+            ciphertext (str or LetterBuffer): Text to decrypt
+            keys (iterable): Raw keys or HillKeys, all of the same size
+            chunk_bytes (int): Scratch memory per chunk of keys (default 64 MB)
+        Returns:
+            KeyMatrix: (K, N) uint8 plaintext indices, N including padding;
+                rows decode to str lazily with padding removed
+        """
+        from .multikey import HILL_CHUNK_BYTES, KeyMatrix, hill_matrix
+        
+        if isinstance(ciphertext, LetterBuffer):
+            keys = [self._letter_key(key) for key in keys]
+        else:
+            keys = [self._key(key) for key in keys]
+        if not keys:
+            raise ValueError("At least one key is required")
+        block_size = keys[0].size
+        if any(key.size != block_size for key in keys):
+            raise ValueError("All keys must have the same matrix size")
+        
+        if isinstance(ciphertext, LetterBuffer):
+            indices = ciphertext.indices + self._pad_index * (-len(ciphertext) % block_size)
+        else:
+            indices = self._prepare_indices(ciphertext, block_size)
+        matrix = hill_matrix(indices, [key.inverse for key in keys], self.m, chunk_bytes or HILL_CHUNK_BYTES)
+        return KeyMatrix(keys, matrix,
+                         lambda row: self._strip_padding(self.charset.text(row, lowercase=True), block_size))
+    
+    def _rekey_key(self, old_key, new_key):
+        """Key whose matrix is K_new @ K_old^-1 (and inverse K_old @ K_new^-1)"""
+        old, new = self._key(old_key), self._key(new_key)
+        if old.size != new.size:
+            raise ValueError("Re-keying needs two keys of the same matrix size")
+        return _hill_key(matrix_product(new.matrix, old.inverse, self.m),
+                         matrix_product(old.matrix, new.inverse, self.m), self.charset)
+    
+    def rekey(self, ciphertext, old_key, new_key):
+        """
+        Re-encrypt ciphertext from one key to another in one pass with the
+        single matrix K_new @ K_old^-1; the plaintext is never materialized
+        Args:
+            ciphertext (str): Text encrypted under old_key
+            old_key: Raw key or HillKey the text is encrypted with
+            new_key: Raw key or HillKey of the same size to encrypt it with instead
+        Returns:
+            str: Same as encrypt(decrypt(ciphertext, old_key), new_key)
+        """
+        key = self._rekey_key(old_key, new_key)
+        return self.charset.text(_ENGINES.run(self._prepare_indices(ciphertext, key.size), key))
+    
+    def rekey_file(self, src, dst, old_key, new_key, window=BUFFER_WINDOW):
+        """
+        Re-encrypt a file from one key to another, window by window (constant
+        memory); a partial block is carried over to the next window
+        Args:
+            src: Path or binary file object of the ASCII ciphertext
+            dst: Path or binary file object to write the new ciphertext to
+            old_key: Raw key or HillKey the file is encrypted with
+            new_key: Raw key or HillKey of the same size to encrypt it with instead
+            window (int): Bytes read per step
+        Returns:
+            int: Number of bytes written
+        """
+        key = self._rekey_key(old_key, new_key)
+        index_table, delete = self.charset.index_table, self.charset.delete_bytes
+        output = self._output_table(decrypt=False)
+        carry = b''
+        written = 0
+        with open_binary(src, 'rb') as reader, open_binary(dst, 'wb') as writer:
+            for chunk in iter(lambda: reader.read(window), b''):
+                indices = carry + chunk.translate(index_table, delete)
+                cut = len(indices) - len(indices) % key.size
+                carry = indices[cut:]
+                written += writer.write(_ENGINES.run(indices[:cut], key).translate(output))
+            if carry:
+                carry += self._pad_index * (key.size - len(carry))
+                written += writer.write(_ENGINES.run(carry, key).translate(output))
+        return written
+    
+    def _stream(self, chunks, key, decrypt):
+        """
+        Chunked encrypt/decrypt. A partial block is carried into the next
+        chunk and padded at the end; when decrypting, the last block of
+        output is held back until the end, since only there can it be padding.
+        """
+        carry = b''
+        held = ''
+        for chunk in chunks:
+            indices = carry + self._prepare_indices(chunk, 1)
+            cut = len(indices) - len(indices) % key.size
+            carry = indices[cut:]
+            if not cut:
+                continue
+            result = self.charset.text(_ENGINES.run(indices[:cut], key, decrypt), lowercase=decrypt)
+            if decrypt:
+                result = held + result
+                held = result[-key.size:]
+                result = result[:-key.size]
+            if result:
+                yield result
+        if carry:
+            carry += self._pad_index * (key.size - len(carry))
+            held += self.charset.text(_ENGINES.run(carry, key, decrypt), lowercase=decrypt)
+        if decrypt:
+            held = self._strip_padding(held, key.size)
+        if held:
+            yield held
+    
+    def encrypt_stream(self, chunks, key):
+        """
+        Encrypt a text that arrives in pieces, in constant memory
+        Args:
+            chunks (iterable): Plaintext pieces (str), split anywhere
+            key: Raw key or HillKey
+        Yields:
+            str: Ciphertext pieces whose concatenation equals encrypt(''.join(chunks), key)
+        """
+        return self._stream(chunks, self._key(key), decrypt=False)
+    
+    def decrypt_stream(self, chunks, key):
+        """
+        Decrypt a text that arrives in pieces, in constant memory
+        Args:
+            chunks (iterable): Ciphertext pieces (str), split anywhere
+            key: Raw key or HillKey
+        Yields:
+            str: Plaintext pieces whose concatenation equals decrypt(''.join(chunks), key)
+        """
+        return self._stream(chunks, self._key(key), decrypt=True)
+    
+    def _transform_symbols(self, symbols, key, decrypt):
+        """Encrypt or decrypt whole blocks of symbol bytes, keeping each position's case"""
+        indices = symbols.translate(self.charset.index_table)
+        result = _ENGINES.run(indices, key, decrypt).translate(self.charset.upper_from_index)
+        return restore_case(result, symbols, self.charset)
+    
+    def _transform_in_place(self, path, key, decrypt, window):
+        """
+        Transform a file through its memory map, window by window. Letters of
+        a block that straddles two windows are carried with their positions;
+        the positions of the last block are kept for the padding at the end.
+        """
+        n = key.size
+        carry = []      # (position, symbol byte) of an unfinished block
+        recent = []     # Positions of the last n symbols so far
+        with mapped(path) as mm:
+            if mm is None:
+                return 0
+            size = len(mm)
+            with symbol_windows(mm, self.charset) as windows:
+                for start in window_starts(mm, window):
+                    symbols = windows.read(start, min(start + window, size))
+                    positions = windows.last_positions(n)
+                    recent = (recent + positions)[-n:]
+                    total = len(carry) + len(symbols)
+                    rest = total % n
+                    if total == rest:
+                        carry += zip(positions, symbols)
+                        continue
+                    result = self._transform_symbols(bytes(b for _, b in carry) + symbols[:len(symbols) - rest],
+                                                     key, decrypt)
+                    for (position, _), byte in zip(carry, result):
+                        mm[position] = byte
+                    windows.write(result[len(carry):])
+                    carry = list(zip(positions[len(positions) - rest:], symbols[len(symbols) - rest:])) if rest else []
+            
+            extra = b''
+            if carry:
+                # Pad the last block with X, in the case of the letter before it
+                padding = restore_case(self.padding.encode('ascii'), bytes([carry[-1][1]]), self.charset)
+                block = bytes(b for _, b in carry) + padding * (n - len(carry))
+                result = self._transform_symbols(block, key, decrypt)
+                for (position, _), byte in zip(carry, result):
+                    mm[position] = byte
+                extra = result[len(carry):]
+            delete = []
+            if decrypt and recent:
+                # Strip padding as decrypt() does; padding inside the file is deleted
+                tail = (bytes(mm[position] for position in recent) + extra).decode('ascii')
+                if self.charset.case_insensitive:
+                    tail = tail.lower()
+                stripped = len(tail) - len(self._strip_padding(tail, n))
+                if stripped > len(extra):
+                    delete = recent[len(recent) - (stripped - len(extra)):]
+                extra = extra[:max(0, len(extra) - stripped)]
         
-        for i in range(0, len(prepared_text), 2):
-            # Convert digraph to vector
-            char1, char2 = prepared_text[i], prepared_text[i + 1]
-            vector = np.array([
-                self.alphabet.index(char1),
-                self.alphabet.index(char2)
-            ])
+        if delete:
+            size += rewrite_tail(path, delete[0], delete=delete)
+        elif extra:
+            size += rewrite_tail(path, recent[-1] + 1, insert=extra)
+        return size
+    
+    def encrypt_in_place(self, path, key, window=BUFFER_WINDOW):
+        """
+        Encrypt a file in place through a memory map, in fixed-size windows
+        (flat memory, every byte read and written once). Bytes outside the
+        alphabet stay where they are and letters keep their case; padding
+        X's are inserted after the last letter.
+        Args:
+            path (str): ASCII or UTF-8 text file to overwrite
+            key: Raw key or HillKey
+            window (int): Bytes transformed per step
+        Returns:
+            int: File size in bytes afterwards
+        """
+        return self._transform_in_place(path, self._key(key), False, window)
+    
+    def decrypt_in_place(self, path, key, window=BUFFER_WINDOW):
+        """
+        Decrypt a file in place (see encrypt_in_place); padding X's after the
+        last letter are removed
+        Returns:
+            int: File size in bytes afterwards
+        """
+        return self._transform_in_place(path, self._key(key), True, window)
+    
+    def index_file(self, path, stride=DEFAULT_STRIDE):
+        """
+        Build and save the letter-offset sidecar that decrypt_range seeks with
+        Args:
+            path (str): ASCII ciphertext file
+            stride (int): Letters between index entries
+        Returns:
+            LetterIndex: The saved index
+        """
+        index = LetterIndex.build(path, self.charset, stride)
+        index.save(path)
+        return index
+    
+    def decrypt_range(self, path, start, end, key, index=None):
+        """
+        Decrypt only the letters stored at byte offsets start to end of a
+        ciphertext file. The block alignment of the first letter comes from the
+        letter index, so the work is proportional to the range plus one index
+        stride; without an index the file is scanned from the beginning.
+        Args:
+            path (str): ASCII ciphertext file
+            start (int): First byte offset
+            end (int): Byte offset just past the range
+            key: Raw key or HillKey
+            index (LetterIndex): Index of path (default: its sidecar, if present and up to date)
+        Returns:
+            str: The plaintext letters decrypt() gives for the letters in the range
+        """
+        key = self._key(key)
+        n = key.size
+        index = index or LetterIndex.open(path, self.charset)
+        index_table, delete = self.charset.index_table, self.charset.delete_bytes
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            start, end = max(0, start), min(end, size)
+            if start >= end:
+                return ''
             
-            # Multiply by inverse key matrix and mod 26
-            decrypted_vector = np.dot(inv_key_matrix, vector) % self.m
+            # Letters from the nearest index entry up to start; the block holding
+            # the first letter of the range may begin before that entry
+            ordinal, offset = index.locate(start) if index else (0, 0)
+            while True:
+                f.seek(offset)
+                before = f.read(start - offset).translate(index_table, delete)
+                lead = (ordinal + len(before)) % n
+                if len(before) >= lead:
+                    break
+                ordinal, offset = index.locate(offset - 1)
             
-            # Convert back to characters, always lowercase
-            dec1 = self.alphabet[int(decrypted_vector[0])]
-            dec2 = self.alphabet[int(decrypted_vector[1])]
+            middle = f.read(end - start).translate(index_table, delete)
+            if not middle:
+                return ''
             
-            plaintext += dec1.lower() + dec2.lower()
+            # Complete the last block, and look one letter further to learn
+            # whether it is the final block (whose padding decrypt() strips)
+            need = -(lead + len(middle)) % n
+            after = b''
+            final = False
+            while len(after) <= need:
+                chunk = f.read(BUFFER_WINDOW)
+                if not chunk:
+                    final = True
+                    break
+                after += chunk.translate(index_table, delete)
         
-        # Remove padding X at the end if it exists
-        if len(plaintext) > 0 and plaintext[-1] == 'x':
-            plaintext = plaintext[:-1]
+        indices = before[len(before) - lead:] + middle + after[:need]
+        indices += self._pad_index * (-len(indices) % n)
+        plaintext = self.charset.text(_ENGINES.run(indices, key, decrypt=True), lowercase=True)
+        if final:
+            plaintext = self._strip_padding(plaintext, n)
+        return plaintext[lead:lead + len(middle)]
+    
+    def _parallel(self, text, key, decrypt, executor):
+        """Run Hill on a large text on a process pool; small or non-ASCII text takes the serial path"""
+        from .parallel import PARALLEL_MIN_BYTES, ascii_payload, parallel_transform
         
-        return plaintext
+        key = self._key(key)
+        data = ascii_payload(text)
+        if data is None or len(data) < PARALLEL_MIN_BYTES:
+            if isinstance(text, str):
+                return self.decrypt(text, key) if decrypt else self.encrypt(text, key)
+            return self.decrypt_bytes(text, key) if decrypt else self.encrypt_bytes(text, key)
+        result = parallel_transform(data, _HillRecipe(self, key, decrypt), executor)
+        if decrypt:
+            result = self._strip_padding(result, key.size)
+        return result.decode('ascii') if isinstance(text, str) else result
+    
+    def encrypt_parallel(self, text, key, executor=None):
+        """Encrypt a large text on a process pool, in chunks of whole blocks"""
+        return self._parallel(text, key, False, executor)
+    
+    def decrypt_parallel(self, text, key, executor=None):
+        """Decrypt a large text on a process pool, in chunks of whole blocks"""
+        return self._parallel(text, key, True, executor)
+    
+    def encrypt_buffer(self, buffer, key):
+        """
+        Encrypt a LetterBuffer (padded with X to whole blocks), keeping its layout
+        """
+        key = self._letter_key(key)
+        indices = buffer.indices + self._pad_index * (-len(buffer) % key.size)
+        return buffer.with_indices(_ENGINES.run(indices, key))
+    
+    def decrypt_buffer(self, buffer, key):
+        """
+        Decrypt a LetterBuffer, keeping its layout; padding X's are removed
+        """
+        key = self._letter_key(key)
+        indices = buffer.indices + self._pad_index * (-len(buffer) % key.size)
+        plaintext = _ENGINES.run(indices, key, decrypt=True)
+        return buffer.with_indices(self._strip_padding(plaintext, key.size, self._pad_index))
+    
+    def encrypt_bytes(self, data, key):
+        """
+        Encrypt an ASCII payload
+        Args:
+            data (bytes, bytearray or memoryview): Text to encrypt
+            key: Raw key or HillKey
+        Returns:
+            bytes: Encrypted ciphertext (uppercase, non-letters omitted)
+        """
+        return self._transform_bytes(data, self._key(key), decrypt=False)
+    
+    def decrypt_bytes(self, data, key):
+        """
+        Decrypt an ASCII payload
+        Args:
+            data (bytes, bytearray or memoryview): Text to decrypt
+            key: Raw key or HillKey
+        Returns:
+            bytes: Decrypted plaintext (lowercase, non-letters omitted)
+        """
+        key = self._key(key)
+        return self._strip_padding(self._transform_bytes(data, key, decrypt=True), key.size)
+    
+    def encrypt_into(self, dst, src, key):
+        """
+        Encrypt src into the caller-provided buffer dst (may be src itself)
+        Returns:
+            int: Number of bytes written
+        """
+        return self._transform_into(dst, src, self._key(key), decrypt=False)
+    
+    def decrypt_into(self, dst, src, key):
+        """
+        Decrypt src into the caller-provided buffer dst (may be src itself)
+        Returns:
+            int: Number of bytes written (padding removed)
+        """
+        key = self._key(key)
+        written = self._transform_into(dst, src, key, decrypt=True)
+        with memoryview(dst) as out:
+            tail = out.cast('B')[max(0, written - key.size):written].tobytes()
+        return written - (len(tail) - len(self._strip_padding(tail, key.size)))
+    
+    def _strip_padding(self, plaintext, block_size=2, padding=None):
+        """Remove padding X's at the end (at most block_size - 1 of them); works on str and bytes"""
+        if padding is None:
+            padding = self.padding.lower() if self.charset.case_insensitive else self.padding
+            if isinstance(plaintext, bytes):
+                padding = padding.encode('ascii')
+        stripped = plaintext.rstrip(padding)
+        return stripped if len(plaintext) - len(stripped) < block_size else plaintext[:1 - block_size]
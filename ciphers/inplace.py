@@ -0,0 +1,217 @@
+"""
+In-place file transforms over a memory map.
+
+The file is mapped and walked in fixed-size windows; each window is read
+once, transformed and written back over itself, so memory use stays flat
+however large the file is. Bytes outside the cipher alphabet (spaces,
+punctuation, line breaks, UTF-8 sequences of accented letters) are left
+where they are, and letters keep their case: only the symbols change.
+
+Hill works on blocks of letters that may straddle two windows; the few
+letters of an unfinished block are carried with their file positions and
+written back once the block is complete. Padding is the one thing that
+changes the file's length: encryption inserts the padding X's right after
+the last letter, and decryption removes them again.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import accumulate
+
+# Mapped pages already transformed are released every this many bytes
+RELEASE_BYTES = 16 << 20
+
+_MADV_DONTNEED = getattr(mmap, 'MADV_DONTNEED', None)
+
+
+@contextmanager
+def mapped(path):
+    """Writable memory map of a whole file (None for an empty file, which cannot be mapped)"""
+    with open(path, 'r+b') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0) as mm:
+            yield mm
+
+
+@lru_cache(maxsize=256)
+def layout_table(table, alphabet):
+    """
+    256-byte table substituting the symbols of an alphabet and keeping every other byte
+    Args:
+        table (TranslationTable): Substitution over alphabet
+        alphabet (Alphabet): Symbols the table is over
+    Returns:
+        bytes: Table for bytes.translate (no delete set); letters keep their case
+    """
+    layout = bytearray(range(256))
+    for byte in alphabet.input_bytes:
+        out = chr(table.bytes_table[byte])
+        if alphabet.case_insensitive:
+            out = out.lower() if chr(byte).islower() else out.upper()
+        layout[byte] = ord(out)
+    return bytes(layout)
+
+
+@lru_cache(maxsize=None)
+def _run_tables(alphabet):
+    """(symbols kept / everything else -> NUL, 0xFF for non-symbols / 0x00 for symbols)"""
+    symbols = set(alphabet.input_bytes)
+    return (bytes(b if b in symbols else 0 for b in range(256)),
+            bytes(0 if b in symbols else 0xFF for b in range(256)))
+
+
+@lru_cache(maxsize=None)
+def _lowercase_mask(alphabet):
+    """Byte -> 0xFF for lowercase input of a case-insensitive alphabet, 0x00 otherwise"""
+    return bytes(0xFF if chr(b).islower() and b in alphabet.input_bytes else 0 for b in range(256))
+
+
+def _select(mask, first, second):
+    """Per byte: second where mask is 0xFF, first where it is 0x00 (done on whole ints)"""
+    a = int.from_bytes(first, 'big')
+    b = int.from_bytes(second, 'big')
+    return (a ^ ((a ^ b) & int.from_bytes(mask, 'big'))).to_bytes(len(first), 'big')
+
+
+def restore_case(symbols, original, alphabet):
+    """
+    Give each output symbol the case of the input symbol it replaces
+    Args:
+        symbols (bytes): Output symbols (uppercase)
+        original (bytes): Input symbols, same length
+        alphabet (Alphabet): Alphabet of both
+    Returns:
+        bytes: symbols, lowercased where original is lowercase
+    """
+    if not alphabet.case_insensitive:
+        return symbols
+    return _select(original.translate(_lowercase_mask(alphabet)), symbols, symbols.lower())
+
+
+class _Runs:
+    """
+    Symbols of a window, standard library only: every non-symbol byte becomes
+    NUL, so bytes.split gives the symbol runs and bytes.join puts new symbols
+    back in the same places
+    """
+    
+    def __init__(self, mm, alphabet):
+        self.mm = mm
+        self.split_table, self.keep_table = _run_tables(alphabet)
+    
+    def read(self, start, end):
+        """Symbols of mm[start:end], in order"""
+        self.start, self.end = start, end
+        self.window = self.mm[start:end]
+        self.runs = self.window.translate(self.split_table).split(b'\0')
+        self.symbols = b''.join(self.runs)
+        return self.symbols
+    
+    def write(self, symbols):
+        """Replace the first len(symbols) symbols of the window"""
+        symbols += self.symbols[len(symbols):]
+        offsets = [0, *accumulate(map(len, self.runs))]
+        spread = b'\0'.join(map(symbols.__getitem__, map(slice, offsets, offsets[1:])))
+        self.mm[self.start:self.end] = _select(self.window.translate(self.keep_table), spread, self.window)
+    
+    def last_positions(self, count):
+        """File positions of the last count symbols of the window (fewer if it holds fewer), ascending"""
+        positions = []
+        end = self.end
+        for run in reversed(self.runs):
+            take = min(len(run), count - len(positions))
+            positions.extend(range(end - 1, end - 1 - take, -1))
+            if len(positions) == count:
+                break
+            end -= len(run) + 1
+        return positions[::-1]
+    
+    def release(self):
+        pass
+
+
+class _Masks:
+    """Symbols of a window located with a NumPy lookup mask and written back by fancy indexing"""
+    
+    def __init__(self, mm, alphabet, np):
+        self.np = np
+        self.view = np.frombuffer(mm, dtype=np.uint8)
+        self.is_symbol = np.zeros(256, dtype=bool)
+        self.is_symbol[list(alphabet.input_bytes)] = True
+    
+    def read(self, start, end):
+        self.start = start
+        self.segment = self.view[start:end]
+        self.positions = self.np.flatnonzero(self.is_symbol[self.segment])
+        return self.segment[self.positions].tobytes()
+    
+    def write(self, symbols):
+        self.segment[self.positions[:len(symbols)]] = self.np.frombuffer(symbols, dtype=self.np.uint8)
+    
+    def last_positions(self, count):
+        return (self.positions[max(0, len(self.positions) - count):] + self.start).tolist()
+    
+    def release(self):
+        # The map cannot be closed while arrays still export its buffer
+        self.view = self.segment = None
+
+
+@contextmanager
+def symbol_windows(mm, alphabet):
+    """
+    Window reader/writer for the symbols of a map: NumPy when it is
+    installed (about ten times faster), the standard library otherwise
+    """
+    try:
+        import numpy
+    except ImportError:
+        yield _Runs(mm, alphabet)
+        return
+    windows = _Masks(mm, alphabet, numpy)
+    try:
+        yield windows
+    finally:
+        windows.release()
+
+
+def window_starts(mm, window):
+    """
+    Offsets of consecutive windows of a map. Pages behind the current
+    window are dropped from the process every RELEASE_BYTES (they stay in
+    the page cache, changes included), so the resident set stays flat.
+    """
+    released = 0
+    for start in range(0, len(mm), window):
+        yield start
+        done = min(start + window, len(mm)) // mmap.PAGESIZE * mmap.PAGESIZE
+        if done - released >= RELEASE_BYTES and _MADV_DONTNEED is not None:
+            mm.madvise(_MADV_DONTNEED, released, done - released)
+            released = done
+
+
+def rewrite_tail(path, start, insert=b'', delete=()):
+    """
+    Insert bytes at a file position, or delete single bytes at or after it,
+    moving the rest of the file (only the part after start is read)
+    Args:
+        path (str): File to change
+        start (int): Position of the insertion, or of the first deleted byte
+        insert (bytes): Bytes to insert at start
+        delete (iterable): Ascending positions of bytes to delete
+    Returns:
+        int: Change in file size
+    """
+    with open(path, 'r+b') as f:
+        f.seek(start)
+        tail = f.read()
+        for position in reversed(list(delete)):
+            tail = tail[:position - start] + tail[position - start + 1:]
+        removed = f.tell() - start - len(tail)
+        f.seek(start)
+        f.write(insert + tail)
+        f.truncate()
+    return len(insert) - removed
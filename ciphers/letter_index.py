@@ -0,0 +1,152 @@
+"""
+Sparse letter-offset index for random access into large ciphertext files.
+
+Block ciphers pair letters counted from the start of the text, so reading
+a byte range in the middle of a file needs the ordinal of its first letter.
+A ``LetterIndex`` records, every ``stride`` letters, the byte offset before
+which exactly that many letters lie. Looking up a byte position costs one
+bisection plus a scan of at most ``stride`` letters, however large the file.
+
+The index is saved next to the file as a sidecar (``<file>.lidx``) that
+remembers the file's size and modification time; a stale sidecar is ignored.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+
+from .alphabets import LETTERS
+from .tables import BUFFER_WINDOW
+
+SIDECAR_SUFFIX = '.lidx'
+
+# Letters between index entries: a 20 GB file needs about 2.5 MB of index
+DEFAULT_STRIDE = 1 << 16
+
+_MAGIC = b'CCLIDX1\x00'
+# magic, stride, letter count, file size, file mtime (ns), alphabet length
+_HEADER = struct.Struct('<8sQQQQH')
+
+
+def sidecar_path(path):
+    """Path of the index sidecar for a file"""
+    return os.fspath(path) + SIDECAR_SUFFIX
+
+
+def _prefix_length(data, count, delete):
+    """Shortest prefix of data holding count symbols (delete is the alphabet's non-symbol set)"""
+    lo, hi = count, len(data)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if len(data[:mid].translate(None, delete)) >= count:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class LetterIndex:
+    """
+    Byte offsets of every stride-th letter of a file.
+    
+    Attributes:
+        stride (int): Letters between entries
+        offsets (array): offsets[k] is the byte offset with k * stride letters before it
+        letters (int): Letters in the whole file
+        alphabet (Alphabet): Symbols counted as letters
+    """
+    
+    def __init__(self, stride, offsets, letters, alphabet=LETTERS, size=None, mtime_ns=None):
+        self.stride = stride
+        self.offsets = offsets
+        self.letters = letters
+        self.alphabet = alphabet
+        self.size = size
+        self.mtime_ns = mtime_ns
+    
+    @classmethod
+    def build(cls, path, alphabet=LETTERS, stride=DEFAULT_STRIDE, window=BUFFER_WINDOW):
+        """
+        Index a file in one pass of fixed-size windows
+        Args:
+            path (str): ASCII text file
+            alphabet (Alphabet): Symbols counted as letters
+            stride (int): Letters between entries
+            window (int): Bytes read per step
+        Returns:
+            LetterIndex: The index (not yet saved; see save)
+        """
+        if stride < 1:
+            raise ValueError("Index stride must be at least 1")
+        delete = alphabet.delete_bytes
+        offsets = array('Q', [0])
+        count = position = 0
+        target = stride
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            for chunk in iter(lambda: f.read(window), b''):
+                letters = len(chunk.translate(None, delete))
+                while count + letters >= target:
+                    offsets.append(position + _prefix_length(chunk, target - count, delete))
+                    target += stride
+                count += letters
+                position += len(chunk)
+        return cls(stride, offsets, count, alphabet, stat.st_size, stat.st_mtime_ns)
+    
+    def save(self, path):
+        """Write the index to the sidecar of path (the file it was built from)"""
+        offsets = array('Q', self.offsets)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        symbols = self.alphabet.symbols.encode('ascii')
+        with open(sidecar_path(path), 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self.stride, self.letters, self.size, self.mtime_ns, len(symbols)))
+            f.write(symbols)
+            offsets.tofile(f)
+    
+    @classmethod
+    def open(cls, path, alphabet=LETTERS):
+        """
+        Load the sidecar of path if it exists, matches the file and uses alphabet
+        Args:
+            path (str): The indexed file (not the sidecar)
+            alphabet (Alphabet): Alphabet the caller counts letters with
+        Returns:
+            LetterIndex or None: None when there is no usable sidecar
+        """
+        try:
+            with open(sidecar_path(path), 'rb') as f:
+                header = f.read(_HEADER.size)
+                if len(header) != _HEADER.size:
+                    return None
+                magic, stride, letters, size, mtime_ns, length = _HEADER.unpack(header)
+                stat = os.stat(path)
+                if (magic != _MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns
+                        or f.read(length) != alphabet.symbols.encode('ascii')):
+                    return None
+                offsets = array('Q')
+                offsets.frombytes(f.read())
+        except (OSError, struct.error):
+            return None
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        return cls(stride, offsets, letters, alphabet, size, mtime_ns)
+    
+    def locate(self, position):
+        """
+        Nearest indexed point at or before a byte position
+        Args:
+            position (int): Byte offset in the file
+        Returns:
+            tuple: (letters before offset, offset)
+        """
+        entry = max(0, bisect_right(self.offsets, position) - 1)
+        return entry * self.stride, self.offsets[entry]
+    
+    def __len__(self):
+        return len(self.offsets)
+    
+    def __repr__(self):
+        return f"<LetterIndex {self.letters} letters, every {self.stride} ({len(self.offsets)} entries)>"
@@ -0,0 +1,271 @@
+"""
+Parsed text shared between the ciphers, the cracker and the GUI.
+
+A ``LetterBuffer`` holds the letters of a text as one byte per letter
+(A=0 ... Z=25) plus a sparse description of everything else: the runs of
+non-letter characters and the ranges of lowercase letters. Text is parsed
+once; every cipher operation then works on the indices directly, and the
+original layout can be re-applied to any result.
+"""
+
+import re
+from functools import lru_cache
+
+from .folding import fold_text
+from .inplace import restore_case
+from .tables import ALPHABET, ASCII_LETTERS, DELETE_BYTES
+
+# ASCII letter byte -> index 0-25 (use together with DELETE_BYTES)
+INDEX_TABLE = bytes.maketrans(ASCII_LETTERS, bytes(range(26)) * 2)
+
+# Index 0-25 -> ASCII letter byte
+UPPER_FROM_INDEX = bytes.maketrans(bytes(range(26)), ALPHABET.encode('ascii'))
+LOWER_FROM_INDEX = bytes.maketrans(bytes(range(26)), ALPHABET.lower().encode('ascii'))
+
+_NON_LETTERS = re.compile(r'[^A-Za-z]+')
+_LOWER_RUNS = re.compile(rb'[a-z]+')
+
+
+def _classify(char):
+    """
+    Letter index and case of a non-ASCII character
+    Returns:
+        tuple: (index, is_lowercase), or None if it is not a letter of A-Z
+    """
+    if not char.isalpha():
+        return None
+    upper = char.upper()
+    if len(upper) != 1 or upper not in ALPHABET:
+        return None
+    return ALPHABET.index(upper), upper != char
+
+
+class LetterBuffer:
+    """
+    Letters of a text as indices plus a sparse mask of the rest.
+    
+    Attributes:
+        indices (bytes): One byte per letter, A=0 ... Z=25
+        gaps (tuple): (letter offset, text) pairs; each non-letter run sits
+            just before the letter at that offset
+        lower (tuple): (start, stop) letter ranges that were lowercase
+    """
+    
+    __slots__ = ('indices', 'gaps', 'lower')
+    
+    def __init__(self, indices, gaps=(), lower=()):
+        self.indices = bytes(indices)
+        self.gaps = tuple(gaps)
+        self.lower = tuple(lower)
+    
+    @classmethod
+    def from_text(cls, text):
+        """
+        Parse text once
+        Args:
+            text (str): Any text; accented letters are folded to their base
+                letter (é -> e), other characters outside A-Z are non-letters
+        Returns:
+            LetterBuffer: Indices and layout of text
+        """
+        if isinstance(text, cls):
+            return text
+        text = fold_text(text)
+        if text.isascii():
+            letters = text.encode('ascii').translate(None, DELETE_BYTES)
+            gaps = []
+            removed = 0
+            for match in _NON_LETTERS.finditer(text):
+                gaps.append((match.start() - removed, match.group()))
+                removed += match.end() - match.start()
+            lower = [match.span() for match in _LOWER_RUNS.finditer(letters)]
+            return cls(letters.translate(INDEX_TABLE), gaps, lower)
+        
+        indices = bytearray()
+        gaps = []
+        lower = []
+        pending = []
+        for char in text:
+            letter = _classify(char)
+            if letter is None:
+                pending.append(char)
+                continue
+            if pending:
+                gaps.append((len(indices), ''.join(pending)))
+                pending = []
+            if letter[1]:
+                if lower and lower[-1][1] == len(indices):
+                    lower[-1] = (lower[-1][0], len(indices) + 1)
+                else:
+                    lower.append((len(indices), len(indices) + 1))
+            indices.append(letter[0])
+        if pending:
+            gaps.append((len(indices), ''.join(pending)))
+        return cls(indices, gaps, lower)
+    
+    @classmethod
+    def from_letters(cls, letters):
+        """
+        Wrap a string of ASCII letters (a cipher result) without any layout
+        Args:
+            letters (str): Letters only
+        Returns:
+            LetterBuffer: Indices only, no gaps or case
+        """
+        return cls(letters.encode('ascii').translate(INDEX_TABLE))
+    
+    def with_indices(self, indices):
+        """New buffer with the same layout and different letters"""
+        result = object.__new__(LetterBuffer)
+        result.indices = bytes(indices)
+        result.gaps = self.gaps
+        result.lower = self.lower
+        return result
+    
+    def letters(self, lowercase=False):
+        """
+        Letters only, in one case
+        Args:
+            lowercase (bool): Return lowercase letters instead of uppercase
+        Returns:
+            str: The letters without layout
+        """
+        return self.indices.translate(LOWER_FROM_INDEX if lowercase else UPPER_FROM_INDEX).decode('ascii')
+    
+    def __len__(self):
+        return len(self.indices)
+    
+    def format(self, indices=None, case=None):
+        """
+        Letters laid out like this buffer's text, in one pass over the layout
+        Args:
+            indices (bytes-like): Letters to lay out (A=0 ... Z=25), usually a
+                cipher result; this buffer's own letters by default. Extra
+                letters (padding) go right after the last letter, before any
+                trailing non-letters; missing ones leave the rest of the
+                layout in place.
+            case (str): None to give each letter the case of the letter at
+                its position (extra letters: the case of the last letter, as
+                the in-place transforms pad), 'upper' or 'lower' for one case
+                throughout
+        Returns:
+            str: Text with the non-letters and case re-applied
+        """
+        if indices is None:
+            indices = self.indices
+        text = bytes(indices).translate(LOWER_FROM_INDEX if case == 'lower' else UPPER_FROM_INDEX).decode('ascii')
+        if case is None and self.lower:
+            pieces = []
+            end = 0
+            for start, stop in self.lower:
+                if stop == len(self.indices):
+                    stop = len(text)
+                pieces.append(text[end:start])
+                pieces.append(text[start:stop].lower())
+                end = stop
+            pieces.append(text[end:])
+            text = ''.join(pieces)
+        if self.gaps:
+            pieces = []
+            end = 0
+            for offset, gap in self.gaps:
+                if offset == len(self.indices):
+                    offset = len(text)
+                pieces.append(text[end:offset])
+                pieces.append(gap)
+                end = max(end, offset)
+            pieces.append(text[end:])
+            text = ''.join(pieces)
+        return text
+    
+    def __str__(self):
+        """Letters with the original non-letters and case re-applied"""
+        return self.format()
+    
+    def __eq__(self, other):
+        return (isinstance(other, LetterBuffer) and self.indices == other.indices
+                and self.gaps == other.gaps and self.lower == other.lower)
+    
+    def __hash__(self):
+        return hash((self.indices, self.gaps, self.lower))
+    
+    def __repr__(self):
+        return f"LetterBuffer({str(self)!r})"
+
+
+@lru_cache(maxsize=None)
+def _non_symbols(alphabet):
+    """(regex of runs of ASCII non-symbols, set of input symbols) of an alphabet"""
+    chars = alphabet.input_bytes.decode('ascii')
+    return re.compile(f'[^{re.escape(chars)}]+'), frozenset(chars)
+
+
+def _symbol_layout(text, alphabet):
+    """
+    Symbols of text in their input case, and the runs of everything else;
+    like LetterBuffer.from_text, a character is a symbol if it folds (and
+    uppercases, for a case-insensitive alphabet) to exactly one symbol
+    Returns:
+        tuple: (symbols as ASCII bytes, list of (symbol offset, text) gaps)
+    """
+    non_symbols, chars = _non_symbols(alphabet)
+    text = fold_text(text)
+    if text.isascii():
+        gaps = []
+        removed = 0
+        for match in non_symbols.finditer(text):
+            gaps.append((match.start() - removed, match.group()))
+            removed += match.end() - match.start()
+        return text.encode('ascii').translate(None, alphabet.delete_bytes), gaps
+    
+    symbols = []
+    gaps = []
+    pending = []
+    for char in text:
+        upper = char.upper() if alphabet.case_insensitive else char
+        if upper not in chars:
+            pending.append(char)
+            continue
+        if pending:
+            gaps.append((len(symbols), ''.join(pending)))
+            pending = []
+        symbols.append(upper.lower() if upper != char else char)
+    if pending:
+        gaps.append((len(symbols), ''.join(pending)))
+    return ''.join(symbols).encode('ascii'), gaps
+
+
+def layout_symbols(text, output, alphabet, case=None):
+    """
+    Lay a cipher's plain output out like text, for any alphabet: the
+    counterpart of LetterBuffer.format for ciphers that are not over A-Z
+    Args:
+        text (str): Input the output was computed from
+        output (str): Cipher output, symbols only. Extra symbols (padding)
+            go right after the last symbol; missing ones leave the rest of
+            the layout in place.
+        alphabet (Alphabet): Alphabet of the cipher
+        case (str): None to give each symbol of a case-insensitive alphabet
+            the case of the symbol at its position (extra symbols: of the
+            last one), 'upper' or 'lower' for one case throughout
+    Returns:
+        str: output with the non-symbols of text re-applied
+    """
+    original, gaps = _symbol_layout(text, alphabet)
+    symbols = output.encode('ascii')
+    if case is not None:
+        symbols = symbols.upper() if case == 'upper' else symbols.lower()
+    elif alphabet.case_insensitive and original:
+        reference = original[:len(symbols)] + original[-1:] * (len(symbols) - len(original))
+        symbols = restore_case(symbols.upper(), reference, alphabet)
+    result = symbols.decode('ascii')
+    pieces = []
+    end = 0
+    for offset, gap in gaps:
+        if offset == len(original):
+            offset = len(result)
+        pieces.append(result[end:offset])
+        pieces.append(gap)
+        end = max(end, offset)
+    pieces.append(result[end:])
+    return ''.join(pieces)
@@ -0,0 +1,174 @@
+"""
+Modular arithmetic shared by the ciphers and the Hill cracker.
+
+The unit group and the inverse of every residue are computed once per
+modulus, so key validation and inversion are plain table lookups.
+"""
+
+from functools import lru_cache
+
+MOD = 26
+
+
+@lru_cache(maxsize=None)
+def inverse_table(m=MOD):
+    """
+    Inverse of every residue modulo m
+    Args:
+        m (int): Modulus
+    Returns:
+        tuple: table[a] is the inverse of a mod m, or None if a is not a unit
+    """
+    table = [None] * m
+    for a in range(1, m):
+        if table[a] is None:
+            for b in range(a, m):
+                if (a * b) % m == 1:
+                    table[a], table[b] = b, a
+                    break
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def units(m=MOD):
+    """Residues coprime with m, in increasing order"""
+    return tuple(a for a, inv in enumerate(inverse_table(m)) if inv is not None)
+
+
+def mod_inverse(a, m=MOD):
+    """Find modular multiplicative inverse of a under modulo m (None if none exists)"""
+    return inverse_table(m)[a % m]
+
+
+def is_unit(a, m=MOD):
+    """Check whether a is coprime with m"""
+    return inverse_table(m)[a % m] is not None
+
+
+@lru_cache(maxsize=None)
+def prime_factors(m=MOD):
+    """
+    Prime-power factorization of m
+    Returns:
+        tuple: ((p, k), ...) such that m == prod(p ** k)
+    """
+    factors = []
+    p = 2
+    while p * p <= m:
+        if m % p == 0:
+            k = 0
+            while m % p == 0:
+                m //= p
+                k += 1
+            factors.append((p, k))
+        p += 1
+    if m > 1:
+        factors.append((m, 1))
+    return tuple(factors)
+
+
+def determinant(matrix):
+    """
+    Exact integer determinant of a square matrix (fraction-free Bareiss elimination)
+    Args:
+        matrix: n x n sequence of integers
+    Returns:
+        int: The determinant
+    """
+    a = [[int(x) for x in row] for row in matrix]
+    n = len(a)
+    sign, previous = 1, 1
+    for k in range(n - 1):
+        if a[k][k] == 0:
+            swap = next((r for r in range(k + 1, n) if a[r][k] != 0), None)
+            if swap is None:
+                return 0
+            a[k], a[swap] = a[swap], a[k]
+            sign = -sign
+        for i in range(k + 1, n):
+            for j in range(k + 1, n):
+                a[i][j] = (a[i][j] * a[k][k] - a[i][k] * a[k][j]) // previous
+        previous = a[k][k]
+    return sign * a[n - 1][n - 1] if n else 1
+
+
+def singular_primes(det, m=MOD):
+    """
+    CRT view of invertibility: det is a unit mod m exactly when it is
+    non-zero modulo every prime dividing m
+    Returns:
+        tuple: Primes of m that divide det (empty if the matrix is invertible)
+    """
+    return tuple(p for p, _ in prime_factors(m) if det % p == 0)
+
+
+def _gauss_jordan_inverse(matrix, q, p):
+    """
+    Invert matrix modulo the prime power q = p ** k with Gauss-Jordan elimination.
+    In Z/p^k an invertible matrix always has a pivot coprime with p in each column.
+    Returns None if the matrix is singular modulo p.
+    """
+    n = len(matrix)
+    inverses = inverse_table(q)
+    rows = [[x % q for x in row] + [int(i == j) for j in range(n)] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if rows[r][col] % p != 0), None)
+        if pivot is None:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        scale = inverses[rows[col][col]]
+        rows[col] = [(x * scale) % q for x in rows[col]]
+        for r in range(n):
+            factor = rows[r][col]
+            if r != col and factor:
+                rows[r] = [(x - factor * y) % q for x, y in zip(rows[r], rows[col])]
+    return [row[n:] for row in rows]
+
+
+@lru_cache(maxsize=256)
+def _matrix_inverse_cached(key, m):
+    """Per-key cache behind matrix_inverse (key is a tuple of row tuples reduced mod m)"""
+    partials = []
+    for p, k in prime_factors(m):
+        q = p ** k
+        inverse = _gauss_jordan_inverse(key, q, p)
+        if inverse is None:
+            return None
+        partials.append((q, inverse))
+    
+    # Chinese Remainder Theorem: glue the inverses mod each prime power together
+    n = len(key)
+    result = [[0] * n for _ in range(n)]
+    for q, inverse in partials:
+        rest = m // q
+        weight = rest * inverse_table(q)[rest % q] % m if q != m else 1
+        for i in range(n):
+            for j in range(n):
+                result[i][j] = (result[i][j] + inverse[i][j] * weight) % m
+    return tuple(tuple(row) for row in result)
+
+
+def matrix_inverse(matrix, m=MOD):
+    """
+    Modular inverse of a square matrix
+    Args:
+        matrix: n x n sequence of integers
+        m (int): Modulus
+    Returns:
+        tuple: Inverse as a tuple of row tuples, or None if it does not exist
+    """
+    key = tuple(tuple(int(x) % m for x in row) for row in matrix)
+    return _matrix_inverse_cached(key, m)
+
+
+def matrix_product(left, right, m=MOD):
+    """
+    Product of two square matrices modulo m
+    Args:
+        left, right: n x n sequences of integers
+        m (int): Modulus
+    Returns:
+        tuple: left @ right (mod m) as a tuple of row tuples
+    """
+    columns = tuple(zip(*right))
+    return tuple(tuple(sum(map(int.__mul__, row, column)) % m for column in columns) for row in left)
@@ -0,0 +1,104 @@
+"""
+Multi-key decryption by NumPy broadcasting.
+
+Brute-force and scoring workflows decrypt one ciphertext under many keys.
+Here the ciphertext is converted to symbol indices once, and every key is
+applied by broadcasting: substitution ciphers gather from a (keys x m)
+table of decryption maps, Hill multiplies the blocks by a stack of inverse
+matrices, a bounded number of keys at a time.
+
+The result is a ``KeyMatrix``: a (K, N) ``uint8`` array of symbol indices,
+one row per key, whose rows are decoded to strings only when asked for.
+
+This module imports NumPy; the ciphers import it only from their
+``decrypt_keys`` methods, so the rest of the package stays NumPy-free.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+# Upper bound on the int64 scratch space used per chunk of Hill keys
+HILL_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+class KeyMatrix(Sequence):
+    """
+    Decryptions of one text under K keys.
+    
+    Attributes:
+        keys (list): Compiled keys, one per row
+        matrix (numpy.ndarray): (K, N) uint8 symbol indices
+    
+    Indexing (``result[k]``) and iteration decode rows to str lazily.
+    """
+    
+    def __init__(self, keys, matrix, decode):
+        """
+        Args:
+            keys (list): Compiled keys, one per row
+            matrix (numpy.ndarray): (K, N) uint8 symbol indices
+            decode (callable): Index bytes of one row -> plaintext str
+        """
+        self.keys = keys
+        self.matrix = matrix
+        self._decode = decode
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        return self._decode(self.matrix[row].tobytes())
+    
+    def items(self):
+        """(key, plaintext) pairs, decoded one at a time"""
+        for row, key in enumerate(self.keys):
+            yield key, self[row]
+    
+    def __repr__(self):
+        return f"<KeyMatrix {self.matrix.shape[0]} keys x {self.matrix.shape[1]} symbols>"
+
+
+def as_index_array(indices):
+    """Read-only uint8 view of index bytes (no copy)"""
+    return np.frombuffer(indices, dtype=np.uint8)
+
+
+def substitution_matrix(indices, tables, m):
+    """
+    Apply K substitution maps at once
+    Args:
+        indices (bytes): Ciphertext symbol indices (N)
+        tables (list): K index maps, each m bytes (map[i] = plaintext index of i)
+        m (int): Modulus
+    Returns:
+        numpy.ndarray: (K, N) uint8 plaintext indices
+    """
+    maps = np.frombuffer(b''.join(table[:m] for table in tables), dtype=np.uint8).reshape(len(tables), m)
+    return maps[:, as_index_array(indices)]
+
+
+def hill_matrix(indices, inverses, m, chunk_bytes=HILL_CHUNK_BYTES):
+    """
+    Apply K Hill inverse matrices at once, in chunks of keys
+    Args:
+        indices (bytes): Ciphertext symbol indices, a whole number of blocks
+        inverses (list): K inverse matrices (n x n row tuples), all the same size
+        m (int): Modulus
+        chunk_bytes (int): Scratch-space budget per chunk
+    Returns:
+        numpy.ndarray: (K, N) uint8 plaintext indices
+    """
+    n = len(inverses[0])
+    blocks = as_index_array(indices).reshape(-1, n).astype(np.int64)
+    # Row vectors: plaintext block = block @ inverse.T
+    stack = np.array(inverses, dtype=np.int64).transpose(0, 2, 1)
+    result = np.empty((len(inverses), len(indices)), dtype=np.uint8)
+    per_key = max(1, blocks.size * 8)
+    step = max(1, chunk_bytes // per_key)
+    for start in range(0, len(inverses), step):
+        products = np.matmul(blocks, stack[start:start + step]) % m
+        result[start:start + step] = products.reshape(products.shape[0], -1)
+    return result
@@ -0,0 +1,251 @@
+"""
+Process-pool transforms of large texts over shared memory.
+
+The input is copied once into a ``multiprocessing.shared_memory`` block
+and cut into byte chunks. In a first pass every worker extracts the symbols
+of its chunk with one translate and writes them back into a second shared
+block at the chunk's own offset, returning only the count and a small
+summary. For the substitution ciphers that translate is the whole cipher,
+and the result is the concatenation of those runs.
+
+Other ciphers get a second pass. A prefix over the counts and summaries
+(cheap, done in the parent) gives every chunk the state it starts in: for
+Hill the ordinal of its first block (a block that straddles two chunks
+goes to the chunk where it starts), for Playfair the digraph parity
+carried over the boundary. Each worker then finishes its chunk
+independently and writes it straight into its final place in a shared
+output block. Nothing but offsets, counts and summaries is pickled.
+
+A "recipe" tells the workers what to do: which translate table extracts
+the symbols, what to summarize, how to plan the second pass and how to
+finish a chunk.
+
+``multiprocessing`` is imported on first use, so cipher modules can
+define their recipes here without slowing down start-up.
+"""
+
+import os
+from bisect import bisect_right
+from contextlib import ExitStack, contextmanager
+from itertools import accumulate
+
+from .folding import fold_text
+from .tables import BUFFER_WINDOW
+
+# Below this many bytes the serial path wins over starting a process pool
+PARALLEL_MIN_BYTES = 1 << 20
+
+# Chunks per worker process, to even out chunks with fewer letters
+CHUNKS_PER_WORKER = 4
+
+
+class TranslateRecipe:
+    """Monoalphabetic substitution: the extracting translate already produces the output"""
+    
+    direct = True
+    
+    def __init__(self, table):
+        """
+        Args:
+            table (TranslationTable): Encrypt or decrypt table of a compiled key
+        """
+        self.table = table.bytes_table
+        self.delete = table.delete_bytes
+    
+    def summarize(self, symbols):
+        return None
+
+
+class BlockRecipe:
+    """
+    Symbols taken in blocks of block_size, counted from the start of the text,
+    the last one padded. Subclasses set table and delete (the extracting
+    translate), block_size and padding, and implement finish; ciphers whose
+    chunks depend on more than their position also override summarize and plan.
+    """
+    
+    direct = False
+    padding = b''
+    
+    def summarize(self, symbols):
+        """
+        What plan needs to know about one chunk
+        Args:
+            symbols (memoryview): The chunk's symbols
+        """
+        return None
+    
+    @staticmethod
+    def pieces(starts, ordinals, begin, end):
+        """
+        Where the symbols of a task are, for plan
+        Args:
+            starts (sequence): Offset of each chunk's symbols in the symbol block
+            ordinals (list): Ordinal of each chunk's first symbol, then the total
+            begin, end (int): Ordinals of the task's first and past-the-last symbol
+        Returns:
+            list: (offset, length) runs of the symbol block, in order
+        """
+        pieces = []
+        chunk = bisect_right(ordinals, begin) - 1
+        while begin < end:
+            low = begin - ordinals[chunk]
+            high = min(end, ordinals[chunk + 1]) - ordinals[chunk]
+            if high > low:
+                pieces.append((starts[chunk] + low, high - low))
+            begin = ordinals[chunk + 1]
+            chunk += 1
+        return pieces
+    
+    def plan(self, starts, counts, summaries):
+        """
+        Second-pass tasks: chunk i finishes the blocks that start in its ordinal range
+        Args:
+            starts (sequence): Offset of each chunk's symbols in the symbol block
+            counts (list): Symbols of each chunk
+            summaries (list): summarize() of each chunk
+        Returns:
+            tuple: (list of (pieces, state, output offset) tasks, output size); a
+            task may write less than the room up to the next task's offset
+        """
+        ordinals = [0, *accumulate(counts)]
+        total = ordinals[-1]
+        n = self.block_size
+        size = total + -total % n
+        tasks = []
+        for i in range(len(counts)):
+            begin = min(size, -(-ordinals[i] // n) * n)
+            end = min(size, -(-ordinals[i + 1] // n) * n)
+            if begin < end:
+                pieces = self.pieces(starts, ordinals, begin, min(end, total))
+                tasks.append((pieces, max(0, end - total), begin))
+        return tasks, size
+    
+    def finish(self, symbols, pad):
+        """
+        Output of whole blocks
+        Args:
+            symbols (bytes): The blocks' symbols
+            pad (int): Padding symbols to append first (the last block of the text)
+        Returns:
+            bytes: Output symbols
+        """
+        raise NotImplementedError
+
+
+def ascii_payload(text):
+    """Bytes to put in shared memory (str is accent-folded first), or None if text is not ASCII"""
+    if not isinstance(text, str):
+        return text
+    text = fold_text(text)
+    return text.encode('ascii') if text.isascii() else None
+
+
+@contextmanager
+def _attached(name):
+    """A shared memory block created by the parent process"""
+    from multiprocessing import shared_memory
+    
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        yield shm
+    finally:
+        shm.close()
+
+
+def _extract_task(src_name, mid_name, start, stop, recipe):
+    """
+    Pass 1: translate the symbols of src[start:stop] into mid at offset start
+    Returns:
+        tuple: (number of symbols, the recipe's summary of them)
+    """
+    with _attached(src_name) as src, _attached(mid_name) as mid:
+        written = start
+        for i in range(start, stop, BUFFER_WINDOW):
+            symbols = src.buf[i:min(i + BUFFER_WINDOW, stop)].tobytes().translate(recipe.table, recipe.delete)
+            mid.buf[written:written + len(symbols)] = symbols
+            written += len(symbols)
+        with mid.buf[start:written] as symbols:
+            return written - start, recipe.summarize(symbols)
+
+
+def _finish_task(mid_name, dst_name, pieces, state, offset, recipe):
+    """
+    Pass 2: finish one chunk's share of the text and write it to dst
+    Args:
+        mid_name, dst_name (str): Shared symbol and output blocks
+        pieces (list): (offset, length) runs of mid holding the symbols
+        state: What the recipe's plan worked out for this chunk
+        offset (int): Output position
+        recipe: Cipher recipe
+    Returns:
+        int: Bytes written
+    """
+    with _attached(mid_name) as mid, _attached(dst_name) as dst:
+        symbols = b''.join([mid.buf[start:start + length].tobytes() for start, length in pieces])
+        result = recipe.finish(symbols, state)
+        dst.buf[offset:offset + len(result)] = result
+        return len(result)
+
+
+@contextmanager
+def _shared(size):
+    """A new shared memory block, unlinked on exit"""
+    from multiprocessing import shared_memory
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    try:
+        yield shm
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def parallel_transform(data, recipe, executor=None, workers=None):
+    """
+    Transform a large ASCII payload on a process pool
+    Args:
+        data (bytes-like): Input bytes
+        recipe: TranslateRecipe or a BlockRecipe subclass
+        executor: None (a ProcessPoolExecutor with one process per CPU), a
+            process count, or any concurrent.futures.Executor
+        workers (int): Processes of executor, to size the chunks; the
+            process count for an int executor, os.cpu_count() by default
+    Returns:
+        bytes: Output symbols of every block (padding kept)
+    """
+    from concurrent.futures import Executor, ProcessPoolExecutor
+    
+    if executor is None or isinstance(executor, int):
+        with ProcessPoolExecutor(max_workers=executor) as pool:
+            return parallel_transform(data, recipe, pool, executor)
+    if not isinstance(executor, Executor):
+        raise TypeError("executor must be None, a process count or a concurrent.futures.Executor")
+    
+    size = len(data)
+    if not size:
+        return b''
+    workers = workers or os.cpu_count() or 1
+    chunk = max(BUFFER_WINDOW, -(-size // (workers * CHUNKS_PER_WORKER)))
+    starts = range(0, size, chunk)
+    
+    with _shared(size) as src, _shared(size) as mid:
+        src.buf[:size] = data
+        futures = [executor.submit(_extract_task, src.name, mid.name, start, min(start + chunk, size), recipe)
+                   for start in starts]
+        counts, summaries = zip(*[future.result() for future in futures])
+        
+        if recipe.direct:
+            with ExitStack() as views:
+                runs = [views.enter_context(mid.buf[start:start + count]) for start, count in zip(starts, counts)]
+                return b''.join(runs)
+        
+        tasks, total = recipe.plan(starts, list(counts), list(summaries))
+        with _shared(total) as dst:
+            futures = [executor.submit(_finish_task, mid.name, dst.name, pieces, state, offset, recipe)
+                       for pieces, state, offset in tasks]
+            # A task may write less than it was given room for (dropped symbols)
+            with ExitStack() as views:
+                runs = [views.enter_context(dst.buf[offset:offset + future.result()])
+                        for (pieces, state, offset), future in zip(tasks, futures)]
+                return b''.join(runs)
@@ -0,0 +1,223 @@
+"""
+Fused cipher pipelines.
+
+A ``Pipeline`` chains encrypt/decrypt stages and composes them before
+running. Runs of Caesar and Affine stages collapse into one affine map
+x -> a*x + b (mod m), applied with a single translate table. Runs of Hill
+stages of one block size collapse into a single product matrix. Every
+other stage (Playfair, plugin ciphers) runs on the same buffer of symbol
+indices, so text is parsed once and formatted once, however long the chain.
+A three-stage chain costs about one pass.
+
+Running a pipeline gives the same result as feeding each stage's output
+into the next stage by hand.
+"""
+
+from .affine_cipher import AffineKey
+from .alphabets import LETTERS
+from .caesar_cipher import CaesarKey
+from .hill_cipher import HillCipher, HillKey, _ENGINES as _HILL_ENGINES, _hill_key
+from .letters import LetterBuffer
+from .modular import matrix_product
+
+ENCRYPT = 'encrypt'
+DECRYPT = 'decrypt'
+
+
+def _affine_map(key, decrypt):
+    """(a, b) with the stage acting as x -> a*x + b (mod m)"""
+    m = key.charset.modulus
+    if isinstance(key, CaesarKey):
+        a, b = 1, key.shift
+    else:
+        a, b = key.a, key.b
+    if decrypt:
+        # x = a^-1 * (y - b)
+        a_inv = key.charset.inverses[a]
+        return a_inv, (-a_inv * b) % m
+    return a, b
+
+
+class _AffineGroup:
+    """Consecutive Caesar/Affine stages as one index translate table"""
+    
+    def __init__(self, m):
+        self.m = m
+        self.a, self.b = 1, 0
+        self.count = 0
+    
+    def add(self, key, decrypt):
+        a, b = _affine_map(key, decrypt)
+        # (a, b) after (self.a, self.b): x -> a*(self.a*x + self.b) + b
+        self.a, self.b = (a * self.a) % self.m, (a * self.b + b) % self.m
+        self.count += 1
+    
+    def compile(self):
+        self.table = bytes((self.a * x + self.b) % self.m for x in range(self.m)) + bytes(range(self.m, 256))
+    
+    def run(self, indices):
+        return indices.translate(self.table)
+    
+    def __repr__(self):
+        return f"affine(a={self.a}, b={self.b}; {self.count} stages)"
+
+
+class _HillGroup:
+    """
+    Consecutive Hill stages of one block size as one product matrix.
+    
+    A decrypt stage strips its trailing padding, but the next Hill stage pads
+    the same number of X's straight back (its input was whole blocks), so
+    only a decrypt at the end of the run has to strip anything.
+    """
+    
+    def __init__(self, cipher, size):
+        self.cipher = cipher
+        self.size = size
+        self.m = cipher.m
+        self.matrix = tuple(tuple(int(i == j) for j in range(size)) for i in range(size))
+        self.inverse = self.matrix
+        self.strip = False
+        self.count = 0
+    
+    def add(self, key, decrypt):
+        forward, backward = (key.inverse, key.matrix) if decrypt else (key.matrix, key.inverse)
+        self.matrix = matrix_product(forward, self.matrix, self.m)
+        self.inverse = matrix_product(self.inverse, backward, self.m)
+        self.strip = decrypt
+        self.count += 1
+    
+    def compile(self):
+        self.key = _hill_key(self.matrix, self.inverse, self.cipher.charset)
+    
+    def run(self, indices):
+        indices += self.cipher._pad_index * (-len(indices) % self.size)
+        result = _HILL_ENGINES.run(indices, self.key)
+        if self.strip:
+            result = self.cipher._strip_padding(result, self.size, self.cipher._pad_index)
+        return result
+    
+    def __repr__(self):
+        return f"hill({self.size}x{self.size}; {self.count} stages)"
+
+
+class _Stage:
+    """Any other cipher, run on the shared indices (through its LetterBuffer API when it has one)"""
+    
+    def __init__(self, cipher, key, decrypt):
+        self.cipher = cipher
+        self.key = key
+        self.decrypt = decrypt
+        self.charset = getattr(cipher, 'charset', LETTERS)
+        self.buffered = self.charset == LETTERS and cipher._buffer_method(decrypt) is not None
+        self.count = 1
+    
+    def compile(self):
+        pass
+    
+    def run(self, indices):
+        if self.buffered:
+            method = self.cipher.decrypt_buffer if self.decrypt else self.cipher.encrypt_buffer
+            return method(LetterBuffer(indices), self.key).indices
+        method = self.cipher.decrypt if self.decrypt else self.cipher.encrypt
+        return self.charset.indices(method(self.charset.text(indices), self.key))
+    
+    def __repr__(self):
+        mode = DECRYPT if self.decrypt else ENCRYPT
+        return f"{type(self.cipher).__name__}.{mode}"
+
+
+class Pipeline:
+    """
+    A chain of cipher stages, fused where the algebra allows.
+    
+    Example:
+        pipeline = Pipeline([(CaesarCipher(), 3), (AffineCipher(), '5,8'), (HillCipher(), '3,3,2,5')])
+        pipeline.encrypt_then('caesar', 7)          # a new, longer pipeline
+        ciphertext = pipeline.run("attack at dawn")
+    """
+    
+    def __init__(self, stages=()):
+        """
+        Args:
+            stages (iterable): (cipher, key) or (cipher, key, 'encrypt'/'decrypt')
+                tuples, applied in order. cipher may be an instance or a
+                registry name ('caesar', 'hill', ...); keys may be raw or compiled.
+        """
+        resolved = []
+        for stage in stages:
+            cipher, key, mode = (*stage, ENCRYPT) if len(stage) == 2 else stage
+            if mode not in (ENCRYPT, DECRYPT):
+                raise ValueError(f"Stage mode must be 'encrypt' or 'decrypt', not {mode!r}")
+            if isinstance(cipher, str):
+                from .registry import registry
+                cipher = registry.create(cipher)
+            resolved.append((cipher, cipher._key(key), mode))
+        if not resolved:
+            raise ValueError("A pipeline needs at least one stage")
+        
+        charsets = {getattr(cipher, 'charset', LETTERS) for cipher, _, _ in resolved}
+        if len(charsets) > 1:
+            raise ValueError("All pipeline stages must use the same alphabet")
+        self.charset = charsets.pop()
+        self.stages = tuple(resolved)
+        self.groups = self._fuse()
+    
+    def _fuse(self):
+        """Group consecutive stages that compose into one transform"""
+        groups = []
+        for cipher, key, mode in self.stages:
+            decrypt = mode == DECRYPT
+            last = groups[-1] if groups else None
+            if isinstance(key, (CaesarKey, AffineKey)):
+                if not isinstance(last, _AffineGroup):
+                    last = _AffineGroup(self.charset.modulus)
+                    groups.append(last)
+                last.add(key, decrypt)
+            elif isinstance(key, HillKey):
+                if not (isinstance(last, _HillGroup) and last.size == key.size):
+                    last = _HillGroup(cipher if isinstance(cipher, HillCipher) else HillCipher(self.charset),
+                                      key.size)
+                    groups.append(last)
+                last.add(key, decrypt)
+            else:
+                groups.append(_Stage(cipher, key, decrypt))
+        for group in groups:
+            group.compile()
+        return tuple(groups)
+    
+    def _then(self, cipher, key, mode):
+        return Pipeline(self.stages + ((cipher, key, mode),))
+    
+    def encrypt_then(self, cipher, key):
+        """New pipeline with an encrypt stage appended"""
+        return self._then(cipher, key, ENCRYPT)
+    
+    def decrypt_then(self, cipher, key):
+        """New pipeline with a decrypt stage appended"""
+        return self._then(cipher, key, DECRYPT)
+    
+    def run(self, text):
+        """
+        Run every stage on text
+        Args:
+            text (str or LetterBuffer): Input of the first stage
+        Returns:
+            str: Output of the last stage (uppercase after encrypt, lowercase
+                after decrypt, symbols outside the alphabet omitted)
+        """
+        if isinstance(text, LetterBuffer):
+            if self.charset != LETTERS:
+                raise ValueError(f"LetterBuffer input requires the A-Z alphabet, not {self.charset.name}")
+            indices = text.indices
+        else:
+            indices = self.charset.indices(text)
+        for group in self.groups:
+            indices = group.run(indices)
+        return self.charset.text(indices, lowercase=self.stages[-1][2] == DECRYPT)
+    
+    def __len__(self):
+        return len(self.stages)
+    
+    def __repr__(self):
+        return f"<Pipeline {len(self.stages)} stages as {' -> '.join(map(repr, self.groups))}>"
@@ -1,175 +1,482 @@
-class PlayfairCipher:
+import re
+from functools import lru_cache
+from itertools import accumulate
+
+from .base import Cipher, CompiledKey, key_fingerprint
+from .dispatch import dispatcher
+from .folding import fold_text
+from .letters import LetterBuffer
+from .parallel import BlockRecipe
+from .tables import ALPHABET, ASCII_LETTERS, DELETE_BYTES
+
+PLAYFAIR_ALPHABET = 'ABCDEFGHIKLMNOPQRSTUVWXYZ'  # J is omitted, I/J treated as same
+
+# Uppercases ASCII letters and folds J into I (use together with DELETE_BYTES)
+_CLEAN_TABLE = bytes.maketrans(ASCII_LETTERS, (ALPHABET.replace('J', 'I') * 2).encode('ascii'))
+
+# A letter immediately followed by the same letter
+_DOUBLED = re.compile(r'(.)(?=\1)', re.S)
+
+# An x between two identical non-x letters, i.e. one inserted to split a double
+_INSERTED_X = re.compile(r'(?<=([^x]))x(?=\1)')
+
+
+def _pack(digraph):
+    """Two ASCII letters as the single code point their UTF-16-LE bytes decode to"""
+    return ord(digraph[0]) | ord(digraph[1]) << 8
+
+
+class PlayfairKey(CompiledKey):
+    """
+    Compiled Playfair key square.
+    
+    Holds the 5x5 matrix, a 25-entry letter -> (row, col) index and the
+    625-entry encrypt/decrypt digraph tables, so the per-digraph work is a
+    single dictionary lookup. The packed tables map a digraph stored as one
+    code point (first letter | second letter << 8) to its result, for use
+    with str.translate.
+    """
+    
+    __slots__ = ('square', 'matrix', 'position', 'encrypt_table', 'decrypt_table',
+                 'encrypt_packed', 'decrypt_packed')
+    
+    def __init__(self, square):
+        """
+        Args:
+            square (str): The 25 letters of the key square, row by row
+        """
+        matrix = tuple(tuple(square[i*5:(i+1)*5]) for i in range(5))
+        position = {char: divmod(i, 5) for i, char in enumerate(square)}
+        encrypt_table = {}
+        decrypt_table = {}
+        encrypt_packed = {}
+        decrypt_packed = {}
+        
+        for char1, (row1, col1) in position.items():
+            for char2, (row2, col2) in position.items():
+                if row1 == row2:  # Same row
+                    enc = matrix[row1][(col1 + 1) % 5] + matrix[row2][(col2 + 1) % 5]
+                    dec = matrix[row1][(col1 - 1) % 5] + matrix[row2][(col2 - 1) % 5]
+                elif col1 == col2:  # Same column
+                    enc = matrix[(row1 + 1) % 5][col1] + matrix[(row2 + 1) % 5][col2]
+                    dec = matrix[(row1 - 1) % 5][col1] + matrix[(row2 - 1) % 5][col2]
+                else:  # Rectangle
+                    enc = dec = matrix[row1][col2] + matrix[row2][col1]
+                encrypt_table[char1 + char2] = enc
+                decrypt_table[char1 + char2] = dec
+                encrypt_packed[_pack(char1 + char2)] = _pack(enc)
+                decrypt_packed[_pack(char1 + char2)] = _pack(dec.lower())
+        
+        self._set(square=square, matrix=matrix, position=position,
+                  encrypt_table=encrypt_table, decrypt_table=decrypt_table,
+                  encrypt_packed=encrypt_packed, decrypt_packed=decrypt_packed,
+                  fingerprint=key_fingerprint('playfair', square))
+
+
+def normalize_key(key):
+    """
+    Reduce a keyword to the 25-letter square it generates
+    Args:
+        key (str): Keyword or phrase
+    Returns:
+        str: Key letters (deduplicated, J -> I) followed by the remaining letters
+    """
+    key_letters = dict.fromkeys(c for c in key.upper().replace('J', 'I') if c in PLAYFAIR_ALPHABET)
+    return ''.join(key_letters) + ''.join(c for c in PLAYFAIR_ALPHABET if c not in key_letters)
+
+
+@lru_cache(maxsize=128)
+def compile_square(square):
+    """Compile (or fetch the cached) PlayfairKey for a normalized square"""
+    return PlayfairKey(square)
+
+
+def _playfair_python(text, key, decrypt=False):
+    """
+    Playfair engine: one dictionary lookup per digraph
+    Args:
+        text (str): Prepared plaintext, or cleaned ciphertext when decrypting
+        key (PlayfairKey): Compiled key
+        decrypt (bool): Decrypt instead of encrypt
+    Returns:
+        str: Uppercase ciphertext, or lowercase plaintext with padding still in place
+    """
+    if decrypt:
+        # Digraphs containing a letter outside the square are skipped
+        table = key.decrypt_table
+        return ''.join([table.get(text[i:i + 2], '') for i in range(0, len(text) - 1, 2)]).lower()
+    
+    table = key.encrypt_table
+    try:
+        return ''.join([table[text[i:i + 2]] for i in range(0, len(text), 2)])
+    except KeyError as e:
+        raise ValueError(f"Unsupported character for Playfair cipher in digraph {e.args[0]!r}") from None
+
+
+def _playfair_translate(text, key, decrypt=False):
+    """
+    Playfair engine: reinterpret the ASCII text as UTF-16 so every digraph is
+    one code point, then substitute all of them with a single str.translate
+    """
+    if not text.isascii():
+        return _playfair_python(text, key, decrypt)
+    if decrypt:
+        text = text[:len(text) - len(text) % 2]
+    packed = text.encode('ascii').decode('utf-16-le')
+    result = packed.translate(key.decrypt_packed if decrypt else key.encrypt_packed)
+    return result.encode('utf-16-le').decode('ascii')
+
+
+_ENGINES = dispatcher.register('playfair', {'python': _playfair_python, 'translate': _playfair_translate},
+                               lambda: compile_square(normalize_key('KEYWORD')))
+
+
+def _pair_letters(clean_text):
+    """
+    Split cleaned letters into digraphs, inserting X inside doubled ones
+    Args:
+        clean_text (str): Uppercase letters, J folded into I
+    Returns:
+        tuple: (prepared text of whole digraphs, unpaired last letter or '')
+    """
+    # Digraphs start at `start`, `start + 2`, ... until a letter is doubled
+    # inside a digraph; that digraph becomes (letter, X) and the pairing
+    # restarts at the second copy. Only the doubles need visiting, and the
+    # untouched runs between them are copied as whole slices.
+    pieces = []
+    start = 0
+    for match in _DOUBLED.finditer(clean_text):
+        i = match.start()
+        if (i - start) % 2 == 0:
+            pieces.append(clean_text[start:i + 1])
+            pieces.append('X')
+            start = i + 1
+    
+    # Odd length: the last letter has no partner yet
+    end = len(clean_text) - (len(clean_text) - start) % 2
+    pieces.append(clean_text[start:end])
+    return ''.join(pieces), clean_text[end:]
+
+
+def _double_parities(symbols):
+    """
+    Summary of the doubled letters of a chunk for _pair_letters: the parity
+    of the first double's position and how often the parity changes from
+    one double to the next. Pairing from an even or odd start, a double
+    splits a digraph exactly when its parity matches the start's, and every
+    split flips that parity, so the splits are the first double of the
+    start's parity and then every change of parity after it.
+    Args:
+        symbols (bytes-like): Cleaned letters
+    Returns:
+        tuple: (parity of the first double or None, number of parity changes)
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        parities = bytes([match.start() & 1 for match in _DOUBLED.finditer(bytes(symbols).decode('ascii'))])
+        changes = parities.count(b'\0\1') + parities.count(b'\1\0')
+        return (parities[0] if parities else None), changes
+    letters = np.frombuffer(symbols, dtype=np.uint8)
+    parities = np.flatnonzero(letters[:-1] == letters[1:]) & 1
+    if not len(parities):
+        return None, 0
+    return int(parities[0]), int(np.count_nonzero(parities[:-1] != parities[1:]))
+
+
+def _pairing(count, first_parity, changes, start):
+    """
+    X's inserted and whether a letter is left over when a chunk of count
+    letters is paired from index start (0 or 1), from _double_parities
+    """
+    if first_parity is None:
+        inserted = 0
+    else:
+        inserted = changes + (first_parity == start)
+    return inserted, (count - (start ^ (inserted & 1))) % 2 == 1
+
+
+class _PlayfairEncryptRecipe(BlockRecipe):
+    """
+    Playfair encryption on a process pool (see ciphers.parallel). Pass 1
+    summarizes each chunk by its first and last letter and its doubles; a
+    prefix over the summaries gives every chunk the letter left open before
+    it, and so its output length and offset.
+    """
+    
+    table, delete = _CLEAN_TABLE, DELETE_BYTES
+    
+    def __init__(self, square):
+        self.square = square
+    
+    def summarize(self, symbols):
+        if not symbols:
+            return None
+        return (chr(symbols[0]), chr(symbols[-1]), *_double_parities(symbols))
+    
+    def plan(self, starts, counts, summaries):
+        last_chunk = max((i for i, count in enumerate(counts) if count), default=-1)
+        tasks = []
+        offset = 0
+        pending = ''    # Unpaired letter at the end of the chunks so far
+        for i, (count, summary) in enumerate(zip(counts, summaries)):
+            if not count:
+                continue
+            first, last, first_parity, changes = summary
+            # The open letter pairs with the first one unless the two are a double
+            skip = 1 if pending and first != pending else 0
+            inserted, odd = _pairing(count, first_parity, changes, skip)
+            final = i == last_chunk
+            length = (2 if pending else 0) + count - skip + inserted
+            if odd:
+                length += 1 if final else -1
+            tasks.append(([(starts[i], count)], (pending, skip, final), offset))
+            offset += length
+            pending = last if odd else ''
+        return tasks, offset
+    
+    def finish(self, symbols, state):
+        pending, skip, final = state
+        letters = symbols.decode('ascii')
+        prepared, last = _pair_letters(letters[skip:])
+        if pending:
+            prepared = pending + (letters[0] if skip else 'X') + prepared
+        if final and last:
+            prepared += last + 'X'
+        return _ENGINES.run(prepared, compile_square(self.square)).encode('ascii')
+
+
+class _PlayfairDecryptRecipe(BlockRecipe):
+    """
+    Playfair decryption on a process pool: whole digraphs from the start of
+    the text, each task given one digraph either side so it can tell the
+    inserted X's at its edges
+    """
+    
+    table, delete = _CLEAN_TABLE, DELETE_BYTES
+    
+    def __init__(self, square):
+        self.square = square
+    
+    def plan(self, starts, counts, summaries):
+        ordinals = [0, *accumulate(counts)]
+        size = ordinals[-1] - ordinals[-1] % 2
+        tasks = []
+        for i in range(len(counts)):
+            begin = min(size, ordinals[i] + ordinals[i] % 2)
+            end = min(size, ordinals[i + 1] + ordinals[i + 1] % 2)
+            if begin < end:
+                low, high = max(0, begin - 2), min(size, end + 2)
+                tasks.append((self.pieces(starts, ordinals, low, high), (begin - low, high - end, end == size), begin))
+        return tasks, size
+    
+    def finish(self, symbols, state):
+        before, after, final = state
+        plaintext = _ENGINES.run(symbols.decode('ascii'), compile_square(self.square), decrypt=True)
+        # One letter of context each side: the first and last letters of the
+        # window are never removed, they only decide about their neighbours
+        lead, trail = min(before, 1), min(after, 1)
+        window = plaintext[before - lead:len(plaintext) - after + trail]
+        cleaned = _INSERTED_X.sub('', window)
+        cleaned = cleaned[lead:len(cleaned) - trail]
+        # A trailing x is padding
+        if final and cleaned.endswith('x'):
+            cleaned = cleaned[:-1]
+        return cleaned.encode('ascii')
+
+
+class PlayfairCipher(Cipher):
     """Playfair Cipher implementation using 5x5 key matrix"""
     
+    key_type = PlayfairKey
+    
     def __init__(self):
-        self.alphabet = 'ABCDEFGHIKLMNOPQRSTUVWXYZ'  # J is omitted, I/J treated as same
+        self.alphabet = PLAYFAIR_ALPHABET
+    
+    def compile_key(self, key):
+        """
+        Compile a Playfair key
+        Args:
+            key (str): Keyword for matrix generation
+        Returns:
+            PlayfairKey: Immutable compiled key square (shared via an LRU cache)
+        """
+        return compile_square(normalize_key(key))
     
     def _create_matrix(self, key):
         """Create 5x5 Playfair matrix from key"""
-        key = key.upper().replace('J', 'I')
-        key_string = ''
-        
-        # Remove duplicates from key
-        for char in key:
-            if char in self.alphabet and char not in key_string:
-                key_string += char
-        
-        # Add remaining letters
-        for char in self.alphabet:
-            if char not in key_string:
-                key_string += char
-        
-        # Create 5x5 matrix
-        matrix = []
-        for i in range(5):
-            matrix.append(list(key_string[i*5:(i+1)*5]))
-        
-        return matrix
+        return [list(row) for row in self._key(key).matrix]
     
-    def _find_position(self, matrix, char):
-        """Find position of character in matrix"""
-        for i in range(5):
-            for j in range(5):
-                if matrix[i][j] == char:
-                    return i, j
-        return None, None
+    def _clean_text(self, text):
+        """Keep only letters, uppercased with J replaced by I (accented letters folded)"""
+        text = fold_text(text)
+        if text.isascii():
+            return text.encode('ascii').translate(_CLEAN_TABLE, DELETE_BYTES).decode('ascii')
+        return ''.join(c.upper() for c in text if c.isalpha()).replace('J', 'I')
     
     def _prepare_text(self, text):
         """Prepare text for Playfair cipher (create digraphs), skipping spaces and digits"""
         # Remove spaces and digits, convert to uppercase, replace J with I
-        clean_text = ''
-        for c in text:
-            if c == ' ' or c.isdigit():
-                continue  # Skip spaces and digits
-            elif c.isalpha():
-                clean_text += c.upper().replace('J', 'I')
-        
-        prepared = ''
-        i = 0
+        prepared, last = _pair_letters(self._clean_text(text))
         
-        while i < len(clean_text):
-            prepared += clean_text[i]
-            
-            if i + 1 < len(clean_text):
-                if clean_text[i] == clean_text[i + 1]:
-                    # Same letter repeated, insert X
-                    prepared += 'X'
-                else:
-                    prepared += clean_text[i + 1]
-                    i += 1
-            else:
-                # Odd length, add X at the end
-                prepared += 'X'
-            
-            i += 1
-        
-        if len(prepared) % 2 != 0:
-            prepared += 'X'
-        
-        return prepared
+        # Odd length, add X at the end
+        return prepared + last + 'X' if last else prepared
     
     def encrypt(self, plaintext, key):
         """
         Encrypt plaintext using Playfair cipher
         Args:
-            plaintext (str): Text to encrypt
-            key (str): Keyword for matrix generation
+            plaintext (str or LetterBuffer): Text to encrypt
+            key (str or PlayfairKey): Keyword for matrix generation
         Returns:
-            str: Encrypted ciphertext (uppercase, spaces/digits omitted)
+            str: Encrypted ciphertext (uppercase, spaces/digits omitted); a LetterBuffer for LetterBuffer input
         """
-        matrix = self._create_matrix(key)
-        prepared_text = self._prepare_text(plaintext)
-        ciphertext = ''
-        
-        # Encrypt the alphabetic digraphs
-        for i in range(0, len(prepared_text), 2):
-            char1, char2 = prepared_text[i], prepared_text[i + 1]
-            row1, col1 = self._find_position(matrix, char1)
-            row2, col2 = self._find_position(matrix, char2)
-            
-            if row1 == row2:  # Same row
-                enc1 = matrix[row1][(col1 + 1) % 5]
-                enc2 = matrix[row2][(col2 + 1) % 5]
-            elif col1 == col2:  # Same column
-                enc1 = matrix[(row1 + 1) % 5][col1]
-                enc2 = matrix[(row2 + 1) % 5][col2]
-            else:  # Rectangle
-                enc1 = matrix[row1][col2]
-                enc2 = matrix[row2][col1]
-            
-            # Always return uppercase for encryption
-            ciphertext += enc1 + enc2
+        if isinstance(plaintext, LetterBuffer):
+            return self.encrypt_buffer(plaintext, key)
+        key = self._key(key)
         
-        return ciphertext
+        # Encrypt the alphabetic digraphs, always uppercase
+        return _ENGINES.run(self._prepare_text(plaintext), key)
     
     def decrypt(self, ciphertext, key):
         """
         Decrypt ciphertext using Playfair cipher
         Args:
-            ciphertext (str): Text to decrypt (uppercase)
-            key (str): Keyword for matrix generation
+            ciphertext (str or LetterBuffer): Text to decrypt (uppercase)
+            key (str or PlayfairKey): Keyword for matrix generation
         Returns:
-            str: Decrypted plaintext (lowercase, spaces/digits omitted)
+            str: Decrypted plaintext (lowercase, spaces/digits omitted); a LetterBuffer for LetterBuffer input
         """
-        matrix = self._create_matrix(key)
+        if isinstance(ciphertext, LetterBuffer):
+            return self.decrypt_buffer(ciphertext, key)
+        key = self._key(key)
         
         # Get only alphabetic characters for decryption (skip spaces and digits)
-        cipher_clean = ''.join(c.upper().replace('J', 'I') for c in ciphertext if c.isalpha())
-        
-        plaintext = ''
+        cipher_clean = self._clean_text(ciphertext)
+        plaintext = _ENGINES.run(cipher_clean, key, decrypt=True)
         
-        for i in range(0, len(cipher_clean) - 1, 2):
-            char1, char2 = cipher_clean[i], cipher_clean[i + 1]
-            row1, col1 = self._find_position(matrix, char1)
-            row2, col2 = self._find_position(matrix, char2)
-            
-            if row1 is None or row2 is None:
+        return self._remove_padding(plaintext)
+    
+    def encrypt_stream(self, chunks, key):
+        """
+        Encrypt a text that arrives in pieces, in constant memory. An unpaired
+        last letter is carried into the next chunk, so doubled-letter X's and
+        digraph parity come out as for the whole text.
+        Args:
+            chunks (iterable): Plaintext pieces (str), split anywhere
+            key (str or PlayfairKey): Keyword for matrix generation
+        Yields:
+            str: Ciphertext pieces whose concatenation equals encrypt(''.join(chunks), key)
+        """
+        key = self._key(key)
+        return self._encrypt_stream(chunks, key)
+    
+    def _encrypt_stream(self, chunks, key):
+        """Generator behind encrypt_stream (the key is compiled before the first chunk)"""
+        last = ''
+        for chunk in chunks:
+            prepared, last = _pair_letters(last + self._clean_text(chunk))
+            if prepared:
+                yield _ENGINES.run(prepared, key)
+        if last:
+            yield _ENGINES.run(last + 'X', key)
+    
+    def decrypt_stream(self, chunks, key):
+        """
+        Decrypt a text that arrives in pieces, in constant memory. Whether an
+        x is an inserted one depends on the letters either side of it, and a
+        final x is padding, so the last plaintext letter is always held back
+        until the next chunk (or the end) shows what follows it.
+        Args:
+            chunks (iterable): Ciphertext pieces (str), split anywhere
+            key (str or PlayfairKey): Keyword for matrix generation
+        Yields:
+            str: Plaintext pieces whose concatenation equals decrypt(''.join(chunks), key)
+        """
+        key = self._key(key)
+        return self._decrypt_stream(chunks, key)
+    
+    def _decrypt_stream(self, chunks, key):
+        """Generator behind decrypt_stream"""
+        odd = ''        # Ciphertext letter waiting for its partner
+        before = ''     # Plaintext letter preceding `held` (already yielded)
+        held = ''       # Last plaintext letter, not yet yielded
+        for chunk in chunks:
+            letters = odd + self._clean_text(chunk)
+            cut = len(letters) - len(letters) % 2
+            odd = letters[cut:]
+            plaintext = held + _ENGINES.run(letters[:cut], key, decrypt=True)
+            if not plaintext:
                 continue
-            
-            if row1 == row2:  # Same row
-                dec1 = matrix[row1][(col1 - 1) % 5]
-                dec2 = matrix[row2][(col2 - 1) % 5]
-            elif col1 == col2:  # Same column
-                dec1 = matrix[(row1 - 1) % 5][col1]
-                dec2 = matrix[(row2 - 1) % 5][col2]
-            else:  # Rectangle
-                dec1 = matrix[row1][col2]
-                dec2 = matrix[row2][col1]
-            
-            # Always return lowercase for decryption
-            plaintext += dec1.lower() + dec2.lower()
+            # The first and last letters of `window` are never removed: they
+            # only give the letters in between both neighbours
+            window = before + plaintext
+            cleaned = _INSERTED_X.sub('', window)[len(before):-1]
+            if cleaned:
+                yield cleaned
+            before, held = window[-2:-1] or before, window[-1]
+        # A trailing x is padding
+        if held and held != 'x':
+            yield held
+    
+    def _parallel(self, text, key, decrypt, executor):
+        """Run Playfair on a large text on a process pool; small or non-ASCII text takes the serial path"""
+        from .parallel import PARALLEL_MIN_BYTES, ascii_payload, parallel_transform
+        
+        key = self._key(key)
+        data = ascii_payload(text)
+        if data is None or len(data) < PARALLEL_MIN_BYTES:
+            if isinstance(text, str):
+                return self.decrypt(text, key) if decrypt else self.encrypt(text, key)
+            # Bytes outside ASCII are not letters, as in the parallel path
+            text = bytes(text).decode('ascii', 'ignore')
+            return (self.decrypt(text, key) if decrypt else self.encrypt(text, key)).encode('ascii')
+        recipe = (_PlayfairDecryptRecipe if decrypt else _PlayfairEncryptRecipe)(key.square)
+        result = parallel_transform(data, recipe, executor)
+        return result.decode('ascii') if isinstance(text, str) else result
+    
+    def encrypt_parallel(self, text, key, executor=None):
+        """
+        Encrypt a large text on a process pool. A first pass summarizes each
+        chunk, a prefix over the summaries carries the digraph parity across
+        chunk boundaries, and a second pass encrypts every chunk at once; the
+        result equals encrypt(text, key).
+        """
+        return self._parallel(text, key, False, executor)
+    
+    def decrypt_parallel(self, text, key, executor=None):
+        """Decrypt a large text on a process pool, in chunks of whole digraphs; the result equals decrypt(text, key)"""
+        return self._parallel(text, key, True, executor)
+    
+    def encrypt_buffer(self, buffer, key):
+        """
+        Encrypt a LetterBuffer. Inserted X's move the letters around, so the
+        result carries no layout.
+        """
+        return LetterBuffer.from_letters(self.encrypt(buffer.letters(), key))
+    
+    def decrypt_buffer(self, buffer, key):
+        """
+        Decrypt a LetterBuffer. The result carries no layout (see encrypt_buffer).
+        """
+        return LetterBuffer.from_letters(self.decrypt(buffer.letters(), key))
+    
+    def _remove_padding(self, plaintext):
+        """
+        Remove X's that were clearly inserted during encryption
         
-        # Remove X's that were clearly inserted during encryption
-        # The Playfair cipher inserts X in two cases:
-        # 1. Between consecutive identical letters (e.g., "hello" has "ll" so becomes "helxlo")
-        # 2. As padding at the end if text length is odd
-        #
-        # Note: This is a heuristic and cannot perfectly handle text that naturally contains X.
-        # This is a known limitation of the Playfair cipher.
+        The Playfair cipher inserts X in two cases:
+        1. Between consecutive identical letters (e.g., "hello" has "ll" so becomes "helxlo")
+        2. As padding at the end if text length is odd
+        
+        Note: This is a heuristic and cannot perfectly handle text that naturally contains X.
+        This is a known limitation of the Playfair cipher.
+        """
+        # Case 1: X between identical non-X letters (e.g., "lxl" from original "ll")
+        cleaned = _INSERTED_X.sub('', plaintext)
         
-        cleaned = ''
-        i = 0
-        while i < len(plaintext):
-            char = plaintext[i]
-            
-            if char == 'x':
-                # Case 1: X between identical non-X letters (e.g., "lxl" from original "ll")
-                # Check if previous and next chars exist and are the same (but not 'x')
-                if (i > 0 and i < len(plaintext) - 1 and 
-                    plaintext[i-1] == plaintext[i+1] and 
-                    plaintext[i-1] != 'x'):
-                    # This X was inserted between doubles, remove it
-                    i += 1
-                    continue
-                
-                # Case 2: Trailing X at the end (padding for odd length)
-                # Only remove if it's the last character
-                elif i == len(plaintext) - 1:
-                    # Remove trailing X (it was padding)
-                    i += 1
-                    continue
-            
-            cleaned += char
-            i += 1
+        # Case 2: Trailing X at the end (padding for odd length)
+        if plaintext.endswith('x'):
+            cleaned = cleaned[:-1]
         
         return cleaned
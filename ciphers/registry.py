@@ -0,0 +1,327 @@
+"""
+Lazy cipher registry.
+
+Every front end (GUI, CLI, batch tools) lists ciphers from here instead of
+importing them. A ``CipherSpec`` only records where a cipher lives plus the
+metadata needed to show it (label, icon, key help, description); the cipher
+module itself is imported the first time that cipher is actually used.
+
+Third-party packages can add ciphers and engines without touching any UI
+code by declaring entry points:
+
+- ``classical_cipher.ciphers``: ``Label = package.module:CipherClass``
+- ``classical_cipher.engines``: ``cipher.engine = package.module:function``,
+  where ``function(data, key, decrypt)`` follows the engine signature of
+  :mod:`ciphers.dispatch` and is added to that cipher's engines when the
+  cipher is loaded.
+"""
+
+import importlib
+import threading
+import warnings
+from functools import lru_cache
+
+CIPHER_GROUP = 'classical_cipher.ciphers'
+ENGINE_GROUP = 'classical_cipher.engines'
+
+DEFAULT_ICON = "🔐"
+
+
+@lru_cache(maxsize=None)
+def entry_points(group):
+    """
+    Installed entry points of a group (scanned once per process)
+    Returns:
+        tuple: (name, module, attribute) triples, without importing anything
+    """
+    try:
+        from importlib import metadata
+        try:
+            found = metadata.entry_points(group=group)
+        except TypeError:
+            # Python < 3.10 returns a dict of groups
+            found = metadata.entry_points().get(group, ())
+    except Exception:
+        return ()
+    result = []
+    for ep in found:
+        module, _, attr = ep.value.partition(':')
+        result.append((ep.name, module.strip(), attr.strip()))
+    return tuple(result)
+
+
+def plugin_engines(cipher):
+    """
+    Engines contributed by entry points for one cipher
+    Args:
+        cipher (str): Engine-set name ('caesar', 'hill', ...)
+    Returns:
+        dict: Engine name -> callable, in discovery order
+    """
+    engines = {}
+    for name, module, attr in entry_points(ENGINE_GROUP):
+        target, _, engine = name.partition('.')
+        if target != cipher or not engine:
+            continue
+        try:
+            engines[engine] = _resolve(module, attr)
+        except Exception as e:
+            warnings.warn(f"Could not load engine {name!r} from {module}: {e}")
+    return engines
+
+
+def _resolve(module, attr):
+    """Import module (relative names are resolved against this package) and get attr"""
+    value = importlib.import_module(module, __package__)
+    for part in attr.split('.') if attr else ():
+        value = getattr(value, part)
+    return value
+
+
+class CipherSpec:
+    """
+    Where a cipher lives and how to present it, without importing it.
+    
+    Attributes:
+        name (str): Registry name ('caesar', 'hill', ...)
+        label (str): Display name used by the GUI and in history entries
+        title (str): Full name for menus
+        icon (str): Icon shown next to the label
+        key_help (dict): title/format/example/tip/details of the key
+        info (dict): name/origin/description/strength/keys/security/use_case
+    """
+    
+    __slots__ = ('name', 'module', 'attr', 'label', 'title', 'icon', 'key_help', 'info', '_cipher_class')
+    
+    def __init__(self, name, module, attr, label=None, title=None, icon=DEFAULT_ICON,
+                 key_help=None, info=None):
+        """
+        Args:
+            name (str): Registry name
+            module (str): Module path; '.name' is relative to the ciphers package
+            attr (str): Cipher class in that module
+            label (str): Display name (defaults to name)
+            title (str): Menu title (defaults to label)
+            icon (str): Icon for selectors
+            key_help (dict): Key format help
+            info (dict): Description card
+        """
+        self.name = name
+        self.module = module
+        self.attr = attr
+        self.label = label or name
+        self.title = title or self.label
+        self.icon = icon
+        self.key_help = key_help or {}
+        self.info = info or {}
+        self._cipher_class = None
+    
+    @property
+    def loaded(self):
+        """True once the cipher module has been imported"""
+        return self._cipher_class is not None
+    
+    def load(self):
+        """Import the cipher module (first call only) and return the cipher class"""
+        if self._cipher_class is None:
+            self._cipher_class = _resolve(self.module, self.attr)
+        return self._cipher_class
+    
+    def create(self, *args, **kwargs):
+        """New cipher instance; arguments go to the cipher's constructor"""
+        return self.load()(*args, **kwargs)
+    
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<CipherSpec {self.name} ({self.module}:{self.attr}, {state})>"
+
+
+class CipherRegistry:
+    """
+    Ordered collection of CipherSpecs plus one shared instance per cipher.
+    
+    Entry-point ciphers are discovered on the first listing or lookup, after
+    the built-in ones.
+    """
+    
+    def __init__(self, discover=True):
+        """
+        Args:
+            discover (bool): Add ciphers declared by installed entry points
+        """
+        self._specs = {}
+        self._instances = {}
+        self._discover = discover
+        self._lock = threading.Lock()
+    
+    def register(self, spec, replace=False):
+        """
+        Add a cipher
+        Args:
+            spec (CipherSpec): The cipher to add
+            replace (bool): Allow replacing an existing cipher of the same name
+        Returns:
+            CipherSpec: spec
+        """
+        if spec.name in self._specs and not replace:
+            raise ValueError(f"Cipher {spec.name!r} is already registered")
+        if any(other.label == spec.label and other.name != spec.name for other in self._specs.values()):
+            raise ValueError(f"Cipher label {spec.label!r} is already in use")
+        self._specs[spec.name] = spec
+        self._instances.pop(spec.name, None)
+        return spec
+    
+    def _discovered(self):
+        """All specs, running entry-point discovery once"""
+        if self._discover:
+            with self._lock:
+                if self._discover:
+                    self._discover = False
+                    for label, module, attr in entry_points(CIPHER_GROUP):
+                        name = label.lower()
+                        if name in self._specs:
+                            continue
+                        try:
+                            self.register(CipherSpec(name, module, attr, label=label))
+                        except ValueError as e:
+                            warnings.warn(f"Skipping cipher entry point {label!r}: {e}")
+        return self._specs
+    
+    def specs(self):
+        """Every registered CipherSpec, in menu order"""
+        return list(self._discovered().values())
+    
+    def names(self):
+        """Registry names, in menu order"""
+        return list(self._discovered())
+    
+    def labels(self):
+        """Display labels, in menu order"""
+        return [spec.label for spec in self._discovered().values()]
+    
+    def spec(self, name):
+        """
+        Look up a cipher by registry name or display label
+        Raises:
+            KeyError: If no such cipher is registered
+        """
+        specs = self._discovered()
+        if name in specs:
+            return specs[name]
+        for spec in specs.values():
+            if spec.label == name:
+                return spec
+        raise KeyError(f"Unknown cipher {name!r}; choose from {', '.join(specs)}")
+    
+    def get(self, name):
+        """Cipher class for a name or label (imports its module on first use)"""
+        return self.spec(name).load()
+    
+    def create(self, name, *args, **kwargs):
+        """New instance of a cipher (imports its module on first use)"""
+        return self.spec(name).create(*args, **kwargs)
+    
+    def instance(self, name):
+        """Shared default-alphabet instance of a cipher, created on first use"""
+        spec = self.spec(name)
+        cipher = self._instances.get(spec.name)
+        if cipher is None:
+            # Two threads may both create one; setdefault makes them share the first
+            cipher = self._instances.setdefault(spec.name, spec.create())
+        return cipher
+    
+    def __contains__(self, name):
+        try:
+            self.spec(name)
+        except KeyError:
+            return False
+        return True
+    
+    def __iter__(self):
+        return iter(self.specs())
+    
+    def __len__(self):
+        return len(self._discovered())
+
+
+registry = CipherRegistry()
+
+registry.register(CipherSpec(
+    'caesar', '.caesar_cipher', 'CaesarCipher',
+    label="Caesar", title="Caesar Cipher", icon="🔄",
+    key_help={
+        "title": "Caesar Cipher Key",
+        "format": "Single number (0-25)",
+        "example": "3",
+        "tip": "Larger shifts create more scrambling",
+        "details": "The key represents how many positions each letter shifts in the alphabet."
+    },
+    info={
+        "name": "Caesar Cipher",
+        "origin": "Julius Caesar, ~50 BC",
+        "description": "Named after Julius Caesar, this is one of the simplest encryption techniques. Each letter is shifted by a fixed number of positions in the alphabet.",
+        "strength": "⭐☆☆☆☆",
+        "keys": "26 possible keys",
+        "security": "Very weak - easily broken with brute force",
+        "use_case": "Historical interest, basic learning"
+    }))
+
+registry.register(CipherSpec(
+    'affine', '.affine_cipher', 'AffineCipher',
+    label="Affine", title="Affine Cipher", icon="🔢",
+    key_help={
+        "title": "Affine Cipher Key",
+        "format": "Two numbers: a,b",
+        "example": "5,8",
+        "tip": "Valid 'a' values: 1,3,5,7,9,11,15,17,19,21,23,25",
+        "details": "The 'a' value must be coprime with 26. Common values are 5, 7, 11, 15, 17, 21, 23."
+    },
+    info={
+        "name": "Affine Cipher",
+        "origin": "Mathematical cipher",
+        "description": "A type of monoalphabetic substitution cipher using mathematical formula E(x) = (ax + b) mod 26. Combines multiplicative and additive operations.",
+        "strength": "⭐⭐☆☆☆",
+        "keys": "312 possible keys",
+        "security": "Weak - vulnerable to frequency analysis",
+        "use_case": "Educational purposes, simple obfuscation"
+    }))
+
+registry.register(CipherSpec(
+    'playfair', '.playfair_cipher', 'PlayfairCipher',
+    label="Playfair", title="Playfair Cipher", icon="🔲",
+    key_help={
+        "title": "Playfair Cipher Key",
+        "format": "Keyword or phrase",
+        "example": "MONARCHY",
+        "tip": "J is treated as I in the matrix",
+        "details": "Use a memorable word or phrase. Longer keys provide better security."
+    },
+    info={
+        "name": "Playfair Cipher",
+        "origin": "Charles Wheatstone, 1854",
+        "description": "A digraph substitution cipher that encrypts pairs of letters using a 5×5 key matrix. Used in WWI and WWII for tactical purposes.",
+        "strength": "⭐⭐⭐☆☆",
+        "keys": "Keyword-based (vast)",
+        "security": "Moderate - resists simple frequency analysis",
+        "use_case": "Historical military communications"
+    }))
+
+registry.register(CipherSpec(
+    'hill', '.hill_cipher', 'HillCipher',
+    label="Hill (2×2)", title="Hill Cipher (2x2)", icon="📊",
+    key_help={
+        "title": "Hill Cipher Key",
+        "format": "Four numbers: a,b,c,d",
+        "example": "3,3,2,5",
+        "tip": "Matrix determinant must be coprime with 26",
+        "details": "Forms a 2×2 matrix [[a,b],[c,d]]. The determinant (ad-bc) must be coprime with 26. Enter 9 or 16 numbers for a 3×3 or 4×4 matrix."
+    },
+    info={
+        "name": "Hill Cipher",
+        "origin": "Lester S. Hill, 1929",
+        "description": "A polygraphic substitution cipher using linear algebra. Encrypts blocks of letters using matrix multiplication. First cipher designed to be resistant to frequency analysis.",
+        "strength": "⭐⭐⭐⭐☆",
+        "keys": "Matrix-based (many)",
+        "security": "Strong against frequency analysis",
+        "use_case": "Secure classical encryption"
+    }))
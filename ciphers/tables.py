@@ -0,0 +1,173 @@
+"""
+Translation tables for the monoalphabetic ciphers.
+
+A letter substitution is compiled once into a ``bytes.maketrans`` table
+(with a delete-table covering every non-letter byte) and a
+``str.translate`` mapping, so a whole message is transformed by a single
+``translate`` call instead of a per-character loop. Tables can be built
+over any ``Alphabet`` (A-Z by default).
+"""
+
+from functools import lru_cache
+
+from .alphabets import LETTERS
+from .folding import fold_text
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+ASCII_LETTERS = (ALPHABET + ALPHABET.lower()).encode('ascii')
+
+# Spaces, digits, punctuation and every other non-letter byte are dropped
+DELETE_BYTES = bytes(b for b in range(256) if b not in ASCII_LETTERS)
+
+# Buffers are transformed in windows of this many bytes, bounding scratch memory
+BUFFER_WINDOW = 1 << 16
+
+# Folds ASCII letters to uppercase (use together with DELETE_BYTES)
+UPPERCASE_TABLE = bytes.maketrans(ASCII_LETTERS, (ALPHABET * 2).encode('ascii'))
+
+
+def clean_letters(text):
+    """
+    Keep only the letters of text, uppercased, with accented letters folded (é -> E)
+    Args:
+        text (str): Input text
+    Returns:
+        str: Uppercase letters, same as ''.join(c.upper() for c in text if c.isalpha())
+            after folding
+    """
+    text = fold_text(text)
+    if text.isascii():
+        return text.encode('ascii').translate(UPPERCASE_TABLE, DELETE_BYTES).decode('ascii')
+    return ''.join(c.upper() for c in text if c.isalpha())
+
+
+class _TextMap(dict):
+    """
+    str.translate mapping for input that is not pure ASCII.
+    
+    ASCII symbols are filled in up front. Any other code point is resolved
+    the first time it is seen, using the same ``char.upper() in alphabet``
+    test the ciphers have always applied, and then cached.
+    """
+    
+    def __init__(self, output, alphabet=LETTERS):
+        super().__init__()
+        self._output = output
+        self._alphabet = alphabet
+        for byte, i in zip(alphabet.input_bytes, alphabet.input_positions):
+            self[byte] = output[i]
+    
+    def __missing__(self, ordinal):
+        char = chr(ordinal).upper() if self._alphabet.case_insensitive else chr(ordinal)
+        symbols = self._alphabet.symbols
+        # Threads racing on a new code point store the same value; either write wins
+        value = self._output[symbols.index(char)] if char in symbols else None
+        self[ordinal] = value
+        return value
+
+
+class TranslationTable:
+    """Compiled symbol substitution usable on str and bytes input"""
+    
+    __slots__ = ('output', 'bytes_table', 'delete_bytes', 'text_map', 'index_table')
+    
+    def __init__(self, mapping, lowercase=False, alphabet=LETTERS):
+        """
+        Args:
+            mapping (sequence): mapping[i] is the output index for symbol i
+            lowercase (bool): Emit lowercase letters instead of uppercase
+            alphabet (Alphabet): Symbols the mapping is over
+        """
+        output = ''.join(alphabet.symbols[j] for j in mapping)
+        if lowercase:
+            output = output.lower()
+        encoded = output.encode('ascii')
+        self.output = output
+        self.bytes_table = bytes.maketrans(alphabet.input_bytes,
+                                           bytes(encoded[i] for i in alphabet.input_positions))
+        self.delete_bytes = alphabet.delete_bytes
+        self.text_map = _TextMap(output, alphabet)
+        # Symbol index -> output symbol index, for LetterBuffer.indices
+        self.index_table = bytes(mapping) + bytes(range(len(mapping), 256))
+    
+    def translate(self, text):
+        """
+        Substitute every symbol of text and drop everything else
+        Args:
+            text (str): Input text
+        Returns:
+            str: Substituted symbols only
+        """
+        text = fold_text(text)
+        if text.isascii():
+            return text.encode('ascii').translate(self.bytes_table, self.delete_bytes).decode('ascii')
+        return text.translate(self.text_map)
+    
+    def translate_bytes(self, data):
+        """
+        Substitute every letter of an ASCII payload and drop everything else
+        Args:
+            data (bytes, bytearray or memoryview): Input bytes
+        Returns:
+            bytes: Substituted letters only
+        """
+        if isinstance(data, bytes):
+            return data.translate(self.bytes_table, self.delete_bytes)
+        with memoryview(data) as view:
+            view = view.cast('B')
+            return b''.join(view[start:start + BUFFER_WINDOW].tobytes().translate(self.bytes_table, self.delete_bytes)
+                            for start in range(0, len(view), BUFFER_WINDOW))
+    
+    def translate_into(self, dst, src):
+        """
+        Substitute the letters of src straight into a caller-provided buffer.
+        src is read in fixed-size windows, so no message-sized temporary is
+        created; dst may be the same buffer as src (output never overtakes input).
+        Args:
+            dst (bytearray or writable memoryview): Output buffer
+            src (bytes, bytearray or memoryview): Input bytes
+        Returns:
+            int: Number of bytes written to dst
+        """
+        with memoryview(src) as view, memoryview(dst) as out:
+            view, out = view.cast('B'), out.cast('B')
+            written = 0
+            for start in range(0, len(view), BUFFER_WINDOW):
+                piece = view[start:start + BUFFER_WINDOW].tobytes().translate(self.bytes_table, self.delete_bytes)
+                end = written + len(piece)
+                if end > len(out):
+                    raise ValueError(f"Destination buffer too small ({len(out)} bytes)")
+                out[written:end] = piece
+                written = end
+            return written
+
+
+@lru_cache(maxsize=256)
+def compose_tables(first, then, alphabet=LETTERS):
+    """
+    Single table for one substitution followed by another
+    Args:
+        first (TranslationTable): Applied first (e.g. the old key's decryption)
+        then (TranslationTable): Applied second (e.g. the new key's encryption)
+        alphabet (Alphabet): Alphabet both tables are over
+    Returns:
+        TranslationTable: then(first(x)) for every symbol, uppercase output
+    """
+    return TranslationTable([then.index_table[first.index_table[i]] for i in range(alphabet.modulus)],
+                            alphabet=alphabet)
+
+
+def substitute_python(text, key, decrypt=False):
+    """Substitution engine: per-character dict lookups, cheapest setup for tiny inputs"""
+    table = key.decrypt_table if decrypt else key.encrypt_table
+    return ''.join(filter(None, map(table.text_map.__getitem__, map(ord, fold_text(text)))))
+
+
+def substitute_translate(text, key, decrypt=False):
+    """Substitution engine: one translate call over the whole text"""
+    return (key.decrypt_table if decrypt else key.encrypt_table).translate(text)
+
+
+# Engines for the monoalphabetic ciphers, cheapest setup first
+SUBSTITUTION_ENGINES = {'python': substitute_python, 'translate': substitute_translate}
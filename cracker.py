@@ -9,6 +9,10 @@ when you have a known plaintext-ciphertext pair using matrix mathematics.
 
 import numpy as np
 
+from ciphers.letters import LetterBuffer
+from ciphers.modular import mod_inverse
+from ciphers.tables import clean_letters
+
 
 class HillCipherCracker:
     """Hill Cipher Cracker using Known Plaintext Attack for 2x2 matrices."""
@@ -24,14 +28,10 @@ class HillCipherCracker:
     
     def _mod_inverse(self, a, m=26):
         """
-        Find modular multiplicative inverse using brute force.
-        We try all numbers from 1 to m-1 and check if (a * i) mod m = 1
+        Find modular multiplicative inverse of a under modulo m.
+        Looked up in the precomputed inverse table shared with the ciphers.
         """
-        a = a % m
-        for i in range(1, m):
-            if (a * i) % m == 1:
-                return i
-        return None
+        return mod_inverse(a, m)
     
     def _char_to_num(self, char):
         """Convert character to number (A=0, B=1, ..., Z=25)"""
@@ -42,8 +42,10 @@ class HillCipherCracker:
         return chr((num % self.MOD) + ord('A'))
     
     def _clean_text(self, text):
-        """Remove spaces and non-alphabetic characters, convert to uppercase"""
-        return ''.join(c.upper() for c in text if c.isalpha())
+        """Remove spaces and non-alphabetic characters, convert to uppercase (accents folded)"""
+        if isinstance(text, LetterBuffer):
+            return text.letters()
+        return clean_letters(text)
     
     def _pad_text(self, text):
         """Pad text with 'X' to make length even (Hill cipher needs pairs)"""
@@ -56,6 +58,11 @@ class HillCipherCracker:
         Convert text to digraphs (pairs of numbers)
         Example: "HELLO" -> [(7,4), (11,11), (14,23)] where O=14, X=23 (padding)
         """
+        if isinstance(text, LetterBuffer):
+            # Already letter indices; no character conversion needed
+            indices = text.indices + b'\x17' * (len(text) % 2)
+            return list(zip(indices[::2], indices[1::2]))
+        
         text = self._pad_text(self._clean_text(text))
         digraphs = []
         for i in range(0, len(text), 2):
@@ -97,11 +104,7 @@ class HillCipherCracker:
         # Step 1: Calculate determinant
         det = (a * d - b * c) % self.MOD
         
-        # Step 2: Check if determinant is invertible
-        if self._gcd(det, self.MOD) != 1:
-            return None
-        
-        # Step 3: Find modular inverse of determinant
+        # Step 2 & 3: Look up the determinant inverse (None if not coprime with 26)
         det_inv = self._mod_inverse(det, self.MOD)
         if det_inv is None:
             return None
@@ -136,8 +139,8 @@ class HillCipherCracker:
         Crack the Hill Cipher key using known plaintext attack.
         
         Args:
-            plaintext: Known plaintext string
-            ciphertext: Corresponding ciphertext string
+            plaintext: Known plaintext string (or LetterBuffer)
+            ciphertext: Corresponding ciphertext string (or LetterBuffer)
         
         Returns:
             2x2 numpy array containing the key matrix, or None if not found
@@ -264,8 +267,10 @@ class HillCipherCracker:
             return None
     
     def encrypt(self, plaintext, key):
-        """Encrypt plaintext using key matrix"""
+        """Encrypt plaintext using key matrix (a LetterBuffer gives a LetterBuffer)"""
         digraphs = self._text_to_digraphs(plaintext)
+        if isinstance(plaintext, LetterBuffer):
+            return plaintext.with_indices(x for dg in digraphs for x in self._encrypt_digraph(dg, key))
         result = ''
         for dg in digraphs:
             enc = self._encrypt_digraph(dg, key)
@@ -273,7 +278,7 @@ class HillCipherCracker:
         return result
     
     def decrypt(self, ciphertext, key):
-        """Decrypt ciphertext using key matrix"""
+        """Decrypt ciphertext using key matrix (a LetterBuffer gives a LetterBuffer)"""
         key_inv = self._matrix_inverse_2x2(key)
         if key_inv is None:
             print("❌ Error: Key is not invertible")
@@ -290,6 +295,8 @@ class HillCipherCracker:
         if result.endswith('x'):
             result = result[:-1]
         
+        if isinstance(ciphertext, LetterBuffer):
+            return ciphertext.with_indices(LetterBuffer.from_letters(result).indices)
         return result
 
 
@@ -6,13 +6,15 @@ A user-friendly tool for encryption and decryption using classical ciphers:
 - Affine Cipher
 - Playfair Cipher
 - Hill Cipher (2x2 matrix)
+- any cipher added to the registry (ciphers.registry), e.g. by a plugin
+
+Cipher modules are imported only when their cipher is selected.
 """
 
 import readline  # Enable arrow keys and command history
-from ciphers.caesar_cipher import CaesarCipher
-from ciphers.affine_cipher import AffineCipher
-from ciphers.playfair_cipher import PlayfairCipher
-from ciphers.hill_cipher import HillCipher
+from math import isqrt
+from ciphers.registry import registry
+from ciphers.modular import determinant, singular_primes
 
 
 def print_banner():
@@ -22,14 +24,12 @@ def print_banner():
     print("=" * 60)
 
 
-def print_menu():
+def print_menu(specs):
     """Print main menu"""
     print("\n[SELECT CIPHER]")
-    print("1. Caesar Cipher")
-    print("2. Affine Cipher")
-    print("3. Playfair Cipher")
-    print("4. Hill Cipher (2x2)")
-    print("5. Exit")
+    for number, spec in enumerate(specs, 1):
+        print(f"{number}. {spec.title}")
+    print(f"{len(specs) + 1}. Exit")
 
 
 def print_operation_menu():
@@ -55,7 +55,7 @@ def get_input(prompt, input_type=str):
 
 def caesar_cipher_interface():
     """Interface for Caesar Cipher"""
-    cipher = CaesarCipher()
+    cipher = registry.create('caesar')
     
     print("\n" + "─" * 60)
     print("CAESAR CIPHER - Simple Shift Cipher")
@@ -75,7 +75,7 @@ def caesar_cipher_interface():
             plaintext = get_input("\nEnter plaintext: ")
             key = get_input("Enter shift value (0-25): ")
             try:
-                result = cipher.encrypt(plaintext, key)
+                result = cipher.encrypt_formatted(plaintext, key)
                 print(f"\n" + "═" * 60)
                 print("[ENCRYPTION RESULT]")
                 print("═" * 60)
@@ -90,7 +90,7 @@ def caesar_cipher_interface():
             ciphertext = get_input("\nEnter ciphertext: ")
             key = get_input("Enter shift value (0-25): ")
             try:
-                result = cipher.decrypt(ciphertext, key)
+                result = cipher.decrypt_formatted(ciphertext, key)
                 print(f"\n" + "═" * 60)
                 print("[DECRYPTION RESULT]")
                 print("═" * 60)
@@ -107,7 +107,7 @@ def caesar_cipher_interface():
 
 def affine_cipher_interface():
     """Interface for Affine Cipher"""
-    cipher = AffineCipher()
+    cipher = registry.create('affine')
     
     print("\n" + "─" * 60)
     print("AFFINE CIPHER - E(x) = (ax + b) mod 26")
@@ -131,7 +131,7 @@ def affine_cipher_interface():
             plaintext = get_input("\nEnter plaintext: ")
             key = get_input("Enter key (format: a,b): ")
             try:
-                result = cipher.encrypt(plaintext, key)
+                result = cipher.encrypt_formatted(plaintext, key)
                 print(f"\n" + "═" * 60)
                 print("[ENCRYPTION RESULT]")
                 print("═" * 60)
@@ -146,7 +146,7 @@ def affine_cipher_interface():
             ciphertext = get_input("\nEnter ciphertext: ")
             key = get_input("Enter key (format: a,b): ")
             try:
-                result = cipher.decrypt(ciphertext, key)
+                result = cipher.decrypt_formatted(ciphertext, key)
                 print(f"\n" + "═" * 60)
                 print("[DECRYPTION RESULT]")
                 print("═" * 60)
@@ -163,7 +163,7 @@ def affine_cipher_interface():
 
 def playfair_cipher_interface():
     """Interface for Playfair Cipher"""
-    cipher = PlayfairCipher()
+    cipher = registry.create('playfair')
     
     print("\n" + "─" * 60)
     print("PLAYFAIR CIPHER - 5x5 Key Matrix Cipher")
@@ -185,7 +185,7 @@ def playfair_cipher_interface():
             plaintext = get_input("\nEnter plaintext: ")
             key = get_input("Enter key (keyword): ")
             try:
-                result = cipher.encrypt(plaintext, key)
+                result = cipher.encrypt_formatted(plaintext, key)
                 print(f"\n" + "═" * 60)
                 print("[ENCRYPTION RESULT]")
                 print("═" * 60)
@@ -200,7 +200,7 @@ def playfair_cipher_interface():
             ciphertext = get_input("\nEnter ciphertext: ")
             key = get_input("Enter key (keyword): ")
             try:
-                result = cipher.decrypt(ciphertext, key)
+                result = cipher.decrypt_formatted(ciphertext, key)
                 print(f"\n" + "═" * 60)
                 print("[DECRYPTION RESULT]")
                 print("═" * 60)
@@ -224,6 +224,7 @@ def display_hill_help():
     print("   Format: a,b,c,d")
     print("   This creates matrix: [[a, b],")
     print("                         [c, d]]")
+    print("   (Enter 9 or 16 numbers for a 3x3 or 4x4 matrix)")
     print("\n✅ Valid Example Keys:")
     print("   • 3,3,2,5   → [[3,3],[2,5]]   (det mod 26 = 9)")
     print("   • 5,8,17,3  → [[5,8],[17,3]]  (det mod 26 = 7)")
@@ -237,31 +238,30 @@ def validate_and_display_matrix(key_str):
     """Validate and display the matrix for user confirmation"""
     try:
         values = [int(x.strip()) for x in key_str.split(',')]
-        if len(values) != 4:
-            print("❌ Error: Need exactly 4 values for 2x2 matrix")
+        size = isqrt(len(values))
+        if size < 2 or size * size != len(values):
+            print("❌ Error: Need a square number of values (4 for 2x2, 9 for 3x3, 16 for 4x4)")
             return False
         
+        rows = [values[i * size:(i + 1) * size] for i in range(size)]
+        width = 4 * size
         print(f"\nYour matrix:")
-        print(f"  ┌         ┐")
-        print(f"  │ {values[0]:2d}  {values[1]:2d} │")
-        print(f"  │ {values[2]:2d}  {values[3]:2d} │")
-        print(f"  └         ┘")
+        print(f"  ┌{' ' * width}┐")
+        for row in rows:
+            print(f"  │{''.join(f'{v:4d}' for v in row)}│")
+        print(f"  └{' ' * width}┘")
         
         # Calculate determinant
-        det = values[0] * values[3] - values[1] * values[2]
+        det = determinant(rows)
         det_mod = det % 26
         print(f"  Determinant = {det}")
         print(f"  Determinant (mod 26) = {det_mod}")
         
-        # Check if coprime with 26
-        def gcd(a, b):
-            while b:
-                a, b = b, a % b
-            return a
-        
-        if gcd(abs(det_mod), 26) != 1:
+        # Coprime with 26 = 2 x 13 means non-zero mod 2 and mod 13
+        bad_primes = singular_primes(det, 26)
+        if bad_primes:
             print(f"\n❌ Invalid! Determinant {det_mod} is NOT coprime with 26")
-            print(f"   GCD({abs(det_mod)}, 26) = {gcd(abs(det_mod), 26)}")
+            print(f"   It is divisible by {' and '.join(map(str, bad_primes))}")
             print("   Please try a different matrix.")
             return False
         else:
@@ -278,7 +278,7 @@ def validate_and_display_matrix(key_str):
 
 def hill_cipher_interface():
     """Interface for Hill Cipher (2x2 matrix)"""
-    cipher = HillCipher()
+    cipher = registry.create('hill')
     
     display_hill_help()
     
@@ -306,7 +306,7 @@ def hill_cipher_interface():
                 print("Please enter a valid key matrix.\n")
             
             try:
-                result = cipher.encrypt(plaintext, key)
+                result = cipher.encrypt_formatted(plaintext, key)
                 print(f"\n" + "═" * 60)
                 print("[ENCRYPTION RESULT]")
                 print("═" * 60)
@@ -334,7 +334,7 @@ def hill_cipher_interface():
                 print("Please enter a valid key matrix.\n")
             
             try:
-                result = cipher.decrypt(ciphertext, key)
+                result = cipher.decrypt_formatted(ciphertext, key)
                 print(f"\n" + "═" * 60)
                 print("[DECRYPTION RESULT]")
                 print("═" * 60)
@@ -349,28 +349,79 @@ def hill_cipher_interface():
             print("Invalid choice. Please select 1, 2, or 3.")
 
 
+def cipher_interface(spec):
+    """Interface for a registered cipher without a dedicated one, driven by its key help"""
+    cipher = spec.create()
+    key_help = spec.key_help
+    
+    print("\n" + "─" * 60)
+    print(spec.title.upper())
+    print("─" * 60)
+    if key_help:
+        print(f"📝 Key: {key_help.get('format', '')}")
+        print(f"   Example: {key_help.get('example', '')}")
+    print("─" * 60)
+    
+    while True:
+        print_operation_menu()
+        choice = get_input("Enter your choice (1-3): ")
+        
+        if choice == '3':
+            break
+        
+        if choice not in ('1', '2'):
+            print("Invalid choice. Please select 1, 2, or 3.")
+            continue
+        
+        encrypting = choice == '1'
+        text = get_input("\nEnter plaintext: " if encrypting else "\nEnter ciphertext: ")
+        key = get_input("Enter key: ")
+        try:
+            result = cipher.encrypt_formatted(text, key) if encrypting else cipher.decrypt_formatted(text, key)
+            labels = ("Plaintext: ", "Ciphertext:") if encrypting else ("Ciphertext:", "Plaintext: ")
+            print(f"\n" + "═" * 60)
+            print("[ENCRYPTION RESULT]" if encrypting else "[DECRYPTION RESULT]")
+            print("═" * 60)
+            print(f"{labels[0]} {text}")
+            print(f"Key:        {key}")
+            print(f"{labels[1]} {result}")
+            print("═" * 60)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+
+
+# Built-in ciphers with hand-written help; every other registered cipher uses cipher_interface
+INTERFACES = {
+    'caesar': caesar_cipher_interface,
+    'affine': affine_cipher_interface,
+    'playfair': playfair_cipher_interface,
+    'hill': hill_cipher_interface,
+}
+
+
 def main():
     """Main application loop"""
     print_banner()
+    specs = registry.specs()
+    exit_choice = str(len(specs) + 1)
     
     while True:
-        print_menu()
-        choice = get_input("\nEnter your choice (1-5): ")
+        print_menu(specs)
+        choice = get_input(f"\nEnter your choice (1-{exit_choice}): ")
         
-        if choice == '1':
-            caesar_cipher_interface()
-        elif choice == '2':
-            affine_cipher_interface()
-        elif choice == '3':
-            playfair_cipher_interface()
-        elif choice == '4':
-            hill_cipher_interface()
-        elif choice == '5':
+        if choice == exit_choice:
             print("\nThank you for using Classical Cipher Tool!")
             print("=" * 60 + "\n")
             break
+        if choice.isdigit() and 1 <= int(choice) <= len(specs):
+            spec = specs[int(choice) - 1]
+            interface = INTERFACES.get(spec.name)
+            if interface is not None:
+                interface()
+            else:
+                cipher_interface(spec)
         else:
-            print("\nInvalid choice. Please select a number between 1 and 5.")
+            print(f"\nInvalid choice. Please select a number between 1 and {exit_choice}.")
 
 
 if __name__ == "__main__":